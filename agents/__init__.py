@@ -1,6 +1,8 @@
-"""Agents module."""
-from .sentiment_analyst import SentimentAnalyst
-from .technical_specialist import TechnicalSpecialist
-from .portfolio_manager import PortfolioManager
+"""Agents module. Agents are imported on first use so light submodules stay cheap."""
+from telemetry.startup import lazy_exports
 
-__all__ = ['SentimentAnalyst', 'TechnicalSpecialist', 'PortfolioManager']
+__getattr__, __all__ = lazy_exports(__name__, {
+    'SentimentAnalyst': '.sentiment_analyst',
+    'TechnicalSpecialist': '.technical_specialist',
+    'PortfolioManager': '.portfolio_manager',
+})
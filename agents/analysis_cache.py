@@ -0,0 +1,66 @@
+"""TTL cache for LLM analyses keyed on bucketed inputs, backed by the llm_analysis_cache table."""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from database.db_manager import DatabaseManager
+
+
+class AnalysisCache:
+    """In-process TTL map in front of a persistent table so restarts keep recent analyses."""
+
+    def __init__(self, model: str, ttl_minutes: float, db: DatabaseManager = None):
+        self.model = model
+        self.ttl_seconds = ttl_minutes * 60
+        self.db = db or DatabaseManager()
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached analysis for key if younger than the TTL, else None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and now - entry[1] < self.ttl_seconds:
+            analysis = entry[0]
+        else:
+            try:
+                row = self.db.get_llm_analysis(key, self.model, max_age_seconds=self.ttl_seconds)
+            except Exception as e:
+                print(f"  [AnalysisCache] Warning: persistent lookup failed: {e}")
+                row = None
+            analysis = row['analysis'] if row else None
+            if row:
+                with self._lock:
+                    self._entries[key] = (analysis, now - float(row['age_seconds']))
+
+        with self._lock:
+            if analysis is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return analysis
+
+    def put(self, key: str, ticker: str, analysis: str):
+        """Store a successful analysis in memory and in the persistent table."""
+        with self._lock:
+            self._entries[key] = (analysis, time.time())
+            # Drop expired entries so the map stays bounded by what the TTL allows
+            cutoff = time.time() - self.ttl_seconds
+            for stale in [k for k, (_, ts) in self._entries.items() if ts < cutoff]:
+                del self._entries[stale]
+        try:
+            self.db.upsert_llm_analysis(key, ticker, self.model, analysis)
+        except Exception as e:
+            print(f"  [AnalysisCache] Warning: persistent store failed: {e}")
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'ttl_minutes': self.ttl_seconds / 60,
+        }
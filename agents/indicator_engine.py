@@ -0,0 +1,335 @@
+"""Vectorized tickers x time indicator engine with O(1) per-bar incremental updates."""
+import copy
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class _EMA:
+    """Per-ticker EMA (pandas ewm(span, adjust=False)); seeds on the first valid value."""
+
+    def __init__(self, n: int, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = np.full(n, np.nan)
+
+    def step(self, x: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            blended = self.alpha * x + (1 - self.alpha) * self.value
+        self.value = np.where(np.isnan(x), self.value, np.where(np.isnan(self.value), x, blended))
+        return self.value
+
+
+class _Wilder:
+    """Wilder smoothing: SMA of the first `period` valid values, then avg += (x - avg) / period."""
+
+    def __init__(self, n: int, period: int):
+        self.period = period
+        self.count = np.zeros(n, dtype=np.int64)
+        self.total = np.zeros(n)
+        self.value = np.full(n, np.nan)
+
+    def step(self, x: np.ndarray) -> np.ndarray:
+        valid = ~np.isnan(x)
+        seeding = valid & (self.count < self.period)
+        smoothing = valid & ~seeding
+        self.total = np.where(seeding, self.total + np.nan_to_num(x), self.total)
+        self.count = self.count + seeding
+        with np.errstate(invalid='ignore'):
+            value = np.where(seeding & (self.count == self.period), self.total / self.period, self.value)
+            self.value = np.where(smoothing, self.value + (x - self.value) / self.period, value)
+        return self.value
+
+
+class _Window:
+    """Fixed-size ring buffer per ticker (own write position each); mean/std are NaN until full."""
+
+    def __init__(self, n: int, size: int):
+        self.buf = np.full((n, size), np.nan)
+        self.pos = np.zeros(n, dtype=np.int64)
+
+    def seed(self, history: np.ndarray):
+        tail = history[:, -self.buf.shape[1]:]
+        self.buf[:, :tail.shape[1]] = tail
+        self.pos[:] = tail.shape[1] % self.buf.shape[1]
+
+    def step(self, x: np.ndarray, mask: np.ndarray):
+        """Write x for the tickers in mask; the others keep their window as it was."""
+        rows = np.flatnonzero(mask)
+        self.buf[rows, self.pos[rows]] = x[rows]
+        self.pos[rows] = (self.pos[rows] + 1) % self.buf.shape[1]
+
+    def mean(self) -> np.ndarray:
+        return self.buf.mean(axis=1)
+
+    def std(self) -> np.ndarray:
+        return self.buf.std(axis=1)
+
+
+def _rolling(x: np.ndarray, window: int, fn) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= window:
+        out[:, window - 1:] = fn(sliding_window_view(x, window, axis=1), axis=-1)
+    return out
+
+
+def _rsi(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def _take(state, rows: List[int]):
+    """Copy of a running-state object (_EMA, _Wilder, _Window) keeping only the given ticker rows."""
+    taken = copy.copy(state)
+    for name, value in vars(state).items():
+        if isinstance(value, np.ndarray):
+            setattr(taken, name, value[rows])
+    return taken
+
+
+def _concat(states: list):
+    """Running-state objects of the same kind stacked along the ticker axis."""
+    joined = copy.copy(states[0])
+    for name, value in vars(joined).items():
+        if isinstance(value, np.ndarray):
+            setattr(joined, name, np.concatenate([getattr(state, name) for state in states]))
+    return joined
+
+
+def stack_histories(histories: Dict[str, pd.DataFrame]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Stack per-ticker OHLC frames by bar position, each row ending at that ticker's own latest
+    bar (shorter histories are left-padded with NaN). Rows are not aligned on calendar time, so
+    a ticker whose history stops early is not padded with trailing NaN bars.
+    """
+    tickers = list(histories)
+    length = max((len(h) for h in histories.values()), default=0)
+    arrays = {}
+    for column in ('close', 'high', 'low'):
+        if not any(column in h for h in histories.values()):
+            continue  # close-only histories: ATR stays NaN
+        array = np.full((len(tickers), length), np.nan)
+        for i, ticker in enumerate(tickers):
+            history = histories[ticker]
+            if column in history and len(history):
+                array[i, length - len(history):] = history[column].sort_index().to_numpy(dtype=np.float64)
+        arrays[column] = array
+    return tickers, arrays
+
+
+class IndicatorEngine:
+    """
+    RSI (SMA + Wilder), MACD, Bollinger bands and ATR for a whole universe.
+    compute() runs one vectorized pass over a (tickers x time) array; fit() also
+    keeps per-ticker running state so update() folds in a new bar in constant time.
+    """
+
+    def __init__(self, tickers: List[str], rsi_period: int = 14, macd_fast: int = 12,
+                 macd_slow: int = 26, macd_signal: int = 9, bb_period: int = 20,
+                 bb_k: float = 2.0, atr_period: int = 14):
+        self.tickers = list(tickers)
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+        self.rsi_period = rsi_period
+        self.macd_spans = (macd_fast, macd_slow, macd_signal)
+        self.bb_period = bb_period
+        self.bb_k = bb_k
+        self.atr_period = atr_period
+        self._reset()
+
+    def _reset(self):
+        n = len(self.tickers)
+        fast, slow, signal = self.macd_spans
+        self.prev_close = np.full(n, np.nan)
+        self.ema_fast = _EMA(n, fast)
+        self.ema_slow = _EMA(n, slow)
+        self.ema_signal = _EMA(n, signal)
+        self.wilder_gain = _Wilder(n, self.rsi_period)
+        self.wilder_loss = _Wilder(n, self.rsi_period)
+        self.atr = _Wilder(n, self.atr_period)
+        self.gain_window = _Window(n, self.rsi_period)
+        self.loss_window = _Window(n, self.rsi_period)
+        self.close_window = _Window(n, self.bb_period)
+        self.latest_values: Dict[str, np.ndarray] = {}
+
+    # ── Bar transforms shared by the batch and incremental paths ──────────────
+
+    @staticmethod
+    def _gains(close: np.ndarray, prev: np.ndarray):
+        """SMA-RSI gains/losses match pandas: a missing previous close counts as 0 change."""
+        delta = close - prev
+        missing = np.isnan(close)
+        with np.errstate(invalid='ignore'):
+            gain = np.where(missing, np.nan, np.where(delta > 0, delta, 0.0))
+            loss = np.where(missing, np.nan, np.where(delta < 0, -delta, 0.0))
+            # Wilder's variant only starts once there is a real previous close
+            w_gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+            w_loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+        return gain, loss, w_gain, w_loss
+
+    @staticmethod
+    def _true_range(high: np.ndarray, low: np.ndarray, prev: np.ndarray) -> np.ndarray:
+        hl = high - low
+        with np.errstate(invalid='ignore'):
+            tr = np.fmax(hl, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+        return np.where(np.isnan(prev), hl, tr)
+
+    # ── Full-history pass ─────────────────────────────────────────────────────
+
+    def compute(self, close: np.ndarray, high: np.ndarray = None, low: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """
+        Every indicator as a (tickers x time) array. Also seeds state for update().
+        Each row must end at that ticker's latest bar (see stack_histories).
+        """
+        close = np.asarray(close, dtype=np.float64)
+        n, t = close.shape
+        if n != len(self.tickers):
+            raise ValueError(f"Expected {len(self.tickers)} tickers, got {n} rows")
+        high = np.full_like(close, np.nan) if high is None else np.asarray(high, dtype=np.float64)
+        low = np.full_like(close, np.nan) if low is None else np.asarray(low, dtype=np.float64)
+        self._reset()
+
+        prev = np.concatenate([np.full((n, 1), np.nan), close[:, :-1]], axis=1)
+        gain, loss, w_gain, w_loss = self._gains(close, prev)
+        tr = self._true_range(high, low, prev)
+
+        # Windowed indicators: fully vectorized over tickers and time
+        rsi = _rsi(_rolling(gain, self.rsi_period, np.mean), _rolling(loss, self.rsi_period, np.mean))
+        bb_mid = _rolling(close, self.bb_period, np.mean)
+        bb_std = _rolling(close, self.bb_period, np.std)
+
+        # Recursive indicators: vectorized over tickers, one step per bar
+        out = {k: np.full((n, t), np.nan) for k in ('ema_fast', 'ema_slow', 'signal', 'wg', 'wl', 'atr')}
+        for j in range(t):
+            out['ema_fast'][:, j] = self.ema_fast.step(close[:, j])
+            out['ema_slow'][:, j] = self.ema_slow.step(close[:, j])
+            macd_j = out['ema_fast'][:, j] - out['ema_slow'][:, j]
+            out['signal'][:, j] = self.ema_signal.step(macd_j)
+            out['wg'][:, j] = self.wilder_gain.step(w_gain[:, j])
+            out['wl'][:, j] = self.wilder_loss.step(w_loss[:, j])
+            out['atr'][:, j] = self.atr.step(tr[:, j])
+
+        macd = out['ema_fast'] - out['ema_slow']
+        series = {
+            'rsi': rsi,
+            'rsi_wilder': _rsi(out['wg'], out['wl']),
+            'macd': macd,
+            'macd_signal': out['signal'],
+            'macd_histogram': macd - out['signal'],
+            'bb_upper': bb_mid + self.bb_k * bb_std,
+            'bb_middle': bb_mid,
+            'bb_lower': bb_mid - self.bb_k * bb_std,
+            'atr': out['atr'],
+        }
+
+        # Seed the O(1) state from the tail of the history
+        if t:
+            self.prev_close = close[:, -1].copy()
+        self.gain_window.seed(gain)
+        self.loss_window.seed(loss)
+        self.close_window.seed(close)
+        self.latest_values = {k: v[:, -1].copy() if t else np.full(n, np.nan) for k, v in series.items()}
+        return series
+
+    def fit(self, histories: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """Compute from per-ticker OHLC frames (must cover self.tickers). Returns latest values per ticker."""
+        _, arrays = stack_histories({t: histories[t] for t in self.tickers})
+        self.compute(arrays['close'], arrays.get('high'), arrays.get('low'))
+        return self.latest()
+
+    # ── Incremental path ──────────────────────────────────────────────────────
+
+    def update(self, close: np.ndarray, high: np.ndarray = None, low: np.ndarray = None) -> Dict[str, Dict]:
+        """Fold one new bar per ticker (NaN = no bar) into every indicator in constant time."""
+        close = np.asarray(close, dtype=np.float64)
+        high = np.full_like(close, np.nan) if high is None else np.asarray(high, dtype=np.float64)
+        low = np.full_like(close, np.nan) if low is None else np.asarray(low, dtype=np.float64)
+        has_bar = ~np.isnan(close)
+
+        gain, loss, w_gain, w_loss = self._gains(close, self.prev_close)
+        tr = self._true_range(high, low, self.prev_close)
+
+        # Tickers without a new bar keep their windows (and ring positions) unchanged
+        for window, x in ((self.gain_window, gain), (self.loss_window, loss), (self.close_window, close)):
+            window.step(x, has_bar)
+
+        ema_fast = self.ema_fast.step(close)
+        ema_slow = self.ema_slow.step(close)
+        macd = ema_fast - ema_slow
+        signal = self.ema_signal.step(np.where(has_bar, macd, np.nan))
+        wg = self.wilder_gain.step(w_gain)
+        wl = self.wilder_loss.step(w_loss)
+        atr = self.atr.step(tr)
+        self.prev_close = np.where(has_bar, close, self.prev_close)
+
+        bb_mid = self.close_window.mean()
+        bb_std = self.close_window.std()
+        fresh = {
+            'rsi': _rsi(self.gain_window.mean(), self.loss_window.mean()),
+            'rsi_wilder': _rsi(wg, wl),
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': macd - signal,
+            'bb_upper': bb_mid + self.bb_k * bb_std,
+            'bb_middle': bb_mid,
+            'bb_lower': bb_mid - self.bb_k * bb_std,
+            'atr': atr,
+        }
+        for key, values in fresh.items():
+            previous = self.latest_values.get(key, np.full(len(self.tickers), np.nan))
+            self.latest_values[key] = np.where(has_bar, values, previous)
+        return self.latest()
+
+    def peek(self, close: np.ndarray, high: np.ndarray = None, low: np.ndarray = None) -> Dict[str, Dict]:
+        """update() on a copy: latest values with a provisional bar, leaving this engine's state as it was."""
+        return copy.deepcopy(self).update(close, high, low)
+
+    # ── Per-ticker state ──────────────────────────────────────────────────────
+
+    _STATE = ('ema_fast', 'ema_slow', 'ema_signal', 'wilder_gain', 'wilder_loss', 'atr',
+              'gain_window', 'loss_window', 'close_window')
+
+    def split(self) -> Dict[str, 'IndicatorEngine']:
+        """One single-ticker engine per ticker, each carrying that ticker's running state."""
+        return {ticker: self._select([i]) for ticker, i in self.index.items()}
+
+    def _select(self, rows: List[int]) -> 'IndicatorEngine':
+        engine = copy.copy(self)
+        engine.tickers = [self.tickers[i] for i in rows]
+        engine.index = {t: i for i, t in enumerate(engine.tickers)}
+        engine.prev_close = self.prev_close[rows]
+        for name in self._STATE:
+            setattr(engine, name, _take(getattr(self, name), rows))
+        engine.latest_values = {k: v[rows] for k, v in self.latest_values.items()}
+        return engine
+
+    @classmethod
+    def join(cls, engines: List['IndicatorEngine']) -> 'IndicatorEngine':
+        """Stack fitted engines with the same parameters into one (the inverse of split())."""
+        engine = copy.copy(engines[0])
+        engine.tickers = [t for e in engines for t in e.tickers]
+        engine.index = {t: i for i, t in enumerate(engine.tickers)}
+        engine.prev_close = np.concatenate([e.prev_close for e in engines])
+        for name in cls._STATE:
+            setattr(engine, name, _concat([getattr(e, name) for e in engines]))
+        engine.latest_values = {k: np.concatenate([e.latest_values[k] for e in engines])
+                                for k in engines[0].latest_values}
+        return engine
+
+    # ── Output ────────────────────────────────────────────────────────────────
+
+    def latest(self, ticker: Optional[str] = None):
+        """Latest indicators per ticker, shaped like TechnicalSpecialist's indicators dict."""
+        if ticker is not None:
+            return self._ticker_values(self.index[ticker])
+        return {t: self._ticker_values(i) for t, i in self.index.items()}
+
+    def _ticker_values(self, i: int) -> Dict:
+        v = {k: float(arr[i]) for k, arr in self.latest_values.items()}
+        return {
+            'rsi': v['rsi'],
+            'rsi_wilder': v['rsi_wilder'],
+            'macd': {'macd': v['macd'], 'signal': v['macd_signal'], 'histogram': v['macd_histogram']},
+            'bollinger': {'upper': v['bb_upper'], 'middle': v['bb_middle'], 'lower': v['bb_lower']},
+            'atr': v['atr'],
+        }
@@ -0,0 +1,291 @@
+"""Shared Ollama transport: pooled sessions, retry/timeout policy, keep_alive and per-request timings."""
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Union
+
+import requests
+import urllib3
+from urllib3.util.retry import Retry
+
+import config
+from agents.prompts import approx_tokens
+from telemetry.http import TracedAdapter
+from telemetry.metrics import METRICS
+
+# Disable SSL warnings
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+NS_PER_MS = 1_000_000
+# Ollama reports a few ms of load_duration for a resident model; more than this means it was (re)loaded
+COLD_LOAD_MS = 250
+
+
+class OllamaClient:
+    """One pooled HTTP client per Ollama endpoint, shared by every agent."""
+
+    def __init__(self, base_url: str = None):
+        self.base_url = base_url or config.OLLAMA_BASE_URL
+        self.session = requests.Session()
+        # Retry connection failures and gateway errors only; a read timeout means the model is busy
+        retry = Retry(
+            total=config.OLLAMA_MAX_RETRIES, connect=config.OLLAMA_MAX_RETRIES, read=0,
+            status_forcelist=(502, 503, 504), allowed_methods=frozenset({"POST"}),
+            backoff_factor=config.OLLAMA_BACKOFF_SECONDS, raise_on_status=False,
+        )
+        adapter = TracedAdapter(pool_maxsize=config.OLLAMA_POOL_SIZE, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.timings = deque(maxlen=1000)
+        self.loads: Dict[str, Dict] = {}  # model -> {'loads', 'load_ms'} since start
+        self._loading = set()  # models a call in flight found cold (counted once, by that call)
+        self._lock = threading.Lock()
+
+    def timeout_for(self, model: str):
+        """(connect, read) timeout for a model; read bounds the gap between streamed tokens."""
+        return (config.OLLAMA_CONNECT_TIMEOUT, config.OLLAMA_TIMEOUTS.get(model, config.OLLAMA_DEFAULT_TIMEOUT))
+
+    def _payload(self, model: str, prompt: str, stream: bool, options: Optional[Dict],
+                 keep_alive: Optional[Union[str, int]] = None) -> Dict:
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            # keep the model resident between calls
+            "keep_alive": config.OLLAMA_KEEP_ALIVE if keep_alive is None else keep_alive,
+        }
+        if options:
+            payload["options"] = options
+        return payload
+
+    def resident_models(self) -> Optional[set]:
+        """Models Ollama currently holds in memory (GET /api/ps), or None if it can't be asked."""
+        try:
+            response = self.session.get(f"{self.base_url}/api/ps", timeout=config.OLLAMA_CONNECT_TIMEOUT,
+                                        verify=False)
+            response.raise_for_status()
+            return {_tagged(m.get('name') or m.get('model', '')) for m in response.json().get('models') or []}
+        except (requests.RequestException, ValueError):
+            return None
+
+    def _begin_call(self, model: str) -> Optional[bool]:
+        """
+        Before sending a request: will it load the model? Asked up front because
+        Ollama reports load_duration only in the final chunk, which a stream
+        closed early never receives. None if /api/ps is unavailable.
+        """
+        resident = self.resident_models()
+        if resident is None:
+            return None
+        cold = _tagged(model) not in resident
+        with self._lock:
+            if cold and model in self._loading:
+                return False  # a concurrent call is already loading it
+            if cold:
+                self._loading.add(model)
+        return cold
+
+    def _end_call(self, model: str, cold: Optional[bool]):
+        if cold:
+            with self._lock:
+                self._loading.discard(model)
+
+    def _record(self, model: str, started: float, meta: Dict, first_token: Optional[float] = None,
+                prompt: str = "", cold: Optional[bool] = None) -> Dict:
+        """Timings from Ollama's response metadata (durations in ns) plus client-side wall time."""
+        wall_ms = (time.perf_counter() - started) * 1000
+        total_ms = meta.get('total_duration', 0) / NS_PER_MS
+        timing = {
+            'model': model,
+            'wall_ms': round(wall_ms, 1),
+            # Time not spent inside Ollama's own generate call: request queueing + network
+            'queue_ms': round(max(0.0, wall_ms - total_ms), 1) if total_ms else None,
+            'load_ms': round(meta.get('load_duration', 0) / NS_PER_MS, 1),
+            # Tokens Ollama actually prefilled; a reused cached prefix is not counted
+            'prompt_eval_count': meta.get('prompt_eval_count', 0),
+            'prompt_tokens_est': approx_tokens(prompt),
+            'prompt_eval_ms': round(meta.get('prompt_eval_duration', 0) / NS_PER_MS, 1),
+            'eval_count': meta.get('eval_count', 0),
+            'eval_ms': round(meta.get('eval_duration', 0) / NS_PER_MS, 1),
+            # Ollama sends prompt_eval_* only in the final chunk: a stream closed early has no prefill stats
+            'prefill_measured': bool(meta.get('done')),
+        }
+        if first_token is not None:
+            timing['first_token_ms'] = round((first_token - started) * 1000, 1)
+        if cold is None:
+            self._note_load(model, timing['load_ms'])  # no /api/ps answer: infer from load_duration
+        elif cold:
+            # A stream closed early has no load_duration; the load happened before the first token
+            timing['load_ms'] = timing['load_ms'] or timing.get('first_token_ms') or timing['wall_ms']
+            self._note_load(model, timing['load_ms'], force=True)
+        timing['cold_load'] = cold
+        if timing['prefill_measured']:
+            METRICS.observe('llm_prefill', model, timing['prompt_eval_ms'] / 1000, items=timing['prompt_eval_count'])
+        # Per-model stage (items = generated tokens); the http.<host> span only covers headers
+        METRICS.observe('llm', model, wall_ms / 1000, items=timing['eval_count'])
+        with self._lock:
+            self.timings.append(timing)
+        return timing
+
+    def _note_load(self, model: str, load_ms: float, force: bool = False):
+        """
+        Count a model load (as a METRICS llm_load.<model> stage and in self.loads). Without
+        force, only a load_duration of at least COLD_LOAD_MS counts as a cold load.
+        """
+        if load_ms < COLD_LOAD_MS and not force:
+            return
+        METRICS.observe('llm_load', model, load_ms / 1000)
+        with self._lock:
+            entry = self.loads.setdefault(model, {'loads': 0, 'load_ms': 0.0})
+            entry['loads'] += 1
+            entry['load_ms'] += load_ms
+
+    def preload(self, model: str, keep_alive: str = None) -> float:
+        """
+        Load a model without generating (an empty prompt) and keep it resident for
+        keep_alive. Returns the load time in ms (near zero if it was already loaded).
+        """
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json=self._payload(model, "", False, None, keep_alive),
+            timeout=self.timeout_for(model),
+            verify=False
+        )
+        response.raise_for_status()
+        load_ms = round(response.json().get('load_duration', 0) / NS_PER_MS, 1)
+        self._note_load(model, load_ms)
+        return load_ms
+
+    def unload(self, model: str):
+        """Ask Ollama to evict a model now (keep_alive 0) so the next one has the memory."""
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json=self._payload(model, "", False, None, 0),
+            timeout=(config.OLLAMA_CONNECT_TIMEOUT, config.OLLAMA_DEFAULT_TIMEOUT),
+            verify=False
+        )
+        response.raise_for_status()
+
+    def generate(self, model: str, prompt: str, options: Dict = None) -> Dict:
+        """Non-streaming /api/generate. Returns {'response', 'timings'}."""
+        cold = self._begin_call(model)
+        try:
+            started = time.perf_counter()
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(model, prompt, False, options),
+                timeout=self.timeout_for(model),
+                verify=False
+            )
+            response.raise_for_status()
+            result = response.json()
+            timings = self._record(model, started, result, prompt=prompt, cold=cold)
+        finally:
+            self._end_call(model, cold)
+        return {'response': result.get('response', ''), 'timings': timings}
+
+    def stream_generate(self, model: str, prompt: str,
+                        on_update: Callable[[str], bool] = None, options: Dict = None) -> Dict:
+        """
+        Streaming /api/generate. on_update receives the text so far after each chunk and
+        returns True to stop; closing the stream aborts generation in Ollama.
+        Returns {'response', 'stopped_early', 'timings'}.
+        """
+        cold = self._begin_call(model)
+        try:
+            return self._stream(model, prompt, on_update, options, cold)
+        finally:
+            self._end_call(model, cold)
+
+    def _stream(self, model: str, prompt: str, on_update: Optional[Callable[[str], bool]],
+                options: Optional[Dict], cold: Optional[bool]) -> Dict:
+        started = time.perf_counter()
+        first_token = None
+        text = ""
+        meta: Dict = {}
+        stopped_early = False
+        with self.session.post(
+            f"{self.base_url}/api/generate",
+            json=self._payload(model, prompt, True, options),
+            stream=True,
+            timeout=self.timeout_for(model),
+            verify=False
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if first_token is None:
+                    first_token = time.perf_counter()
+                text += chunk.get('response', '')
+                if chunk.get('done'):
+                    meta = chunk
+                    break
+                if on_update and on_update(text):
+                    stopped_early = True
+                    break
+        return {
+            'response': text,
+            'stopped_early': stopped_early,
+            'timings': self._record(model, started, meta, first_token, prompt, cold),
+        }
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Per-model request counts, mean wall/prompt-eval/generation times and cold loads.
+        prefill_unmeasured counts calls (streams closed early) whose prompt eval was not
+        reported; the prompt-eval means include them as zeros.
+        """
+        with self._lock:
+            timings = list(self.timings)
+        summary: Dict[str, Dict] = {}
+        for t in timings:
+            s = summary.setdefault(t['model'], {'requests': 0, 'prefill_unmeasured': 0, 'wall_ms': 0.0,
+                                                'prompt_eval_ms': 0.0, 'prompt_eval_count': 0.0, 'eval_ms': 0.0})
+            s['requests'] += 1
+            s['prefill_unmeasured'] += not t['prefill_measured']
+            for key in ('wall_ms', 'prompt_eval_ms', 'prompt_eval_count', 'eval_ms'):
+                s[key] += t[key]
+        for s in summary.values():
+            for key in ('wall_ms', 'prompt_eval_ms', 'prompt_eval_count', 'eval_ms'):
+                s[f'avg_{key}'] = round(s.pop(key) / s['requests'], 1)
+        with self._lock:
+            loads = {model: dict(entry) for model, entry in self.loads.items()}
+        for model, entry in loads.items():
+            s = summary.setdefault(model, {'requests': 0})
+            s['loads'] = entry['loads']
+            s['load_ms'] = round(entry['load_ms'], 1)
+        return summary
+
+
+def describe_prefill(timings: Dict) -> str:
+    """One-line prompt-eval summary of a call for the agents' logs."""
+    estimate = timings.get('prompt_tokens_est', 0)
+    if not timings.get('prefill_measured'):
+        # The stream was closed before Ollama's final chunk, the only one carrying prompt_eval_*
+        first_token = timings.get('first_token_ms')
+        waited = f", first token after {first_token:.0f} ms" if first_token is not None else ""
+        return f"~{estimate} tokens; prefill not measured (stream closed before Ollama's final stats){waited}"
+    # Fewer evaluated tokens than the prompt holds means Ollama reused a cached prefix
+    return (f"{timings['prompt_eval_count']} tokens evaluated in {timings['prompt_eval_ms']:.0f} ms "
+            f"(~{estimate} in prompt)")
+
+
+def _tagged(model: str) -> str:
+    """Ollama's full model name: an untagged name means the :latest tag."""
+    return model if ':' in model else f"{model}:latest"
+
+
+_clients: Dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ollama_client(base_url: str = None) -> OllamaClient:
+    """Process-wide client for an Ollama endpoint."""
+    base_url = base_url or config.OLLAMA_BASE_URL
+    with _clients_lock:
+        if base_url not in _clients:
+            _clients[base_url] = OllamaClient(base_url)
+        return _clients[base_url]
@@ -1,12 +1,11 @@
 """Portfolio Manager using DeepSeek-R1 with reasoning capabilities."""
-import requests
 import re
-from typing import Dict
+from typing import Callable, Dict, Optional
 import config
-import urllib3
+from agents.ollama_client import get_ollama_client, describe_prefill
+from agents.prompts import portfolio_prompt
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+THINK_OPEN, THINK_CLOSE = '<think>', '</think>'
 
 
 class PortfolioManager:
@@ -16,6 +15,8 @@ class PortfolioManager:
         """Initialize Ollama client for DeepSeek-R1."""
         self.base_url = config.OLLAMA_BASE_URL
         self.model = config.PORTFOLIO_MANAGER_MODEL
+        self.client = get_ollama_client(self.base_url)
+        self.on_think = None  # optional progress callback for streamed <think> text
     
     def extract_thinking(self, response: str) -> tuple[str, str]:
         """Extract <think> block and final decision from response."""
@@ -27,75 +28,62 @@ class PortfolioManager:
         final_answer = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL).strip()
         
         return thinking, final_answer
-    
-    def make_decision(self, ticker: str, sentiment_data: Dict, technical_data: Dict, 
-                     market_data: Dict, historical_trades: list = None,
-                     news_alert: Dict = None) -> Dict:
-        """Make final trading decision with reasoning and historical context."""
-        
-        # Build historical context if available
-        historical_context = ""
-        if historical_trades and len(historical_trades) > 0:
-            historical_context = "\n\nHISTORICAL CONTEXT (Past 5 trades for this stock):\n"
-            for i, trade in enumerate(historical_trades[:5], 1):
-                historical_context += f"{i}. {trade['timestamp'].strftime('%Y-%m-%d')}: {trade['action']} at ${trade['price']:.2f} "
-                historical_context += f"(Sentiment: {trade['sentiment_avg']:.2f}, RSI: {trade['rsi']:.1f}) "
-                historical_context += f"- {trade['reasoning']}\n"
 
-        # Build news alert context
-        news_context = ""
-        if news_alert and news_alert.get('alert'):
-            direction = news_alert.get('direction', 'neutral').upper()
-            score = news_alert.get('score', 0.0)
-            count = news_alert.get('articles_count', 0)
-            news_context = (
-                f"\n\nSENTINEL NEWS ALERT (last 1 hour, time-weighted):\n"
-                f"- Aggregate News Score: {score:.3f} ({direction})\n"
-                f"- Articles Analyzed: {count}\n"
-                f"- ALERT: Strong {direction} signal detected from recent news\n"
-            )
-        
-        prompt = f"""You are a Portfolio Manager making critical trading decisions. Use your reasoning capabilities to validate this trade signal.
-
-TICKER: {ticker}
+    def decision_complete(self, text: str) -> bool:
+        """True once DECISION, CONFIDENCE and a newline-terminated REASONING follow </think>."""
+        if THINK_OPEN in text and THINK_CLOSE not in text:
+            return False  # still thinking; field names inside <think> don't count
+        final_answer = text.split(THINK_CLOSE, 1)[-1]
+        return bool(
+            re.search(r'DECISION:\s*(BUY|SELL|HOLD)', final_answer, re.IGNORECASE)
+            and re.search(r'CONFIDENCE:\s*(HIGH|MEDIUM|LOW)', final_answer, re.IGNORECASE)
+            and re.search(r'REASONING:[ \t]*\S.*\n', final_answer, re.IGNORECASE)
+        )
 
-SENTIMENT ANALYSIS:
-- Overall Sentiment: {sentiment_data['avg_sentiment']}
-- Sentiment Score: {sentiment_data['avg_score']:.2f} (-1 to 1 scale)
-- Positive: {sentiment_data['positive_ratio']:.1%}
-- Negative: {sentiment_data['negative_ratio']:.1%}
-- Neutral: {sentiment_data['neutral_ratio']:.1%}
-- Headlines Analyzed: {sentiment_data['total_headlines']}
+    def _emit_thinking(self, text: str, emitted: int, on_think: Callable[[str], None]) -> int:
+        """Forward newly generated <think> text to the callback. Returns chars emitted so far."""
+        start = text.find(THINK_OPEN)
+        if start < 0:
+            return emitted
+        start += len(THINK_OPEN)
+        end = text.find(THINK_CLOSE, start)
+        if end < 0:
+            # Hold back a possible partial closing tag at the end of the buffer
+            end = max(start, len(text) - len(THINK_CLOSE) + 1)
+        if end - start > emitted:
+            on_think(text[start + emitted:end])
+            emitted = end - start
+        return emitted
 
-TECHNICAL ANALYSIS:
-- RSI: {technical_data['indicators']['rsi']:.2f}
-- MACD: {technical_data['indicators']['macd']['macd']:.4f}
-- MACD Signal: {technical_data['indicators']['macd']['signal']:.4f}
-- MACD Histogram: {technical_data['indicators']['macd']['histogram']:.4f}
-- Specialist Analysis: {technical_data['analysis']}
+    def stream_generate(self, prompt: str,
+                        on_think: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Stream a DeepSeek-R1 generation, parsing tokens as they arrive.
+        Closes the stream (which aborts generation in Ollama) as soon as the
+        decision fields are complete. Returns {'response', 'stopped_early', 'timings'}.
+        """
+        emitted = 0
 
-MARKET DATA:
-- Current Price: ${market_data['current_price']:.2f}
-- Change: ${market_data['change']:.2f} ({market_data['percent_change']:.2f}%)
-- High: ${market_data['high']:.2f}
-- Low: ${market_data['low']:.2f}
-- Previous Close: ${market_data['previous_close']:.2f}
-{historical_context}{news_context}
-INSTRUCTIONS:
-1. Use <think> tags to show your Chain of Thought reasoning
-2. In your <think> block, analyze:
-   - Alignment between sentiment and technical signals
-   - Risk factors and potential conflicts
-   - Market conditions and price action
-   - Historical patterns (if available)
-   - Why you accept or reject this signal
-3. After </think>, provide your final decision in this exact format:
+        def _on_update(text: str) -> bool:
+            nonlocal emitted
+            if on_think:
+                emitted = self._emit_thinking(text, emitted, on_think)
+            return self.decision_complete(text)
 
-DECISION: [BUY/SELL/HOLD]
-CONFIDENCE: [HIGH/MEDIUM/LOW]
-REASONING: [One sentence explanation]
-
-Be decisive and clear. Your reasoning in <think> must justify your final decision."""
+        return self.client.stream_generate(self.model, prompt, on_update=_on_update)
+    
+    def make_decision(self, ticker: str, sentiment_data: Dict, technical_data: Dict, 
+                     market_data: Dict, historical_trades: list = None,
+                     news_alert: Dict = None,
+                     on_think: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Make final trading decision with reasoning and historical context.
+        on_think receives <think> text as it is generated (defaults to self.on_think).
+        """
+        
+        # Fixed instructions first, then this ticker's data, so Ollama reuses the prefix's prompt eval
+        prompt = portfolio_prompt(ticker, sentiment_data, technical_data, market_data,
+                                  historical_trades, news_alert)
 
         try:
             print(f"\n[DeepSeek-R1] Making decision for {ticker}...")
@@ -103,28 +91,20 @@ Be decisive and clear. Your reasoning in <think> must justify your final decisio
             print(f"[DeepSeek-R1] RSI: {technical_data['indicators']['rsi']:.2f}")
             print(f"[DeepSeek-R1] Calling model (this may take 1-2 minutes)...")
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                },
-                timeout=600,
-                verify=False
-            )
-            response.raise_for_status()
-            
-            # Parse response properly
-            result = response.json()
-            full_response = result.get('response', '')
+            on_think = on_think or self.on_think
+            result = self.stream_generate(prompt, on_think=on_think)
+            full_response, stopped_early = result['response'], result['stopped_early']
+            timings = result['timings']
             
-            print(f"\n[DeepSeek-R1] Response received ({len(full_response)} chars)")
+            status = "stopped early, decision complete" if stopped_early else "generation finished"
+            print(f"\n[DeepSeek-R1] Response received ({len(full_response)} chars, {status}, "
+                  f"{timings['wall_ms'] / 1000:.1f}s)")
+            print(f"[DeepSeek-R1] Prompt: {describe_prefill(timings)}")
             
             # Extract thinking and decision
             thinking, final_answer = self.extract_thinking(full_response)
             
-            if thinking:
+            if thinking and not on_think:
                 print(f"\n{'='*80}")
                 print(f"[DeepSeek-R1] THINKING PROCESS:")
                 print(f"{'='*80}")
@@ -154,7 +134,9 @@ Be decisive and clear. Your reasoning in <think> must justify your final decisio
                 'reasoning': reasoning,
                 'thinking_process': thinking,
                 'approved': approved,
-                'full_response': full_response
+                'full_response': full_response,
+                'stopped_early': stopped_early,
+                'llm_timings': timings
             }
             
         except Exception as e:
@@ -167,25 +149,7 @@ Be decisive and clear. Your reasoning in <think> must justify your final decisio
                 'reasoning': error_msg,
                 'thinking_process': '',
                 'approved': False,
-                'full_response': ''
-            }
-            return {
-                'ticker': ticker,
-                'decision': decision,
-                'confidence': confidence,
-                'reasoning': reasoning,
-                'thinking_process': thinking,
-                'approved': approved,
-                'full_response': full_response
-            }
-            
-        except Exception as e:
-            return {
-                'ticker': ticker,
-                'decision': 'HOLD',
-                'confidence': 'LOW',
-                'reasoning': f'Error in decision making: {str(e)}',
-                'thinking_process': '',
-                'approved': False,
-                'full_response': ''
+                'full_response': '',
+                'stopped_early': False,
+                'llm_timings': {}
             }
@@ -0,0 +1,132 @@
+"""
+Prompt templates for the Ollama agents, laid out for prompt-cache reuse.
+
+Each prompt is a fixed instruction prefix (identical for every ticker and call)
+followed by a compact per-ticker data block. Ollama reuses the evaluated prefix
+of the previous request when the new prompt starts with the same tokens, so
+only the data block is prefilled on each call.
+"""
+from typing import Dict, List, Optional
+
+import config
+
+# Rough tokens-per-character for English prose with Llama/Qwen tokenizers; no tokenizer is loaded here
+CHARS_PER_TOKEN = 4
+
+TECHNICAL_PREFIX = """You are a technical analysis specialist. You will receive market data and technical indicators for one stock.
+
+Provide a concise technical analysis (2-3 sentences) focusing on:
+1. RSI interpretation (overbought >70, oversold <30)
+2. MACD trend and momentum
+3. Overall technical signal (bullish/bearish/neutral)
+
+"""
+
+PORTFOLIO_PREFIX = """You are a Portfolio Manager making critical trading decisions. Use your reasoning capabilities to validate the trade signal for the stock described below.
+
+The data block contains sentiment analysis (scores on a -1 to 1 scale), technical analysis, market data and, when available, the stock's recent trades and a Sentinel news alert (last 1 hour, time-weighted).
+
+INSTRUCTIONS:
+1. Use <think> tags to show your Chain of Thought reasoning
+2. In your <think> block, analyze:
+   - Alignment between sentiment and technical signals
+   - Risk factors and potential conflicts
+   - Market conditions and price action
+   - Historical patterns (if available)
+   - Why you accept or reject this signal
+3. After </think>, provide your final decision in this exact format:
+
+DECISION: [BUY/SELL/HOLD]
+CONFIDENCE: [HIGH/MEDIUM/LOW]
+REASONING: [One sentence explanation]
+
+Be decisive and clear. Your reasoning in <think> must justify your final decision.
+
+"""
+
+
+def approx_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    """Cut text to about `budget` tokens at a word boundary, marking the cut with an ellipsis."""
+    text = " ".join((text or "").split())
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0] or text[:limit]
+    return cut.rstrip(" ,;:.") + "..."
+
+
+def _market_lines(market_data: Dict) -> List[str]:
+    return [
+        f"Price: ${market_data['current_price']:.2f} | Change: ${market_data['change']:.2f} "
+        f"({market_data['percent_change']:.2f}%)",
+        f"High: ${market_data['high']:.2f} | Low: ${market_data['low']:.2f} | "
+        f"Previous Close: ${market_data['previous_close']:.2f}",
+    ]
+
+
+def _indicator_lines(indicators: Dict) -> List[str]:
+    macd = indicators['macd']
+    return [
+        f"RSI (14): {indicators['rsi']:.2f}",
+        f"MACD: {macd['macd']:.4f} | Signal: {macd['signal']:.4f} | Histogram: {macd['histogram']:.4f}",
+    ]
+
+
+def technical_prompt(ticker: str, market_data: Dict, indicators: Dict) -> str:
+    lines = [f"TICKER: {ticker}", *_market_lines(market_data), *_indicator_lines(indicators)]
+    return TECHNICAL_PREFIX + "\n".join(lines)
+
+
+def history_lines(trades: Optional[List[Dict]], limit: int = 5) -> List[str]:
+    """
+    Past trades, newest first. Each trade's reasoning is cut to PROMPT_REASONING_TOKENS and
+    the block stops before exceeding PROMPT_HISTORY_TOKENS.
+    """
+    lines: List[str] = []
+    used = 0
+    for trade in (trades or [])[:limit]:
+        reasoning = truncate_tokens(trade['reasoning'], config.PROMPT_REASONING_TOKENS)
+        line = (f"{trade['timestamp'].strftime('%Y-%m-%d')}: {trade['action']} at ${trade['price']:.2f} "
+                f"(Sentiment: {trade['sentiment_avg']:.2f}, RSI: {trade['rsi']:.1f}) - {reasoning}")
+        used += approx_tokens(line)
+        if used > config.PROMPT_HISTORY_TOKENS:
+            break
+        lines.append(line)
+    return lines
+
+
+def portfolio_prompt(ticker: str, sentiment_data: Dict, technical_data: Dict, market_data: Dict,
+                     historical_trades: Optional[List[Dict]] = None, news_alert: Optional[Dict] = None) -> str:
+    lines = [
+        f"TICKER: {ticker}",
+        "",
+        "SENTIMENT:",
+        f"Overall: {sentiment_data['avg_sentiment']} | Score: {sentiment_data['avg_score']:.2f} | "
+        f"Headlines: {sentiment_data['total_headlines']}",
+        f"Positive: {sentiment_data['positive_ratio']:.1%} | Negative: {sentiment_data['negative_ratio']:.1%} | "
+        f"Neutral: {sentiment_data['neutral_ratio']:.1%}",
+        "",
+        "TECHNICAL:",
+        *_indicator_lines(technical_data['indicators']),
+        f"Specialist Analysis: {technical_data['analysis']}",
+        "",
+        "MARKET DATA:",
+        *_market_lines(market_data),
+    ]
+    history = history_lines(historical_trades)
+    if history:
+        lines += ["", f"RECENT TRADES ({len(history)}):", *(f"{i}. {line}" for i, line in enumerate(history, 1))]
+    if news_alert and news_alert.get('alert'):
+        direction = news_alert.get('direction', 'neutral').upper()
+        lines += [
+            "",
+            "SENTINEL NEWS ALERT:",
+            f"Aggregate News Score: {news_alert.get('score', 0.0):.3f} ({direction}) | "
+            f"Articles: {news_alert.get('articles_count', 0)}",
+            f"ALERT: Strong {direction} signal detected from recent news",
+        ]
+    return PORTFOLIO_PREFIX + "\n".join(lines)
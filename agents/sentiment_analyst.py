@@ -1,30 +1,23 @@
 """Sentiment Analyst using local FinBERT model."""
-import torch
-from transformers import BertTokenizer, BertForSequenceClassification
+import threading
 from typing import List, Dict, Optional
-import config
+from data.sentiment_cache import SentimentCache
 from database.db_manager import DatabaseManager
+from inference.lazy import LazyBackend
 
 
 class SentimentAnalyst:
     """Analyzes news sentiment using FinBERT."""
     
-    def __init__(self, model=None, tokenizer=None):
-        """Initialize FinBERT model from local directory, or accept a shared instance."""
-        if model is not None and tokenizer is not None:
-            # Reuse shared model instance (avoids double-loading with NewsEngine)
-            self.model = model
-            self.tokenizer = tokenizer
-        else:
-            model_path = str(config.FINBERT_PATH)
-            self.tokenizer = BertTokenizer.from_pretrained(model_path, local_files_only=True)
-            self.model = BertForSequenceClassification.from_pretrained(model_path, local_files_only=True)
-            self.model.eval()
-            self.model.to(torch.device("cpu"))
-
-        self.device = torch.device("cpu")
+    def __init__(self, backend=None, inference_lock=None, cache: SentimentCache = None):
+        """Initialize the configured FinBERT backend, or accept a shared instance."""
+        # Reuse shared backend instance when given (avoids double-loading with NewsEngine)
+        self.backend = backend if backend is not None else LazyBackend()
+        # Share the NewsEngine lock when sharing its model so FinBERT stays single-threaded
+        self.inference_lock = inference_lock or threading.Lock()
         self.db = DatabaseManager()
-        self.labels = ['negative', 'neutral', 'positive']
+        self.cache = cache or SentimentCache(db=self.db)
+        self.labels = self.backend.labels
     
     def from_news_engine(self, ticker: str, news_result: Dict) -> Dict:
         """
@@ -60,15 +53,16 @@ class SentimentAnalyst:
 
     def analyze_headline(self, headline: str) -> Dict[str, float]:
         """Analyze a single headline and return sentiment scores."""
-        inputs = self.tokenizer(headline, return_tensors="pt", truncation=True, 
-                               max_length=512, padding=True)
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        
-        scores = {label: float(prob) for label, prob in zip(self.labels, probs[0])}
+        probs = self.cache.get_or_compute([headline], self._infer)
+        return self._to_result(probs[0])
+    
+    def _infer(self, headlines: List[str]):
+        """Run FinBERT under the shared inference lock. Returns class probabilities."""
+        with self.inference_lock:
+            return self.backend.predict_proba(headlines)
+    
+    def _to_result(self, probs) -> Dict:
+        scores = {label: float(prob) for label, prob in zip(self.labels, probs)}
         sentiment = max(scores, key=scores.get)
         
         return {
@@ -90,9 +84,11 @@ class SentimentAnalyst:
                 'total_headlines': 0
             }
         
+        # Cached headlines skip inference; the rest are scored in one batch
+        probs = self.cache.get_or_compute(headlines, self._infer)
         results = []
-        for headline in headlines:
-            result = self.analyze_headline(headline)
+        for headline, p in zip(headlines, probs):
+            result = self._to_result(p)
             results.append(result)
             
             # Store in database
@@ -1,12 +1,14 @@
 """Technical Specialist using Llama 3.2 via Ollama."""
+import math
+import threading
+import numpy as np
 import pandas as pd
-import requests
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import config
-import urllib3
-
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from agents.analysis_cache import AnalysisCache
+from agents.indicator_engine import IndicatorEngine
+from agents.ollama_client import get_ollama_client, describe_prefill
+from agents.prompts import technical_prompt
 
 
 class TechnicalSpecialist:
@@ -16,6 +18,12 @@ class TechnicalSpecialist:
         """Initialize Ollama client."""
         self.base_url = config.OLLAMA_BASE_URL
         self.model = config.SPECIALIST_MODEL
+        self.client = get_ollama_client(self.base_url)
+        self.buckets = config.LLAMA_CACHE_BUCKETS
+        # compute_universe state per ticker: (single-ticker IndicatorEngine, last folded bar time)
+        self._engines: Dict[str, Tuple[IndicatorEngine, pd.Timestamp]] = {}
+        self._engines_lock = threading.Lock()
+        self.cache = AnalysisCache(self.model, config.LLAMA_CACHE_TTL_MINUTES) if config.LLAMA_CACHE_ENABLED else None
     
     def compute_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """Compute RSI indicator."""
@@ -41,70 +49,139 @@ class TechnicalSpecialist:
             'histogram': float(histogram.iloc[-1])
         }
     
-    def analyze_with_llama(self, ticker: str, market_data: Dict, indicators: Dict) -> str:
-        """Use Llama 3.2 to analyze technical indicators."""
-        prompt = f"""You are a technical analysis specialist. Analyze the following market data and technical indicators for {ticker}:
+    def compute_universe(self, price_histories: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """
+        RSI/MACD (plus Wilder RSI, Bollinger, ATR) for a batch of tickers. Completed bars are
+        folded into IndicatorEngine state kept per ticker between cycles, so each new bar costs
+        O(1) whatever batch or shard the ticker arrives in; the last stored bar may still be
+        revised intraday, so it is only peeked at. Tickers with fewer than two bars are left out.
+        Returns {ticker: indicators}.
+        """
+        histories = {t: h for t, h in price_histories.items() if h is not None and len(h) > 1}
+        if not histories:
+            return {}
+        completed = {t: h.iloc[:-1] for t, h in histories.items()}
+        with self._engines_lock:
+            new_bars = {t: self._new_bars(self._engines.get(t), h) for t, h in completed.items()}
+            refit = [t for t, bars in new_bars.items() if bars is None]
+            current = [t for t, bars in new_bars.items() if bars is not None]
+            parts = []
+            if refit:
+                engine = IndicatorEngine(refit)
+                engine.fit(completed)
+                parts.append(engine)
+            if current:
+                engine = IndicatorEngine.join([self._engines[t][0] for t in current])
+                for step in range(max(len(new_bars[t]) for t in current)):
+                    engine.update(*self._bar_arrays(engine, {t: new_bars[t].iloc[step] for t in current
+                                                             if step < len(new_bars[t])}))
+                parts.append(engine)
+            engine = IndicatorEngine.join(parts) if len(parts) > 1 else parts[0]
+            for ticker, single in engine.split().items():
+                self._engines[ticker] = (single, completed[ticker].index[-1])
+            return engine.peek(*self._bar_arrays(engine, {t: h.iloc[-1] for t, h in histories.items()}))
+
+    @staticmethod
+    def _new_bars(cached: Optional[Tuple], completed: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Completed bars not yet folded, or None if nothing is cached or the history no longer extends it."""
+        if cached is None or cached[1] not in completed.index:
+            return None
+        return completed[completed.index > cached[1]]
 
-Market Data:
-- Current Price: ${market_data['current_price']:.2f}
-- Change: ${market_data['change']:.2f} ({market_data['percent_change']:.2f}%)
-- High: ${market_data['high']:.2f}
-- Low: ${market_data['low']:.2f}
-- Previous Close: ${market_data['previous_close']:.2f}
+    @staticmethod
+    def _bar_arrays(engine: IndicatorEngine, bars: Dict[str, pd.Series]) -> Tuple[np.ndarray, ...]:
+        """One bar per engine ticker as (close, high, low) arrays; NaN where a ticker has no bar."""
+        arrays = tuple(np.full(len(engine.tickers), np.nan) for _ in range(3))
+        for ticker, bar in bars.items():
+            i = engine.index[ticker]
+            for array, column in zip(arrays, ('close', 'high', 'low')):
+                array[i] = bar.get(column, np.nan)
+        return arrays
+
+    def cache_key(self, ticker: str, market_data: Dict, indicators: Dict) -> str:
+        """Ticker plus bucketed RSI, MACD, histogram and price; nearby inputs share a key."""
+        price = market_data['current_price']
+        macd = indicators['macd']
+        b = self.buckets
+        rsi_bucket = math.floor(indicators['rsi'] / b['rsi'])
+        macd_bucket = math.floor(100 * macd['macd'] / price / b['macd_pct'])
+        hist_bucket = math.floor(100 * macd['histogram'] / price / b['histogram_pct'])
+        hist_sign = (macd['histogram'] > 0) - (macd['histogram'] < 0)
+        # Log-scale price buckets: each bucket spans price_pct percent regardless of price level
+        price_bucket = math.floor(math.log(price) / math.log1p(b['price_pct'] / 100))
+        return f"{ticker}|rsi{rsi_bucket}|macd{macd_bucket}|hist{hist_bucket}{hist_sign:+d}|px{price_bucket}"
+
+    def analyze_with_llama(self, ticker: str, market_data: Dict, indicators: Dict) -> str:
+        """Use Llama 3.2 to analyze technical indicators, reusing a cached analysis when inputs match."""
+        analysis, _, _ = self._analyze_with_cache(ticker, market_data, indicators)
+        return analysis
 
-Technical Indicators:
-- RSI (14): {indicators['rsi']:.2f}
-- MACD: {indicators['macd']['macd']:.4f}
-- MACD Signal: {indicators['macd']['signal']:.4f}
-- MACD Histogram: {indicators['macd']['histogram']:.4f}
+    def _analyze_with_cache(self, ticker: str, market_data: Dict,
+                            indicators: Dict) -> Tuple[str, bool, Optional[Dict]]:
+        """Returns (analysis, served_from_cache, timings). Only successful LLM responses are cached."""
+        if self.cache is None:
+            analysis, _, timings = self._call_llama(ticker, market_data, indicators)
+            return analysis, False, timings
+        try:
+            key = self.cache_key(ticker, market_data, indicators)
+        except (ValueError, ZeroDivisionError):
+            # NaN indicators or a zero price can't be bucketed; always ask the model
+            analysis, _, timings = self._call_llama(ticker, market_data, indicators)
+            return analysis, False, timings
+        cached = self.cache.get(key)
+        if cached is not None:
+            print(f"[Llama 3.2] Cache hit for {ticker} ({key}), skipping LLM call")
+            return cached, True, None
+        analysis, ok, timings = self._call_llama(ticker, market_data, indicators)
+        if ok:
+            self.cache.put(key, ticker, analysis)
+        return analysis, False, timings
 
-Provide a concise technical analysis (2-3 sentences) focusing on:
-1. RSI interpretation (overbought >70, oversold <30)
-2. MACD trend and momentum
-3. Overall technical signal (bullish/bearish/neutral)"""
+    def _call_llama(self, ticker: str, market_data: Dict, indicators: Dict) -> Tuple[str, bool, Optional[Dict]]:
+        """Call Llama 3.2 via Ollama. Returns (analysis or error message, succeeded, timings)."""
+        prompt = technical_prompt(ticker, market_data, indicators)
 
         try:
             print(f"\n[Llama 3.2] Analyzing technical indicators for {ticker}...")
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False
-                },
-                timeout=60,
-                verify=False
-            )
-            response.raise_for_status()
-            
-            # Parse response properly
-            result = response.json()
-            analysis = result.get('response', '')
+            result = self.client.generate(self.model, prompt)
+            analysis = result['response']
             
             print(f"[Llama 3.2] Analysis: {analysis[:200]}...")
-            return analysis
+            print(f"[Llama 3.2] Prompt: {describe_prefill(result['timings'])}")
+            return analysis, True, result['timings']
             
         except Exception as e:
             error_msg = f"Technical analysis unavailable: {str(e)}"
             print(f"[Llama 3.2] Error: {error_msg}")
-            return error_msg
+            return error_msg, False, None
     
-    def analyze(self, ticker: str, market_data: Dict, price_history: pd.DataFrame) -> Dict:
-        """Perform complete technical analysis."""
+    def analyze(self, ticker: str, market_data: Dict, price_history: pd.DataFrame,
+                indicators: Dict = None) -> Dict:
+        """Perform complete technical analysis, optionally on indicators precomputed by compute_universe."""
         # Compute indicators
-        rsi = self.compute_rsi(price_history['close'])
-        macd = self.compute_macd(price_history['close'])
-        
-        indicators = {
-            'rsi': rsi,
-            'macd': macd
-        }
+        if indicators is None:
+            rsi = self.compute_rsi(price_history['close'])
+            macd = self.compute_macd(price_history['close'])
+            
+            indicators = {
+                'rsi': rsi,
+                'macd': macd
+            }
         
-        # Get LLM analysis
-        analysis = self.analyze_with_llama(ticker, market_data, indicators)
+        # Get LLM analysis (served from cache when inputs fall in the same buckets)
+        analysis, cached, timings = self._analyze_with_cache(ticker, market_data, indicators)
         
         return {
             'ticker': ticker,
             'indicators': indicators,
-            'analysis': analysis
+            'analysis': analysis,
+            'analysis_cached': cached,
+            'llm_cache': self.cache_stats(),
+            'llm_timings': timings or {}
         }
+
+    def cache_stats(self) -> Dict:
+        """Hit rate and bucket sizes of the analysis cache."""
+        if self.cache is None:
+            return {'enabled': False}
+        return {'enabled': True, 'buckets': dict(self.buckets), **self.cache.stats()}
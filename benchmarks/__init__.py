@@ -0,0 +1 @@
+"""Offline benchmarks: run the pipeline against local stand-ins for every external service."""
@@ -0,0 +1,133 @@
+"""Recorded yfinance fixtures (history + news) served through a drop-in yf.Ticker replacement."""
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+MARKET_TZ = "America/New_York"
+SYNTHETIC_HEADLINES = [
+    "{t} beats quarterly revenue estimates",
+    "{t} shares slide after weak outlook",
+    "{t} expands partnership with major cloud provider",
+    "Investors weigh {t} valuation after rally",
+    "{t} CEO to step down at year end",
+    "{t} wins large government contract",
+    "{t} recalls products over safety concerns",
+    "Hedge funds boost stakes in {t}",
+]
+
+
+def record(tickers: List[str], period: str = "5y", out_dir: Path = FIXTURE_DIR):
+    """Save live yfinance history + news per ticker as <TICKER>.json (needs network)."""
+    import yfinance as yf
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for ticker in tickers:
+        stock = yf.Ticker(ticker)
+        hist = stock.history(period=period)
+        news = stock.news or []
+        payload = {
+            'ticker': ticker,
+            'history': {
+                'index': [ts.isoformat() for ts in hist.index],
+                'columns': list(hist.columns),
+                'data': hist.to_numpy().tolist(),
+            },
+            'news': [{k: item.get(k) for k in ('title', 'link', 'providerPublishTime', 'url', 'publishedAt')}
+                     for item in news],
+        }
+        (out_dir / f"{ticker}.json").write_text(json.dumps(payload, default=str))
+        print(f"  recorded {ticker}: {len(hist)} bars, {len(news)} news items")
+
+
+def _synthetic(ticker: str, bars: int = 1260) -> Dict:
+    """Seeded random-walk history and templated news, used when nothing has been recorded."""
+    seed = int(hashlib.sha256(ticker.encode()).hexdigest()[:8], 16)
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.now(tz=MARKET_TZ).normalize(), periods=bars)
+    close = (20 + seed % 480) * np.exp(np.cumsum(rng.normal(0, 0.015, bars)))
+    open_ = close * (1 + rng.normal(0, 0.004, bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, bars)))
+    volume = rng.integers(1_000_000, 50_000_000, bars).astype(float)
+    history = pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                           index=index)
+    return {'history': history, 'news': [
+        {'title': template.format(t=ticker), 'link': f"https://fixtures.example.com/{ticker}/{i}"}
+        for i, template in enumerate(SYNTHETIC_HEADLINES)
+    ]}
+
+
+class FixtureSet:
+    """
+    Serves recorded fixtures, re-using them round-robin for benchmark tickers
+    that were never recorded (symbol-specific fields like URLs are rewritten).
+    Falls back to seeded synthetic data if no fixtures are recorded.
+    """
+
+    def __init__(self, fixture_dir: Path = FIXTURE_DIR, rss_share: float = 0.3):
+        self.recorded = sorted(fixture_dir.glob("*.json")) if fixture_dir.exists() else []
+        self.rss_share = rss_share  # fraction of tickers with no yfinance news (exercises the RSS fallback)
+        self._cache: Dict[str, Dict] = {}
+
+    @property
+    def source(self) -> str:
+        return f"{len(self.recorded)} recorded fixtures" if self.recorded else "synthetic (no recorded fixtures)"
+
+    def _load(self, ticker: str) -> Dict:
+        if ticker in self._cache:
+            return self._cache[ticker]
+        if not self.recorded:
+            data = _synthetic(ticker)
+        else:
+            seed = int(hashlib.sha256(ticker.encode()).hexdigest()[:8], 16)
+            raw = json.loads(self.recorded[seed % len(self.recorded)].read_text())
+            hist = raw['history']
+            index = pd.to_datetime(hist['index'], utc=True).tz_convert(MARKET_TZ)
+            history = pd.DataFrame(hist['data'], index=index, columns=hist['columns'])
+            source = raw['ticker']
+            news = [dict(item, title=(item.get('title') or '').replace(source, ticker),
+                         link=f"{item.get('link') or item.get('url')}#{ticker}")
+                    for item in raw['news']]
+            data = {'history': history, 'news': news}
+        seed = int(hashlib.sha256(ticker.encode()).hexdigest()[8:16], 16)
+        if (seed % 1000) / 1000 < self.rss_share:
+            data = dict(data, news=[])
+        self._cache[ticker] = data
+        return data
+
+    def ticker(self, symbol: str) -> "FixtureTicker":
+        return FixtureTicker(symbol, self)
+
+
+class FixtureTicker:
+    """The slice of yf.Ticker the pipeline uses: .news and .history(period=... | start=...)."""
+
+    def __init__(self, symbol: str, fixtures: FixtureSet):
+        self.symbol = symbol
+        self._data = fixtures._load(symbol)
+
+    @property
+    def news(self) -> List[Dict]:
+        return list(self._data['news'])
+
+    def history(self, period: str = None, start: str = None, **kwargs) -> pd.DataFrame:
+        history = self._data['history']
+        if start is not None:
+            return history[history.index >= pd.Timestamp(start, tz=MARKET_TZ)].copy()
+        if period and period.endswith('y'):
+            cutoff = history.index[-1] - pd.DateOffset(years=int(period[:-1]))
+            return history[history.index > cutoff].copy()
+        if period and period.endswith('mo'):
+            cutoff = history.index[-1] - pd.DateOffset(months=int(period[:-2]))
+            return history[history.index > cutoff].copy()
+        return history.copy()
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.fixtures AAPL MSFT NVDA ...
+    record(sys.argv[1:] or ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'GOOGL', 'AMZN', 'META', 'NFLX', 'AMD', 'INTC'])
@@ -0,0 +1,239 @@
+"""
+End-to-end pipeline benchmark against local stand-ins.
+
+    python -m benchmarks.pipeline                          # 10, 100 and 500 tickers
+    python -m benchmarks.pipeline --sizes 10 100 --passes 2 --save before.json
+    python -m benchmarks.pipeline --baseline before.json   # exit 1 on a regression
+    python -m benchmarks.pipeline --sizes 20 --model-slots 1 --load-ms 500 [--model-affinity]
+
+Finnhub, Ollama and Google News are served by benchmarks.stand_ins, yfinance by
+recorded fixtures (benchmarks.fixtures), and Postgres by a throwaway cluster or
+scratch database. FinBERT runs for real from ./model/finbert.
+"""
+import argparse
+import functools
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+import config
+from benchmarks.fixtures import FixtureSet
+from benchmarks.postgres import ThrowawayPostgres
+from benchmarks.stand_ins import StandInConfig, StandInServer
+
+NODES = ['_prefetch', '_prefetch_histories', 'news_sensing_node', 'data_ingestion_node', 'sentiment_analysis_node',
+         'change_gate_node', 'technical_analysis_node', 'portfolio_manager_node']
+PERCENTILES = (50, 95, 99)
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class NodeTimer:
+    """Wraps TradingWorkflow node methods to record per-call wall time."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def install(self, cls):
+        for name in NODES:
+            original = getattr(cls, name)
+
+            @functools.wraps(original)
+            def timed(*args, _node=name, _original=original, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    self.samples.setdefault(_node, []).append(time.perf_counter() - start)
+
+            setattr(cls, name, timed)
+
+    def reset(self):
+        self.samples = {}
+
+    def summary(self) -> Dict[str, Dict]:
+        out = {}
+        for name in NODES:
+            values = np.array(self.samples.get(name, []), dtype=float) * 1000
+            if not len(values):
+                continue
+            stats = {f"p{p}_ms": round(float(np.percentile(values, p)), 2) for p in PERCENTILES}
+            stats.update(count=int(len(values)), max_ms=round(float(values.max()), 2),
+                         total_ms=round(float(values.sum()), 1))
+            out[name] = stats
+        return out
+
+
+def _tickers(size: int) -> List[str]:
+    """The real 10 names first, then synthetic symbols served from the same fixtures."""
+    names = list(config.STOCKS[:size])
+    names += [f"BX{i:04d}" for i in range(size - len(names))]
+    return names
+
+
+def _patch_environment(server: StandInServer, fixtures: FixtureSet, live_rate_limits: bool):
+    """Point every external dependency at the stand-ins."""
+    import yfinance
+    import data.news_engine as news_engine
+    yfinance.Ticker = fixtures.ticker
+    news_engine.GOOGLE_NEWS_URL = server.url + "/rss/search?q={symbol}+stock+news&hl=en-US"
+    config.OLLAMA_BASE_URL = server.url
+    config.GATING_ENABLED = False
+    config.LLM_DECISIONS_PER_CYCLE = 0
+    if not live_rate_limits:
+        # Measure the pipeline, not Finnhub's 60/min free tier
+        config.FINNHUB_RATE_LIMIT_PER_MINUTE = 1_000_000
+
+
+def _reset_database(db):
+    """Empty every table so each size starts cold."""
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT tablename FROM pg_tables WHERE schemaname = 'public'")
+            tables = [row[0] for row in cur.fetchall()]
+            if tables:
+                cur.execute("TRUNCATE " + ", ".join(f'"{t}"' for t in tables) + " RESTART IDENTITY")
+
+
+def run_size(size: int, passes: int, concurrent: bool, server: StandInServer, timer: NodeTimer,
+             model_affinity: bool = False) -> List[Dict]:
+    from database.db_manager import DatabaseManager
+    from graph.trading_workflow import TradingWorkflow
+
+    _reset_database(DatabaseManager())
+    config.OHLCV_DIR = Path(tempfile.mkdtemp(prefix=f"bench_ohlcv_{size}_"))
+    workflow = TradingWorkflow()
+    workflow.finnhub.base_url = server.url + "/api/v1"
+    workflow.model_affinity = model_affinity
+    tickers = _tickers(size)
+    rows = []
+    for index in range(passes):
+        timer.reset()
+        server.requests.clear()
+        start = time.perf_counter()
+        results = workflow.run_batch(tickers, concurrent=concurrent)
+        wall = time.perf_counter() - start
+        workflow.finnhub.writer.flush()
+        rows.append({
+            'size': size,
+            'pass': 'cold' if index == 0 else f'warm{index}',
+            'wall_s': round(wall, 2),
+            'tickers_per_s': round(size / wall, 2),
+            'errors': sum(1 for r in results.values() if r.get('error')),
+            'nodes': timer.summary(),
+            # db / http / llm / finbert stage totals from the workflow's own telemetry
+            'stages': workflow.last_run.stages if workflow.last_run else {},
+            'requests': dict(server.requests),
+        })
+    return rows
+
+
+def print_report(rows: List[Dict], fixtures_source: str):
+    print(f"\nFixtures: {fixtures_source}")
+    for row in rows:
+        print(f"\n== {row['size']} tickers ({row['pass']}): {row['wall_s']:.2f}s wall, "
+              f"{row['tickers_per_s']:.2f} tickers/s, {row['errors']} errors ==")
+        print(f"  {'node':<26}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name, s in row['nodes'].items():
+            print(f"  {name:<26}{s['count']:>7}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                  f"{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+        loads = {k: v for k, v in row['stages'].items() if k.startswith('llm_load.')}
+        if loads:
+            print("  model loads: " + ", ".join(f"{k[len('llm_load.'):]}={s['calls']} ({s['seconds']:.1f}s)"
+                                                for k, s in sorted(loads.items())))
+        # Streams closed once the decision is parsed never get Ollama's final chunk with prompt_eval_*
+        unmeasured = []
+        for name, s in sorted(row['stages'].items()):
+            if name.startswith('llm.'):
+                model = name[len('llm.'):]
+                missing = s['calls'] - row['stages'].get(f'llm_prefill.{model}', {}).get('calls', 0)
+                if missing:
+                    unmeasured.append(f"{model} ({missing}/{s['calls']} calls)")
+        if unmeasured:
+            print("  prefill not measured: " + ", ".join(unmeasured))
+        print("  stand-in requests: " + ", ".join(f"{k}={v}" for k, v in sorted(row['requests'].items())))
+
+
+def compare(rows: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Regressions vs a saved run: throughput down or any node's p95 up by more than `tolerance`."""
+    previous = {(r['size'], r['pass']): r for r in baseline}
+    problems = []
+    for row in rows:
+        base = previous.get((row['size'], row['pass']))
+        if not base:
+            continue
+        label = f"{row['size']} tickers ({row['pass']})"
+        if row['tickers_per_s'] < base['tickers_per_s'] * (1 - tolerance):
+            problems.append(f"{label}: throughput {base['tickers_per_s']:.2f} -> {row['tickers_per_s']:.2f} tickers/s")
+        for name, stats in row['nodes'].items():
+            before = base['nodes'].get(name)
+            if before and stats['p95_ms'] > before['p95_ms'] * (1 + tolerance) and stats['p95_ms'] - before['p95_ms'] > 1:
+                problems.append(f"{label}: {name} p95 {before['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms")
+    return problems
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--passes', type=int, default=1, help='Runs per size; the first is cold, the rest warm')
+    parser.add_argument('--sequential', action='store_true', help='Benchmark the sequential run_batch path')
+    parser.add_argument('--save', type=Path, default=RESULTS_DIR / "latest.json", help='Write results as JSON')
+    parser.add_argument('--baseline', type=Path, help='Fail if results regress against this JSON')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed regression (fraction)')
+    parser.add_argument('--live-rate-limits', action='store_true', help="Keep Finnhub's configured rate limit")
+    parser.add_argument('--finnhub-ms', type=float, default=20)
+    parser.add_argument('--rss-ms', type=float, default=30)
+    parser.add_argument('--llama-ms', type=float, default=150)
+    parser.add_argument('--deepseek-token-ms', type=float, default=2)
+    parser.add_argument('--model-slots', type=int, default=0, help='Models the Ollama stand-in holds at once (0 = unlimited)')
+    parser.add_argument('--load-ms', type=float, default=0, help='Stand-in cost of loading a model into a slot')
+    parser.add_argument('--model-affinity', action='store_true', help='Benchmark the model-affinity batch mode')
+    args = parser.parse_args(argv)
+
+    stand_in_config = StandInConfig(args.finnhub_ms / 1000, args.rss_ms / 1000, args.llama_ms / 1000,
+                                    args.deepseek_token_ms / 1000, model_slots=args.model_slots,
+                                    load_latency=args.load_ms / 1000)
+    server = StandInServer(stand_in_config).start()
+    fixtures = FixtureSet()
+    timer = NodeTimer()
+    rows: List[Dict] = []
+    try:
+        with ThrowawayPostgres(config.DB_CONFIG) as db_config:
+            config.DB_CONFIG.clear()
+            config.DB_CONFIG.update(db_config)
+            _patch_environment(server, fixtures, args.live_rate_limits)
+
+            from database.db_manager import DatabaseManager
+            from graph.trading_workflow import TradingWorkflow
+            DatabaseManager().initialize_schema()
+            timer.install(TradingWorkflow)
+
+            for size in args.sizes:
+                print(f"\n[Bench] {size} tickers x {args.passes} pass(es)...")
+                rows.extend(run_size(size, args.passes, not args.sequential, server, timer, args.model_affinity))
+            DatabaseManager().pool.close()
+    finally:
+        server.stop()
+
+    print_report(rows, fixtures.source)
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(rows, indent=2))
+        print(f"\nSaved results to {args.save}")
+    if args.baseline:
+        problems = compare(rows, json.loads(args.baseline.read_text()), args.tolerance)
+        if problems:
+            print(f"\nREGRESSIONS vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for problem in problems:
+                print(f"  - {problem}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
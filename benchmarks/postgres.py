@@ -0,0 +1,83 @@
+"""Throwaway Postgres for benchmarks: a temporary cluster, or a temporary database on an existing server."""
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import psycopg2
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _pg_bin(name: str) -> Optional[str]:
+    pg_bin = os.getenv("PG_BIN")
+    if pg_bin and (Path(pg_bin) / name).exists():
+        return str(Path(pg_bin) / name)
+    return shutil.which(name)
+
+
+class ThrowawayPostgres:
+    """
+    Context manager yielding a DB_CONFIG dict. Uses initdb/pg_ctl (on PATH or
+    in $PG_BIN) to run a private cluster in a temp dir; without them, creates
+    and later drops a scratch database on the server in `fallback_config`.
+    """
+
+    def __init__(self, fallback_config: Dict):
+        self.fallback_config = dict(fallback_config)
+        self.data_dir: Optional[str] = None
+        self.scratch_db: Optional[str] = None
+        self.db_config: Dict = {}
+
+    def __enter__(self) -> Dict:
+        initdb, pg_ctl = _pg_bin("initdb"), _pg_bin("pg_ctl")
+        if initdb and pg_ctl:
+            self._start_cluster(initdb, pg_ctl)
+        else:
+            self._create_scratch_db()
+        return self.db_config
+
+    def _start_cluster(self, initdb: str, pg_ctl: str):
+        self.data_dir = tempfile.mkdtemp(prefix="trading_bench_pg_")
+        port = _free_port()
+        subprocess.run([initdb, "-D", self.data_dir, "-U", "bench", "-A", "trust", "--no-sync"],
+                       check=True, stdout=subprocess.DEVNULL)
+        subprocess.run([pg_ctl, "-D", self.data_dir, "-w", "-l", os.path.join(self.data_dir, "server.log"),
+                        "-o", f"-p {port} -k {self.data_dir} -c listen_addresses='' -c fsync=off",
+                        "start"], check=True, stdout=subprocess.DEVNULL)
+        self._pg_ctl = pg_ctl
+        self.db_config = {"host": self.data_dir, "port": port, "database": "postgres",
+                          "user": "bench", "password": ""}
+        print(f"  [Bench] Throwaway Postgres cluster on port {port} ({self.data_dir})")
+
+    def _create_scratch_db(self):
+        self.scratch_db = f"trading_bench_{os.getpid()}"
+        conn = psycopg2.connect(**self.fallback_config)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f'DROP DATABASE IF EXISTS "{self.scratch_db}"')
+            cur.execute(f'CREATE DATABASE "{self.scratch_db}"')
+        conn.close()
+        self.db_config = dict(self.fallback_config, database=self.scratch_db)
+        print(f"  [Bench] No initdb/pg_ctl found; using scratch database {self.scratch_db} "
+              f"on {self.fallback_config.get('host')}:{self.fallback_config.get('port')}")
+
+    def __exit__(self, *exc):
+        if self.data_dir:
+            subprocess.run([self._pg_ctl, "-D", self.data_dir, "-m", "immediate", "stop"],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            shutil.rmtree(self.data_dir, ignore_errors=True)
+        elif self.scratch_db:
+            conn = psycopg2.connect(**self.fallback_config)
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'DROP DATABASE IF EXISTS "{self.scratch_db}" WITH (FORCE)')
+            conn.close()
+        return False
@@ -0,0 +1,233 @@
+"""One local HTTP server standing in for Finnhub (/quote), Ollama (/api/generate, /api/ps) and Google News RSS."""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+DEEPSEEK_REPLY = (
+    "<think>Sentiment is mixed and momentum is flat; RSI sits mid-range and the MACD histogram is small, "
+    "so there is no strong edge either way. Holding avoids churning on noise.</think>\n"
+    "DECISION: HOLD\nCONFIDENCE: MEDIUM\nREASONING: No decisive signal from news or indicators.\n"
+    "Additional commentary the model would keep generating if the stream were not closed early."
+)
+LLAMA_REPLY = ("RSI is neutral and MACD is close to its signal line, indicating consolidation. "
+               "Overall the technical signal is neutral.")
+RSS_TEMPLATES = [
+    "{t} shares rise after earnings beat expectations",
+    "{t} faces regulatory probe over accounting practices",
+    "Analysts upgrade {t} on strong demand outlook",
+    "{t} cuts guidance as costs climb",
+    "{t} announces share buyback program",
+]
+
+
+def _seed(symbol: str) -> int:
+    return int(hashlib.sha256(symbol.encode()).hexdigest()[:8], 16)
+
+
+class StandInConfig:
+    """Latencies (seconds) of the emulated services."""
+
+    def __init__(self, finnhub_latency: float = 0.02, rss_latency: float = 0.03,
+                 llama_latency: float = 0.15, deepseek_token_delay: float = 0.002,
+                 serialize_ollama: bool = True, model_slots: int = 0, load_latency: float = 0.0):
+        self.finnhub_latency = finnhub_latency
+        self.rss_latency = rss_latency
+        self.llama_latency = llama_latency
+        self.deepseek_token_delay = deepseek_token_delay
+        # A single local GPU runs one generation at a time
+        self.serialize_ollama = serialize_ollama
+        # Models that fit in memory at once (0 = unlimited); loading one costs load_latency
+        self.model_slots = model_slots
+        self.load_latency = load_latency
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: "StandInServer"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers: Dict = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.server.count(url.path)
+        if url.path.endswith('/quote'):
+            return self._quote(query.get('symbol', [''])[0])
+        if url.path.startswith('/rss'):
+            return self._rss((query.get('q', [''])[0].split() or [''])[0])
+        if url.path == '/api/ps':
+            with self.server._model_lock:
+                models = [{'name': model, 'model': model} for model in self.server.resident]
+            return self._send(200, json.dumps({'models': models}).encode())
+        self._send(404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        self.server.count(url.path)
+        if url.path != '/api/generate':
+            return self._send(404)
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        lock = self.server.ollama_lock if self.server.config.serialize_ollama else None
+        if lock:
+            lock.acquire()
+        try:
+            model, prompt = body.get('model'), body.get('prompt', '')
+            if not prompt and body.get('keep_alive') in (0, "0"):
+                self.server.unload(model)
+                return self._send(200, json.dumps({'model': model, 'done': True, 'done_reason': 'unload'}).encode())
+            load = self.server.load(model)
+            if not prompt:
+                # Preload: load the model, generate nothing
+                return self._send(200, json.dumps({'model': model, 'done': True, 'done_reason': 'load',
+                                                   'load_duration': int(load * 1e9)}).encode())
+            if body.get('stream'):
+                self._stream_generate(body, load)
+            else:
+                self._generate(body, load)
+        finally:
+            if lock:
+                lock.release()
+
+    # ── Finnhub ───────────────────────────────────────────────────────────────
+
+    def _quote(self, symbol: str):
+        time.sleep(self.server.config.finnhub_latency)
+        seed = _seed(symbol)
+        prev = 20 + seed % 480
+        price = prev * (1 + ((seed >> 8) % 600 - 300) / 10000)
+        quote = {'c': price, 'd': price - prev, 'dp': (price / prev - 1) * 100, 'h': price * 1.01,
+                 'l': price * 0.99, 'o': prev, 'pc': prev, 't': int(time.time())}
+        self._send(200, json.dumps(quote).encode())
+
+    # ── Google News RSS (supports conditional GET) ────────────────────────────
+
+    def _rss(self, symbol: str):
+        time.sleep(self.server.config.rss_latency)
+        etag = f'"{symbol}-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, headers={'ETag': etag})
+        now = formatdate(time.time(), usegmt=True)
+        items = "".join(
+            f"<item><title>{escape(template.format(t=symbol))} - Reuters</title>"
+            f"<link>https://news.example.com/{symbol}/{i}</link><pubDate>{now}</pubDate></item>"
+            for i, template in enumerate(RSS_TEMPLATES)
+        )
+        body = f"<?xml version='1.0'?><rss version='2.0'><channel>{items}</channel></rss>".encode()
+        self._send(200, body, "application/rss+xml", {'ETag': etag, 'Last-Modified': now})
+
+    # ── Ollama ────────────────────────────────────────────────────────────────
+
+    def _metadata(self, started: float, model: str, prompt: str, tokens: int, load: float = 0.0) -> Dict:
+        total = int((time.perf_counter() - started + load) * 1e9)
+        return {'done': True, 'total_duration': total, 'load_duration': int(load * 1e9),
+                'prompt_eval_count': self.server.prefill(model, prompt) // 4, 'prompt_eval_duration': total // 10,
+                'eval_count': tokens, 'eval_duration': total - total // 10}
+
+    def _generate(self, body: Dict, load: float = 0.0):
+        started = time.perf_counter()
+        time.sleep(self.server.config.llama_latency)
+        reply = dict(self._metadata(started, body.get('model'), body.get('prompt', ''), len(LLAMA_REPLY.split()), load),
+                     model=body.get('model'), response=LLAMA_REPLY)
+        self._send(200, json.dumps(reply).encode())
+
+    def _stream_generate(self, body: Dict, load: float = 0.0):
+        started = time.perf_counter()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        tokens = [word + ' ' for word in DEEPSEEK_REPLY.split(' ')]
+        try:
+            for token in tokens:
+                time.sleep(self.server.config.deepseek_token_delay)
+                self._chunk(json.dumps({'model': body.get('model'), 'response': token, 'done': False}))
+            self._chunk(json.dumps(self._metadata(started, body.get('model'), body.get('prompt', ''),
+                                                  len(tokens), load)))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client closed the stream early once the decision was complete
+
+    def _chunk(self, line: str):
+        data = line.encode() + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serves every stand-in on one local port; request counts per path are kept in `requests`."""
+
+    daemon_threads = True
+
+    def __init__(self, config: StandInConfig = None, port: int = 0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.config = config or StandInConfig()
+        self.ollama_lock = threading.Lock()
+        self.resident: "OrderedDict[str, None]" = OrderedDict()  # loaded models, least recently used first
+        self._last_prompt: Dict[str, str] = {}  # per model, for Ollama-style prefix reuse
+        self._model_lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, path: str):
+        with self._count_lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def load(self, model: str) -> float:
+        """Make `model` resident, evicting the least recently used one when slots are full; returns load time."""
+        with self._model_lock:
+            if model in self.resident:
+                self.resident.move_to_end(model)
+                return 0.0
+            slots = self.config.model_slots
+            while slots and len(self.resident) >= slots:
+                evicted, _ = self.resident.popitem(last=False)
+                self._last_prompt.pop(evicted, None)  # its cached prompt state goes with it
+            self.resident[model] = None
+            self.count(f"load:{model}")
+        time.sleep(self.config.load_latency)
+        return self.config.load_latency
+
+    def unload(self, model: str):
+        with self._model_lock:
+            self.resident.pop(model, None)
+            self._last_prompt.pop(model, None)
+
+    def prefill(self, model: str, prompt: str) -> int:
+        """Characters to evaluate: Ollama skips the prefix shared with the model's previous prompt."""
+        with self._model_lock:
+            previous = self._last_prompt.get(model, "")
+            self._last_prompt[model] = prompt
+        return len(prompt) - len(os.path.commonprefix([previous, prompt]))
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="stand-ins", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -6,6 +6,7 @@ from rich.layout import Layout
 from rich.live import Live
 from typing import Dict, List
 from datetime import datetime
+import config
 
 
 class TradingDashboard:
@@ -71,13 +72,13 @@ class TradingDashboard:
             
             table.add_row(
                 ticker,
-                f"${market.get('current_price', 0):.2f}",
+                f"${market.get('current_price', 0):.2f}" + (" [dim]live[/dim]" if market.get('source') == 'stream' else ""),
                 f"[{change_style}]{change_str}[/{change_style}]",
                 news_str,
                 sentiment_str,
                 f"{technical.get('indicators', {}).get('rsi', 0):.1f}",
                 f"[{decision_style}]{decision_str}[/{decision_style}]",
-                decision.get('confidence', 'LOW')
+                decision.get('confidence', 'LOW') + (" [dim](carried)[/dim]" if decision.get('carried_forward') else "")
             )
         
         return table
@@ -100,6 +101,12 @@ class TradingDashboard:
             alert_tag = " ⚠️ ALERT" if news_alert.get('alert') else ""
             news_line = f"\n[bold yellow]Sentinel News:[/bold yellow] score={score:+.3f} ({direction}), {count} articles{alert_tag}"
 
+        cache_tag = ""
+        llm_cache = technical.get('llm_cache', {})
+        if llm_cache.get('enabled'):
+            hit = "cached" if technical.get('analysis_cached') else "fresh"
+            cache_tag = f" [dim]({hit}, cache hit rate {llm_cache.get('hit_rate', 0):.0%})[/dim]"
+
         content = f"""
 [bold cyan]Decision:[/bold cyan] {decision.get('decision', 'N/A')}
 [bold cyan]Confidence:[/bold cyan] {decision.get('confidence', 'N/A')}
@@ -113,7 +120,7 @@ class TradingDashboard:
   RSI: {technical.get('indicators', {}).get('rsi', 0):.2f}
   MACD: {technical.get('indicators', {}).get('macd', {}).get('macd', 0):.4f}
   
-[bold yellow]Analysis:[/bold yellow]
+[bold yellow]Analysis:[/bold yellow]{cache_tag}
 {technical.get('analysis', 'N/A')}
 """
         
@@ -134,17 +141,74 @@ class TradingDashboard:
         self.console.print(summary)
         self.console.print()
         
-        # Detailed panels for each ticker
-        for ticker, data in results.items():
+        # Detailed panels: every ticker for small runs; fresh decisions only (capped) for large universes
+        details = list(results.items())
+        if len(details) > config.DASHBOARD_DETAIL_LIMIT:
+            details = [(t, d) for t, d in details
+                       if not d.get('error') and not d.get('decision', {}).get('carried_forward')]
+            hidden = len(results) - min(len(details), config.DASHBOARD_DETAIL_LIMIT)
+            details = details[:config.DASHBOARD_DETAIL_LIMIT]
+            if hidden:
+                self.console.print(f"[dim]{hidden} detail panels hidden (carried forward, errors or over the limit)[/dim]")
+        for ticker, data in details:
             panel = self.create_detail_panel(ticker, data)
             self.console.print(panel)
             self.console.print()
+
+    def display_shard_report(self, report: List[Dict]):
+        """Cycle time and outcome per universe shard."""
+        table = Table(title="Universe Sweep", show_header=True, header_style="bold magenta")
+        table.add_column("Shard", justify="right")
+        table.add_column("Tickers", justify="right")
+        table.add_column("Cycle (s)", justify="right")
+        table.add_column("LLM runs", justify="right")
+        table.add_column("Carried", justify="right")
+        table.add_column("Errors", justify="right")
+        total = 0.0
+        for row in sorted(report, key=lambda r: r['shard']):
+            if row.get('deferred'):
+                table.add_row(str(row['shard'] + 1), str(row['tickers']), "[yellow]deferred[/yellow]", "-", "-", "-")
+                continue
+            total += row['seconds']
+            table.add_row(str(row['shard'] + 1), str(row['tickers']), f"{row['seconds']:.1f}",
+                          str(row['llm_runs']), str(row['carried']), str(row['errors']))
+        self.console.print(table)
+        done = sum(r['tickers'] for r in report if not r.get('deferred'))
+        self.console.print(f"[dim]{done}/{sum(r['tickers'] for r in report)} tickers in {total:.1f}s "
+                           f"(budget {config.UNIVERSE_CYCLE_BUDGET_SECONDS:.0f}s)[/dim]")
+    
+    def display_pipeline_run(self, run, limit: int = 8):
+        """Where a cycle's time went: the busiest node / db / http / llm / finbert stages."""
+        table = Table(title=f"Pipeline Stages ({run.kind}, {run.seconds:.1f}s)", show_header=True,
+                      header_style="bold magenta")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Items", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Avg (ms)", justify="right")
+        for name, s in run.slowest(limit):
+            errors = f"[red]{s['errors']}[/red]" if s['errors'] else "0"
+            table.add_row(name, str(s['calls']), str(s['items']), errors, f"{s['seconds']:.2f}",
+                          f"{s['seconds'] / s['calls'] * 1000:.1f}")
+        self.console.print(table)
+        self.console.print("[dim]Stages overlap under concurrency, so totals can exceed the cycle time[/dim]")
+
+    def thinking_printer(self, ticker: str):
+        """Return a callback that streams DeepSeek-R1 <think> text to the console as it arrives."""
+        self.console.print(f"[bold cyan]{ticker}[/bold cyan] [dim]DeepSeek-R1 thinking...[/dim]")
+
+        def _print_chunk(chunk: str):
+            self.console.print(chunk, end="", style="dim", markup=False, highlight=False)
+
+        return _print_chunk
     
     def display_monitoring_header(self, interval_minutes: int):
         """Display monitoring mode header."""
         self.console.print(Panel.fit(
             f"[bold green]Monitoring Mode Active[/bold green]\n"
-            f"Running analysis every {interval_minutes} minutes\n"
+            f"Running analysis every {interval_minutes} minutes "
+            f"(news and quotes refresh in between; all stages slow down outside market hours)\n"
             f"Press Ctrl+C to stop",
             border_style="green"
         ))
@@ -1,17 +1,32 @@
 """Configuration for the minimalist trading agents system."""
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Asset Universe - 10 stocks only
+# Default asset universe, used when UNIVERSE_SOURCE is empty (see data.universe)
 STOCKS = ['AAPL', 'MSFT', 'NVDA', 'TSLA', 'GOOGL', 'AMZN', 'META', 'NFLX', 'AMD', 'INTC']
 
 # Model Paths
 MODEL_DIR = Path("./model")
 FINBERT_PATH = MODEL_DIR / "finbert"
+FINBERT_ONNX_PATH = MODEL_DIR / "finbert_onnx" / "model.onnx"  # exported on first use
+FINBERT_BACKEND = os.getenv("FINBERT_BACKEND", "torch")  # torch (fp32) | int8 (dynamic quantized) | onnx
+# Optional shared FinBERT daemon (python main.py --finbert-server); used when listening, else in-process
+FINBERT_SOCKET = os.getenv("FINBERT_SOCKET", os.path.join(tempfile.gettempdir(), "trading-agent-finbert.sock"))
+FINBERT_SERVER_MAX_BATCH = int(os.getenv("FINBERT_SERVER_MAX_BATCH", 64))         # headlines merged per backend call
+FINBERT_SERVER_MAX_WAIT_MS = float(os.getenv("FINBERT_SERVER_MAX_WAIT_MS", 10))   # wait for other clients' requests
+FINBERT_CLIENT_TIMEOUT = float(os.getenv("FINBERT_CLIENT_TIMEOUT", 30))      # per request chunk
+FINBERT_CLIENT_CHUNK = int(os.getenv("FINBERT_CLIENT_CHUNK", 256))            # headlines per daemon request
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", 10000))  # in-process LRU entries
+
+# Local OHLCV store (full daily history per ticker, refreshed incrementally)
+OHLCV_DIR = Path(os.getenv("OHLCV_DIR", "./market_data/ohlcv"))
+OHLCV_BOOTSTRAP_PERIOD = os.getenv("OHLCV_BOOTSTRAP_PERIOD", "5y")  # first download for a new ticker
+PRICE_HISTORY_BARS = int(os.getenv("PRICE_HISTORY_BARS", 22))      # bars handed to technical analysis (~1mo)
 
 # Database Configuration
 DB_CONFIG = {
@@ -22,13 +37,113 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD", ""),
 }
 
+# Connection Pool (shared across all DatabaseManager instances)
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", 1))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 10))
+DB_POOL_HEALTHCHECK_SECONDS = float(os.getenv("DB_POOL_HEALTHCHECK_SECONDS", 60))  # ping connections idle longer than this
+
 # API Configuration
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY", "")
+FINNHUB_RATE_LIMIT_PER_MINUTE = int(os.getenv("FINNHUB_RATE_LIMIT_PER_MINUTE", 60))  # free tier: 60/min
+FINNHUB_CONCURRENCY = int(os.getenv("FINNHUB_CONCURRENCY", 8))   # parallel requests on the keep-alive pool
+FINNHUB_MAX_RETRIES = int(os.getenv("FINNHUB_MAX_RETRIES", 3))   # retries after HTTP 429
+FINNHUB_BACKOFF_SECONDS = float(os.getenv("FINNHUB_BACKOFF_SECONDS", 2.0))  # doubled per 429 without Retry-After
+QUOTE_WRITE_BATCH_SIZE = 100      # market_quotes rows per background INSERT
+QUOTE_WRITE_FLUSH_SECONDS = 1.0   # how long the writer waits to fill a batch
+
+# Streaming quote ingestion (python main.py --stream)
+FINNHUB_WS_URL = os.getenv("FINNHUB_WS_URL", "wss://ws.finnhub.io")  # point at a local stand-in server for testing
+STREAM_BAR_BUFFER = int(os.getenv("STREAM_BAR_BUFFER", 390))             # 1-minute bars kept per ticker (one session)
+STREAM_QUOTE_MAX_AGE_SECONDS = float(os.getenv("STREAM_QUOTE_MAX_AGE_SECONDS", 120))  # older streamed prices fall back to REST
+STREAM_RECONNECT_SECONDS = float(os.getenv("STREAM_RECONNECT_SECONDS", 2.0))
+STREAM_BAR_GRACE_SECONDS = float(os.getenv("STREAM_BAR_GRACE_SECONDS", 2.0))  # wait for delayed trades before closing a bar
+STREAM_RECV_TIMEOUT_SECONDS = 30
 
 # Ollama Configuration
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 SPECIALIST_MODEL = "llama3.2"
 PORTFOLIO_MANAGER_MODEL = "deepseek-r1:7b"  # Full model tag required
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # how long Ollama keeps a model resident after a call
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", 4))   # pooled keep-alive connections per endpoint
+OLLAMA_MAX_RETRIES = int(os.getenv("OLLAMA_MAX_RETRIES", 2))  # connection errors / 502-504 only
+OLLAMA_BACKOFF_SECONDS = float(os.getenv("OLLAMA_BACKOFF_SECONDS", 1.0))
+OLLAMA_CONNECT_TIMEOUT = 10
+OLLAMA_DEFAULT_TIMEOUT = 120
+OLLAMA_TIMEOUTS = {  # read timeout per model (seconds between streamed tokens when streaming)
+    SPECIALIST_MODEL: 60,
+    PORTFOLIO_MANAGER_MODEL: 600,
+}
+
+# Technical Specialist cache: reuse a Llama analysis while inputs stay in the same buckets
+LLAMA_CACHE_ENABLED = os.getenv("LLAMA_CACHE_ENABLED", "true").lower() == "true"
+LLAMA_CACHE_TTL_MINUTES = float(os.getenv("LLAMA_CACHE_TTL_MINUTES", 60))
+LLAMA_CACHE_BUCKETS = {
+    'rsi': float(os.getenv("LLAMA_CACHE_RSI_BUCKET", 2.0)),                  # RSI points
+    'macd_pct': float(os.getenv("LLAMA_CACHE_MACD_BUCKET_PCT", 0.05)),       # MACD as % of price
+    'histogram_pct': float(os.getenv("LLAMA_CACHE_HIST_BUCKET_PCT", 0.02)),  # histogram as % of price
+    'price_pct': float(os.getenv("LLAMA_CACHE_PRICE_BUCKET_PCT", 0.5)),      # log-scale price step
+}
+
+# Prompt layout: a fixed instruction prefix first (Ollama reuses its evaluated tokens), then per-ticker data
+PROMPT_REASONING_TOKENS = int(os.getenv("PROMPT_REASONING_TOKENS", 40))  # per past trade's reasoning
+PROMPT_HISTORY_TOKENS = int(os.getenv("PROMPT_HISTORY_TOKENS", 300))     # whole recent-trades block
 
 # Monitoring Configuration
 MONITOR_INTERVAL_MINUTES = 15
+
+# Ticker universe: "" = STOCKS above, "db" = universe table, or a path to a symbol file (.txt / .csv)
+UNIVERSE_SOURCE = os.getenv("UNIVERSE_SOURCE", "")
+UNIVERSE_SHARD_SIZE = int(os.getenv("UNIVERSE_SHARD_SIZE", 50))
+UNIVERSE_CYCLE_BUDGET_SECONDS = float(os.getenv("UNIVERSE_CYCLE_BUDGET_SECONDS", MONITOR_INTERVAL_MINUTES * 60))  # no new shards after this
+LLM_DECISIONS_PER_CYCLE = int(os.getenv("LLM_DECISIONS_PER_CYCLE", 0))  # tickers reaching Llama + DeepSeek per sweep (0 = no cap)
+DASHBOARD_DETAIL_LIMIT = 20  # detail panels shown per cycle; the summary table always lists every ticker
+
+# Distributed mode: Postgres job queue (python main.py --worker / --distributed)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", 10))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", 60))          # requeue running jobs without a heartbeat this long
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", 5))  # multiplied by the attempt number
+JOB_POLL_SECONDS = 1.0
+JOB_BATCH_TIMEOUT_SECONDS = float(os.getenv("JOB_BATCH_TIMEOUT_SECONDS", MONITOR_INTERVAL_MINUTES * 60))
+
+# Stage metrics (Prometheus text format): scrape endpoint and/or file rewritten after every cycle
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))   # 0 = no endpoint; also --metrics-port
+METRICS_FILE = os.getenv("METRICS_FILE", "")       # e.g. node_exporter textfile dir/trading.prom
+
+# Monitoring scheduler: each stage on its own cadence (seconds), slower outside market hours
+MARKET_TZ = "America/New_York"
+MARKET_OPEN = "09:30"
+MARKET_CLOSE = "16:00"
+MONITOR_CADENCE_SECONDS = {
+    'quotes': 15,                               # 10 tickers every 15s stays under Finnhub's 60/min
+    'news': 60,
+    'decisions': MONITOR_INTERVAL_MINUTES * 60,
+}
+MONITOR_OFF_HOURS_CADENCE_SECONDS = {
+    'quotes': 600,
+    'news': 900,
+    'decisions': 3600,
+}
+
+# Change-driven gating: skip Llama + DeepSeek when nothing material changed since the last decision
+GATING_ENABLED = os.getenv("GATING_ENABLED", "false").lower() == "true"
+GATE_NEWS_DELTA = float(os.getenv("GATE_NEWS_DELTA", 0.15))          # news score change that counts
+GATE_PRICE_MOVE_PCT = float(os.getenv("GATE_PRICE_MOVE_PCT", 1.0))   # % move since the last decision
+GATE_RSI_BANDS = [30, 45, 55, 70]                                     # band edges; crossing one counts
+GATE_MAX_AGE_MINUTES = float(os.getenv("GATE_MAX_AGE_MINUTES", 240)) # always re-decide after this long
+
+# Batch Concurrency (run_batch fans tickers out across a bounded thread pool)
+BATCH_CONCURRENT = os.getenv("BATCH_CONCURRENT", "true").lower() == "true"
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", 10))
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", 10))    # Finnhub / yfinance / Google News
+OLLAMA_CONCURRENCY = int(os.getenv("OLLAMA_CONCURRENCY", 1))   # Llama 3.2 + DeepSeek-R1 calls in flight
+NEWS_UNIVERSE_BATCHING = os.getenv("NEWS_UNIVERSE_BATCHING", "true").lower() == "true"  # score all tickers' headlines together
+# Model affinity: every Llama 3.2 analysis in a batch first, then every DeepSeek-R1 decision,
+# so a host that can only hold one model loads each once per batch instead of swapping per ticker
+MODEL_AFFINITY = os.getenv("MODEL_AFFINITY", "false").lower() == "true"
+MODEL_AFFINITY_UNLOAD = os.getenv("MODEL_AFFINITY_UNLOAD", "true").lower() == "true"  # evict Llama before DeepSeek loads
+
+# Google News RSS conditional-GET cache
+NEWS_FEED_FRESH_SECONDS = float(os.getenv("NEWS_FEED_FRESH_SECONDS", 60))         # serve cached entries without a request
+NEWS_FEED_CACHE_TTL_MINUTES = float(os.getenv("NEWS_FEED_CACHE_TTL_MINUTES", 60)) # drop feeds not revalidated for this long
+NEWS_FEED_CACHE_SIZE = int(os.getenv("NEWS_FEED_CACHE_SIZE", 1024))               # feed URLs kept
@@ -1,5 +1,8 @@
-"""Data module."""
-from .finnhub_client import FinnhubClient
-from .yfinance_client import YFinanceClient
+"""Data module. Clients are imported on first use so light submodules (e.g. data.universe) stay cheap."""
+from telemetry.startup import lazy_exports
 
-__all__ = ['FinnhubClient', 'YFinanceClient']
+__getattr__, __all__ = lazy_exports(__name__, {
+    'FinnhubClient': '.finnhub_client',
+    'YFinanceClient': '.yfinance_client',
+    'OHLCVStore': '.ohlcv_store',
+})
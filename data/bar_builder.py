@@ -0,0 +1,185 @@
+"""Rolling 1-minute OHLCV bars built from streamed trades, kept in per-ticker ring buffers."""
+import threading
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+import config
+
+BAR_SECONDS = 60
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+MARKET_TZ = "America/New_York"
+
+
+class _BarRing:
+    """Fixed-capacity ring of completed bars: rows of (bar start epoch seconds, O, H, L, C, V)."""
+
+    def __init__(self, capacity: int):
+        self.buf = np.full((capacity, 1 + len(BAR_COLUMNS)), np.nan)
+        self.pos = 0
+        self.count = 0
+        self.last_start: Optional[float] = None  # start of the newest closed bar
+
+    def append(self, row: np.ndarray):
+        self.buf[self.pos] = row
+        self.pos = (self.pos + 1) % len(self.buf)
+        self.count = min(self.count + 1, len(self.buf))
+        self.last_start = float(row[0])
+
+    def last(self, n: int = None) -> np.ndarray:
+        """Copy of the newest `n` bars, oldest first."""
+        n = self.count if n is None else min(n, self.count)
+        idx = (self.pos - n + np.arange(n)) % len(self.buf)
+        return self.buf[idx].copy()
+
+
+def _session_day(ts: float) -> Tuple[date, bool]:
+    """
+    (trading day, in regular hours) for a trade. Trades before the open belong to
+    the previous day's session, so a new session starts with the first trade after the open.
+    """
+    local = datetime.fromtimestamp(ts, ZoneInfo(MARKET_TZ))
+    opens, closes = dtime.fromisoformat(config.MARKET_OPEN), dtime.fromisoformat(config.MARKET_CLOSE)
+    day = local.date() if local.time() >= opens else local.date() - timedelta(days=1)
+    return day, opens <= local.time() < closes
+
+
+class BarBuilder:
+    """
+    Folds trades into the forming 1-minute bar per ticker. A bar is closed when
+    a trade for a later minute arrives or close_due() passes its end plus
+    STREAM_BAR_GRACE_SECONDS, and is appended to the ticker's ring
+    (STREAM_BAR_BUFFER bars); trades for an already closed minute are dropped.
+    Also tracks the session open/high/low and previous close (rolled over on
+    the first regular-hours trade of a new day) so quote() can stand in for a
+    Finnhub REST quote.
+    """
+
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity or config.STREAM_BAR_BUFFER
+        self._rings: Dict[str, _BarRing] = {}
+        self._forming: Dict[str, List[float]] = {}
+        self._session: Dict[str, Dict] = {}
+        self._last_trade: Dict[str, Tuple[float, float]] = {}  # ticker -> (price, epoch seconds)
+        self.late_trades = 0  # dropped: their minute was already closed
+        self._lock = threading.Lock()
+
+    def seed(self, ticker: str, quote: Dict, now: float = None):
+        """Session reference values from a REST quote (open, high, low, previous close, last price)."""
+        day, _ = _session_day(time.time() if now is None else now)
+        with self._lock:
+            self._session[ticker] = {
+                'day': day,
+                'open': quote.get('open'),
+                'high': quote.get('high'),
+                'low': quote.get('low'),
+                'previous_close': quote.get('previous_close'),
+                'close': quote.get('current_price'),  # last regular-hours price seen
+            }
+
+    def _update_session(self, ticker: str, price: float, ts: float):
+        day, regular = _session_day(ts)
+        if not regular:
+            return  # pre/post-market trades don't move the session's open/high/low
+        session = self._session.get(ticker)
+        if session is None or (session.get('day') and day > session['day']):
+            # First trade of a new session: yesterday's last price becomes the previous close
+            previous = (session or {}).get('close') or (session or {}).get('previous_close')
+            session = self._session[ticker] = {'day': day, 'open': price, 'high': price, 'low': price,
+                                               'previous_close': previous, 'close': price}
+        session['day'] = session.get('day') or day
+        session['open'] = session['open'] or price
+        session['high'] = max(session['high'] or price, price)
+        session['low'] = min(session['low'] or price, price)
+        session['close'] = price
+
+    def _close(self, ticker: str) -> Optional[Tuple[str, np.ndarray]]:
+        bar = self._forming.pop(ticker, None)
+        if bar is None:
+            return None
+        row = np.array(bar, dtype=np.float64)
+        self._rings.setdefault(ticker, _BarRing(self.capacity)).append(row)
+        return ticker, row
+
+    def on_trade(self, ticker: str, price: float, volume: float, ts: float) -> List[Tuple[str, np.ndarray]]:
+        """Fold one trade (ts in epoch seconds) in. Returns bars closed by it."""
+        start = ts - ts % BAR_SECONDS
+        closed = []
+        with self._lock:
+            bar = self._forming.get(ticker)
+            ring = self._rings.get(ticker)
+            if (bar is not None and start < bar[0]) or (ring is not None and ring.last_start is not None
+                                                          and start <= ring.last_start):
+                # Its minute was already closed (and written); a second row for it would be dropped
+                self.late_trades += 1
+                return closed
+            if bar is not None and start > bar[0]:
+                closed.append(self._close(ticker))
+                bar = None
+            if bar is None:
+                self._forming[ticker] = [start, price, price, price, price, volume]
+            else:
+                bar[2] = max(bar[2], price)
+                bar[3] = min(bar[3], price)
+                bar[4] = price
+                bar[5] += volume
+
+            self._update_session(ticker, price, ts)
+            if ts >= self._last_trade.get(ticker, (0.0, 0.0))[1]:
+                self._last_trade[ticker] = (price, ts)
+        return closed
+
+    def close_due(self, now: float = None) -> List[Tuple[str, np.ndarray]]:
+        """
+        Close every forming bar whose minute ended at least STREAM_BAR_GRACE_SECONDS ago
+        (quiet tickers get no closing trade; the grace lets slightly delayed trades land).
+        """
+        now = time.time() if now is None else now
+        grace = config.STREAM_BAR_GRACE_SECONDS
+        with self._lock:
+            due = [t for t, bar in self._forming.items() if bar[0] + BAR_SECONDS + grace <= now]
+            return [self._close(t) for t in due]
+
+    def quote(self, ticker: str, max_age: float = None) -> Optional[Dict]:
+        """Quote shaped like FinnhubClient.get_quote from the last trade, or None if stale/unknown."""
+        max_age = config.STREAM_QUOTE_MAX_AGE_SECONDS if max_age is None else max_age
+        with self._lock:
+            last = self._last_trade.get(ticker)
+            session = dict(self._session.get(ticker) or {})
+        if last is None or time.time() - last[1] > max_age:
+            return None
+        price, ts = last
+        prev = session.get('previous_close')
+        change = price - prev if prev else 0.0
+        return {
+            'ticker': ticker,
+            'current_price': price,
+            'change': change,
+            'percent_change': change / prev * 100 if prev else 0.0,
+            'high': session.get('high') or price,
+            'low': session.get('low') or price,
+            'open': session.get('open') or price,
+            'previous_close': prev or price,
+            'source': 'stream',
+            'as_of': ts,
+        }
+
+    def previous_close(self, ticker: str) -> Optional[float]:
+        with self._lock:
+            return (self._session.get(ticker) or {}).get('previous_close')
+
+    def bars(self, ticker: str, n: int = None) -> pd.DataFrame:
+        """The newest `n` completed 1-minute bars as a DataFrame (copied out of the ring)."""
+        with self._lock:
+            ring = self._rings.get(ticker)
+            rows = ring.last(n) if ring else np.empty((0, 1 + len(BAR_COLUMNS)))
+        index = pd.to_datetime(rows[:, 0], unit='s', utc=True).tz_convert(MARKET_TZ)
+        return pd.DataFrame(rows[:, 1:], index=index, columns=BAR_COLUMNS)
+
+    def tickers(self) -> List[str]:
+        with self._lock:
+            return sorted(set(self._last_trade) | set(self._rings))
@@ -0,0 +1,100 @@
+"""Conditional-GET RSS fetching with a small expiring cache of parsed entries."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+import requests
+
+import config
+from telemetry.http import TracedAdapter
+
+
+class FeedCache:
+    """
+    Remembers ETag / Last-Modified and the parsed articles per feed URL.
+    Within NEWS_FEED_FRESH_SECONDS the cached articles are served without a
+    request; after that the feed is revalidated and a 304 reuses them without
+    re-parsing. Feeds not validated for NEWS_FEED_CACHE_TTL_MINUTES are
+    dropped, forcing a full download.
+    """
+
+    def __init__(self, max_feeds: int = None, fresh_seconds: float = None, ttl_minutes: float = None):
+        self.max_feeds = max_feeds or config.NEWS_FEED_CACHE_SIZE
+        self.fresh_seconds = config.NEWS_FEED_FRESH_SECONDS if fresh_seconds is None else fresh_seconds
+        self.ttl_seconds = (config.NEWS_FEED_CACHE_TTL_MINUTES if ttl_minutes is None else ttl_minutes) * 60
+        self.session = requests.Session()
+        adapter = TracedAdapter(pool_maxsize=config.FETCH_CONCURRENCY)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._feeds: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.fresh_hits = 0
+        self.not_modified = 0
+        self.downloads = 0
+        self.bytes_downloaded = 0
+
+    def _entry(self, url: str, now: float):
+        with self._lock:
+            entry = self._feeds.get(url)
+            if entry is None:
+                return None
+            if now - entry['checked_at'] > self.ttl_seconds:
+                del self._feeds[url]
+                return None
+            self._feeds.move_to_end(url)
+            return entry
+
+    def _store(self, url: str, entry: Dict):
+        with self._lock:
+            self._feeds[url] = entry
+            self._feeds.move_to_end(url)
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+
+    def get(self, url: str, parse: Callable[[bytes], List[Dict]]) -> List[Dict]:
+        """Articles for a feed URL (copies, safe to annotate); `parse` only runs on a full 200 download."""
+        now = time.monotonic()
+        entry = self._entry(url, now)
+        if entry and now - entry['checked_at'] < self.fresh_seconds:
+            with self._lock:
+                self.fresh_hits += 1
+            return [dict(a) for a in entry['articles']]
+
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        response = self.session.get(url, headers=headers, timeout=10, verify=False)
+
+        if response.status_code == 304 and entry:
+            with self._lock:
+                self.not_modified += 1
+                entry['checked_at'] = time.monotonic()
+            return [dict(a) for a in entry['articles']]
+
+        response.raise_for_status()
+        articles = parse(response.content)
+        checked_at = time.monotonic()
+        self._store(url, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'articles': articles,
+            'checked_at': checked_at,
+        })
+        with self._lock:
+            self.downloads += 1
+            self.bytes_downloaded += len(response.content)
+        return [dict(a) for a in articles]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'feeds': len(self._feeds),
+                'fresh_hits': self.fresh_hits,
+                'not_modified': self.not_modified,
+                'downloads': self.downloads,
+                'bytes_downloaded': self.bytes_downloaded,
+            }
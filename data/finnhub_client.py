@@ -1,27 +1,45 @@
 """Finnhub API client for real-time market data."""
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 import config
+from data.quote_writer import QuoteWriter
+from data.rate_limiter import TokenBucket
 from database.db_manager import DatabaseManager
+from telemetry.http import TracedAdapter
 import urllib3
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+class RateLimitedError(Exception):
+    """Finnhub kept answering 429 after every retry."""
+
+
 class FinnhubClient:
     """Client for Finnhub API to fetch real-time quotes."""
-    
+
     def __init__(self):
         """Initialize Finnhub client."""
         self.api_key = config.FINNHUB_API_KEY
         self.base_url = "https://finnhub.io/api/v1"
         self.db = DatabaseManager()
-    
-    def get_quote(self, ticker: str) -> Optional[Dict]:
-        """Fetch real-time quote for a ticker."""
-        try:
-            response = requests.get(
+        # Keep-alive connections shared by every worker thread
+        self.session = requests.Session()
+        adapter = TracedAdapter(pool_connections=1, pool_maxsize=config.FINNHUB_CONCURRENCY)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.limiter = TokenBucket(config.FINNHUB_RATE_LIMIT_PER_MINUTE, burst=config.FINNHUB_CONCURRENCY)
+        # Quotes are persisted in batches on a background thread, off the request path
+        self.writer = QuoteWriter(self.db)
+
+    def _request_quote(self, ticker: str) -> Dict:
+        """GET /quote under the shared rate limit, backing off on HTTP 429."""
+        for attempt in range(config.FINNHUB_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.get(
                 f"{self.base_url}/quote",
                 params={
                     "symbol": ticker,
@@ -30,14 +48,26 @@ class FinnhubClient:
                 timeout=10,
                 verify=False  # Bypass SSL verification
             )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Finnhub returns: c (current), d (change), dp (percent change), 
+            if response.status_code != 429:
+                response.raise_for_status()
+                return response.json()
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after else config.FINNHUB_BACKOFF_SECONDS * (2 ** attempt)
+            # Pause the whole bucket so the other workers back off too
+            self.limiter.pause(delay)
+            print(f"  [Finnhub] 429 for {ticker}, backing off {delay:.1f}s (attempt {attempt + 1})")
+        raise RateLimitedError(f"rate limited after {config.FINNHUB_MAX_RETRIES + 1} attempts")
+
+    def get_quote(self, ticker: str) -> Optional[Dict]:
+        """Fetch real-time quote for a ticker."""
+        try:
+            data = self._request_quote(ticker)
+
+            # Finnhub returns: c (current), d (change), dp (percent change),
             # h (high), l (low), o (open), pc (previous close)
             if data.get('c') == 0:
                 return None
-            
+
             quote_data = {
                 'ticker': ticker,
                 'current_price': data['c'],
@@ -48,21 +78,24 @@ class FinnhubClient:
                 'open': data['o'],
                 'previous_close': data['pc']
             }
-            
-            # Store in database
-            self.db.insert_market_quote(ticker, data)
-            
+
+            # Store in database (batched by the background writer)
+            self.writer.submit(ticker, data)
+
             return quote_data
-            
+
         except Exception as e:
             print(f"Error fetching quote for {ticker}: {e}")
             return None
-    
+
     def get_quotes_batch(self, tickers: list) -> Dict[str, Dict]:
-        """Fetch quotes for multiple tickers."""
-        results = {}
-        for ticker in tickers:
-            quote = self.get_quote(ticker)
-            if quote:
-                results[ticker] = quote
+        """Fetch quotes for multiple tickers concurrently, within Finnhub's per-minute limit."""
+        if not tickers:
+            return {}
+        start = time.perf_counter()
+        workers = max(1, min(config.FINNHUB_CONCURRENCY, len(tickers)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="finnhub") as pool:
+            quotes = dict(zip(tickers, pool.map(self.get_quote, tickers)))
+        results = {ticker: quote for ticker, quote in quotes.items() if quote}
+        print(f"  [Finnhub] {len(results)}/{len(tickers)} quotes in {time.perf_counter() - start:.1f}s")
         return results
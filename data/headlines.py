@@ -0,0 +1,19 @@
+"""Headline normalization shared by the news engine and the sentiment cache."""
+import hashlib
+import re
+
+
+def clean_headline(text: str) -> str:
+    """Strip HTML tags and publisher suffixes like '- Reuters'."""
+    # Remove HTML tags
+    text = re.sub(r'<[^>]+>', '', text)
+    # Remove publisher suffixes: " - Reuters", " | Bloomberg", etc.
+    text = re.sub(r'\s[-|]\s+[A-Z][A-Za-z\s]+$', '', text.strip())
+    # Collapse whitespace
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def headline_key(text: str) -> str:
+    """Content address of a headline: SHA-256 of the cleaned, case-folded text."""
+    return hashlib.sha256(clean_headline(text).casefold().encode('utf-8')).hexdigest()
@@ -1,18 +1,19 @@
 """Sentinel News Engine - Dual-source news ingestion, deduplication, and FinBERT scoring."""
-import re
+import threading
 import time
 import warnings
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 
-import feedparser
-import torch
-import yfinance as yf
-from transformers import BertTokenizer, BertForSequenceClassification
-
 import config
+from data.feed_cache import FeedCache
+from data.headlines import clean_headline
+from data.sentiment_cache import SentimentCache
 from database.db_manager import DatabaseManager
+from inference.lazy import LazyBackend
+from telemetry.metrics import span
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -33,59 +34,60 @@ class SentinelNewsEngine:
 
     def __init__(self):
         self.db = DatabaseManager()
+        # Network fetches fan out up to FETCH_CONCURRENCY; FinBERT runs on one serialized worker
+        self.fetch_slots = threading.BoundedSemaphore(config.FETCH_CONCURRENCY)
+        self.inference_lock = threading.Lock()
+        self.cache = SentimentCache(db=self.db)
+        self.feeds = FeedCache()
         self._load_finbert()
 
     def _load_finbert(self):
-        """Load FinBERT from local model directory."""
-        model_path = str(config.FINBERT_PATH)
-        self.tokenizer = BertTokenizer.from_pretrained(model_path, local_files_only=True)
-        self.model = BertForSequenceClassification.from_pretrained(model_path, local_files_only=True)
-        self.model.eval()
-        self.device = torch.device("cpu")
-        self.model.to(self.device)
-        self.labels = ['negative', 'neutral', 'positive']
+        """Configured FinBERT backend, loaded when the first batch of uncached headlines is scored."""
+        self.backend = LazyBackend()
+        self.labels = self.backend.labels
 
     # ── Text Cleaning ──────────────────────────────────────────────────────────
 
     def _clean_headline(self, text: str) -> str:
         """Strip HTML tags and publisher suffixes like '- Reuters'."""
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        # Remove publisher suffixes: " - Reuters", " | Bloomberg", etc.
-        text = re.sub(r'\s[-|]\s+[A-Z][A-Za-z\s]+$', '', text.strip())
-        # Collapse whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return clean_headline(text)
 
     # ── Source 1: Google News RSS ──────────────────────────────────────────────
 
     def _fetch_google_news(self, symbol: str) -> List[Dict]:
-        """Fetch top 10 headlines from Google News RSS."""
+        """Fetch top 10 headlines from Google News RSS (conditional GET, parsed entries cached)."""
         url = GOOGLE_NEWS_URL.format(symbol=symbol)
         try:
-            feed = feedparser.parse(url)
-            articles = []
-            for entry in feed.entries[:10]:
-                published_at = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-                articles.append({
-                    'headline': self._clean_headline(entry.get('title', '')),
-                    'url': entry.get('link', ''),
-                    'published_at': published_at,
-                    'source': 'google_news',
-                })
-            return articles
+            return self.feeds.get(url, self._parse_google_news)
         except Exception as e:
             print(f"  [NewsEngine] Google News fetch failed for {symbol}: {e}")
             return []
 
+    def _parse_google_news(self, body: bytes) -> List[Dict]:
+        """Parse an RSS document into article dicts."""
+        import feedparser
+        feed = feedparser.parse(body)
+        articles = []
+        for entry in feed.entries[:10]:
+            published_at = None
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+            articles.append({
+                'headline': self._clean_headline(entry.get('title', '')),
+                'url': entry.get('link', ''),
+                'published_at': published_at,
+                'source': 'google_news',
+            })
+        return articles
+
     # ── Source 2: yfinance ─────────────────────────────────────────────────────
 
     def _fetch_yfinance_news(self, symbol: str) -> Tuple[List[Dict], bool]:
         """Fetch headlines from yfinance. Returns (articles, hit_403)."""
+        import yfinance as yf  # imported on first fetch: slow to import and unused by --init-db etc.
         try:
-            raw = yf.Ticker(symbol).news or []
+            with span('http', 'yfinance'):
+                raw = yf.Ticker(symbol).news or []
             articles = []
             for item in raw[:10]:
                 published_at = None
@@ -113,23 +115,21 @@ class SentinelNewsEngine:
     # ── FinBERT Batch Scoring ──────────────────────────────────────────────────
 
     def _score_batch(self, headlines: List[str]) -> List[float]:
-        """Score a batch of headlines. Returns list of signed scores (-1 to 1)."""
-        scores = []
-        for i in range(0, len(headlines), BATCH_SIZE):
-            batch = headlines[i:i + BATCH_SIZE]
-            inputs = self.tokenizer(
-                batch, return_tensors="pt", truncation=True,
-                max_length=512, padding=True
-            )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            with torch.no_grad():
-                logits = self.model(**inputs).logits
-                probs = torch.nn.functional.softmax(logits, dim=-1).cpu().numpy()
-            for p in probs:
-                # negative=p[0], neutral=p[1], positive=p[2]
-                signed = float(p[2] - p[0])  # range: -1 to 1
-                scores.append(signed)
-        return scores
+        """
+        Score a batch of headlines. Returns list of signed scores (-1 to 1) in input order.
+        The backend tokenizes once and groups headlines by token length so each
+        forward pass pads as little as possible.
+        """
+        if not headlines:
+            return []
+        # Only headlines not already in the content-addressed cache reach FinBERT
+        probs = self.cache.get_or_compute(headlines, self._infer)
+        return [float(p[2] - p[0]) for p in probs]  # positive - negative, range: -1 to 1
+
+    def _infer(self, headlines: List[str]):
+        """Run FinBERT on the serialized worker. Returns class probabilities."""
+        with self.inference_lock:
+            return self.backend.predict_proba(headlines, batch_size=BATCH_SIZE)
 
     # ── Weighted Aggregate Score ───────────────────────────────────────────────
 
@@ -157,77 +157,104 @@ class SentinelNewsEngine:
 
         return weighted_sum / total_weight if total_weight > 0 else 0.0
 
+    # ── Phase 1: Fetch + Dedup ────────────────────────────────────────────────
+
+    def _fetch_and_dedup(self, symbol: str) -> Optional[List[Dict]]:
+        """Fetch headlines and upsert them. Returns new (unscored) articles, or None if nothing was found."""
+        print(f"  [NewsEngine] Processing {symbol}...")
+
+        # Fetch from yfinance, fallback to Google News on 403
+        with self.fetch_slots:
+            articles, hit_403 = self._fetch_yfinance_news(symbol)
+            if hit_403 or not articles:
+                articles = self._fetch_google_news(symbol)
+
+        if not articles:
+            print(f"  [NewsEngine] No articles found for {symbol}")
+            return None
+
+        # Deduplicate via one bulk DB upsert, collect new articles for scoring
+        new_urls = self.db.upsert_news_articles(symbol, articles)
+        new_articles = []
+        for art in articles:
+            # A URL listed twice in one fetch is only scored once
+            if art['url'] in new_urls:
+                new_articles.append(art)
+                new_urls.discard(art['url'])
+        return new_articles
+
+    # ── Phase 3: Aggregate ────────────────────────────────────────────────────
+
+    def _aggregate(self, symbol: str) -> Dict:
+        """Build the time-weighted result for one ticker from its last-hour DB articles."""
+        db_articles = self.db.get_recent_news(symbol, hours=1)
+        # Convert RealDictRow to plain dict; use created_at for time-decay (published_at can be stale)
+        scored_articles = []
+        for row in db_articles:
+            pub = row.get('created_at') or row.get('published_at')
+            if pub and pub.tzinfo is None:
+                pub = pub.replace(tzinfo=timezone.utc)
+            scored_articles.append({'sentiment_score': row['sentiment_score'], 'published_at': pub})
+
+        agg_score = self._weighted_score(scored_articles)
+        alert = abs(agg_score) >= ALERT_THRESHOLD
+
+        if alert:
+            direction = 'BULLISH' if agg_score > 0 else 'BEARISH'
+            print(f"  [NewsEngine] *** ALERT: {symbol} {direction} score={agg_score:.3f} ***")
+
+        return {
+            'score': round(agg_score, 4),
+            'alert': alert,
+            'articles_count': len(db_articles),
+            'direction': 'positive' if agg_score > 0 else ('negative' if agg_score < 0 else 'neutral'),
+        }
+
     # ── Main Run ───────────────────────────────────────────────────────────────
 
     def run(self, tickers: List[str] = None) -> Dict[str, Dict]:
         """
-        Run the full pipeline for all tickers.
+        Run the full pipeline for all tickers in two phases:
+        fetch + dedup every ticker first, then score all new headlines from the
+        whole universe in shared length-sorted FinBERT batches.
         Returns dict of {ticker: {score, alert, articles_count}}.
         """
         if tickers is None:
             tickers = config.STOCKS
 
+        # Phase 1: network fan-out (bounded by fetch_slots)
+        if len(tickers) > 1:
+            workers = min(config.FETCH_CONCURRENCY, len(tickers))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news") as pool:
+                fetched = dict(zip(tickers, pool.map(self._fetch_and_dedup, tickers)))
+        else:
+            fetched = {symbol: self._fetch_and_dedup(symbol) for symbol in tickers}
+
+        feeds = self.feeds.stats()
+        if feeds['fresh_hits'] or feeds['not_modified'] or feeds['downloads']:
+            print(f"  [NewsEngine] RSS feeds: {feeds['downloads']} downloaded, "
+                  f"{feeds['not_modified']} not modified, {feeds['fresh_hits']} served from cache")
+
+        # Phase 2: one universe-wide scoring pass, scores routed back to their tickers
+        pending = [(symbol, art) for symbol in tickers for art in (fetched[symbol] or [])]
+        if pending:
+            scores = self._score_batch([art['headline'] for _, art in pending])
+            scored_counts = {}
+            for (symbol, art), score in zip(pending, scores):
+                art['sentiment_score'] = score
+                scored_counts[symbol] = scored_counts.get(symbol, 0) + 1
+            self.db.update_news_sentiments([(art['url'], art['sentiment_score']) for _, art in pending])
+            for symbol, count in scored_counts.items():
+                print(f"  [NewsEngine] Scored {count} new articles for {symbol}")
+            cache = self.cache.stats()
+            print(f"  [NewsEngine] Sentiment cache: {cache['memory_hits'] + cache['persistent_hits']} hits, "
+                  f"{cache['misses']} misses (hit rate {cache['hit_rate']:.0%})")
+
+        # Phase 3: per-ticker weighted aggregate
         results = {}
-
         for symbol in tickers:
-            print(f"  [NewsEngine] Processing {symbol}...")
-
-            # Fetch from yfinance, fallback to Google News on 403
-            articles, hit_403 = self._fetch_yfinance_news(symbol)
-            if hit_403 or not articles:
-                articles = self._fetch_google_news(symbol)
-
-            if not articles:
-                print(f"  [NewsEngine] No articles found for {symbol}")
+            if fetched[symbol] is None:
                 results[symbol] = {'score': 0.0, 'alert': False, 'articles_count': 0}
-                continue
-
-            # Deduplicate via DB upsert, collect new articles for scoring
-            new_articles = []
-            for art in articles:
-                if not art['url']:
-                    continue
-                inserted = self.db.upsert_news_article(
-                    ticker=symbol,
-                    source=art['source'],
-                    headline=art['headline'],
-                    url=art['url'],
-                    published_at=art['published_at'],
-                )
-                if inserted:
-                    new_articles.append(art)
-
-            # Score only new articles in batches
-            if new_articles:
-                headlines = [a['headline'] for a in new_articles]
-                scores = self._score_batch(headlines)
-                for art, score in zip(new_articles, scores):
-                    art['sentiment_score'] = score
-                    self.db.update_news_sentiment(art['url'], score)
-                print(f"  [NewsEngine] Scored {len(new_articles)} new articles for {symbol}")
-
-            # Pull last-hour articles from DB for weighted score
-            db_articles = self.db.get_recent_news(symbol, hours=1)
-            # Convert RealDictRow to plain dict; use created_at for time-decay (published_at can be stale)
-            scored_articles = []
-            for row in db_articles:
-                pub = row.get('created_at') or row.get('published_at')
-                if pub and pub.tzinfo is None:
-                    pub = pub.replace(tzinfo=timezone.utc)
-                scored_articles.append({'sentiment_score': row['sentiment_score'], 'published_at': pub})
-
-            agg_score = self._weighted_score(scored_articles)
-            alert = abs(agg_score) >= ALERT_THRESHOLD
-
-            results[symbol] = {
-                'score': round(agg_score, 4),
-                'alert': alert,
-                'articles_count': len(db_articles),
-                'direction': 'positive' if agg_score > 0 else ('negative' if agg_score < 0 else 'neutral'),
-            }
-
-            if alert:
-                direction = 'BULLISH' if agg_score > 0 else 'BEARISH'
-                print(f"  [NewsEngine] *** ALERT: {symbol} {direction} score={agg_score:.3f} ***")
-
+            else:
+                results[symbol] = self._aggregate(symbol)
         return results
@@ -0,0 +1,113 @@
+"""Incremental per-ticker OHLCV store on memory-mapped NumPy files."""
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+from telemetry.metrics import span
+
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+ROW_WIDTH = 1 + len(COLUMNS)  # epoch seconds + OHLCV, all float64
+ROW_BYTES = ROW_WIDTH * 8
+MARKET_TZ = "America/New_York"
+
+
+class OHLCVStore:
+    """
+    Keeps the full daily bar history per ticker in <OHLCV_DIR>/<TICKER>.f64
+    (raw float64 rows: ts, open, high, low, close, volume). Only bars newer
+    than the last stored one are downloaded; reads are zero-copy memmap views.
+    """
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root or config.OHLCV_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.f64"
+
+    def bars(self, ticker: str) -> Optional[np.ndarray]:
+        """Read-only (n x 6) memmap of every stored bar, or None if nothing is stored."""
+        path = self._path(ticker)
+        if not path.exists():
+            return None
+        n = path.stat().st_size // ROW_BYTES
+        if n == 0:
+            return None
+        return np.memmap(path, dtype=np.float64, mode='r', shape=(n, ROW_WIDTH))
+
+    def _download(self, ticker: str, last_ts: Optional[float]) -> pd.DataFrame:
+        """Bars from the last stored day onward (inclusive, to refresh a still-forming bar)."""
+        import yfinance as yf
+        stock = yf.Ticker(ticker)
+        with span('http', 'yfinance') as s:
+            if last_ts is None:
+                hist = stock.history(period=config.OHLCV_BOOTSTRAP_PERIOD)
+            else:
+                start = pd.Timestamp(last_ts, unit='s', tz='UTC').tz_convert(MARKET_TZ).date()
+                hist = stock.history(start=start.isoformat())
+            s.items = len(hist)
+        if hist.empty:
+            return hist
+        hist.columns = [col.lower() for col in hist.columns]
+        return hist
+
+    def update(self, ticker: str) -> int:
+        """Fetch and persist bars after the last stored timestamp. Returns bars appended."""
+        with self._lock(ticker):
+            stored = self.bars(ticker)
+            last_ts = float(stored[-1, 0]) if stored is not None else None
+            hist = self._download(ticker, last_ts)
+            if hist.empty:
+                return 0
+
+            rows = np.empty((len(hist), ROW_WIDTH), dtype=np.float64)
+            index = hist.index.tz_localize('UTC') if hist.index.tz is None else hist.index.tz_convert('UTC')
+            rows[:, 0] = (index - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+            rows[:, 1:] = hist[COLUMNS].to_numpy(dtype=np.float64)
+
+            path = self._path(ticker)
+            if last_ts is not None:
+                # Overwrite the last stored bar if it came back revised (intraday daily bar)
+                same = rows[rows[:, 0] == last_ts]
+                if len(same):
+                    with open(path, 'r+b') as f:
+                        f.seek((len(stored) - 1) * ROW_BYTES)
+                        f.write(same[-1].tobytes())
+                rows = rows[rows[:, 0] > last_ts]
+            if len(rows):
+                with open(path, 'r+b' if path.exists() else 'wb') as f:
+                    # Start at the last whole row so a torn write from a crash can't shift alignment
+                    f.seek((len(stored) if stored is not None else 0) * ROW_BYTES)
+                    f.truncate()
+                    f.write(np.ascontiguousarray(rows).tobytes())
+            return len(rows)
+
+    def frame(self, ticker: str, bars: int = None) -> pd.DataFrame:
+        """DataFrame over the last `bars` stored bars; OHLCV columns view the memmap without copying."""
+        stored = self.bars(ticker)
+        if stored is None:
+            return pd.DataFrame()
+        if bars:
+            stored = stored[-bars:]
+        index = pd.to_datetime(stored[:, 0], unit='s', utc=True).tz_convert(MARKET_TZ)
+        return pd.DataFrame(stored[:, 1:], index=index, columns=COLUMNS, copy=False)
+
+    def get_price_history(self, ticker: str, bars: int = None) -> pd.DataFrame:
+        """Incrementally refresh a ticker, then return its recent history (stale data if the refresh fails)."""
+        try:
+            added = self.update(ticker)
+            if added:
+                print(f"  [OHLCV] {ticker}: +{added} new bars")
+        except Exception as e:
+            print(f"  [OHLCV] Refresh failed for {ticker}, serving stored bars: {e}")
+        return self.frame(ticker, bars or config.PRICE_HISTORY_BARS)
@@ -0,0 +1,145 @@
+"""Long-running Finnhub WebSocket trade stream feeding the 1-minute bar builder."""
+import json
+import threading
+from typing import Dict, List, Optional
+
+import config
+from data.bar_builder import BarBuilder
+from data.quote_writer import QuoteWriter
+
+
+class QuoteStream:
+    """
+    Subscribes to trades for a set of tickers over Finnhub's WebSocket
+    (FINNHUB_WS_URL, so a local stand-in server can replace it) and folds them
+    into a BarBuilder. Completed bars are queued on a QuoteWriter, which
+    inserts them into market_quotes in batches. Reconnects with backoff.
+    """
+
+    def __init__(self, tickers: List[str], builder: BarBuilder = None, writer: QuoteWriter = None,
+                 url: str = None):
+        self.tickers = list(tickers)
+        self.url = url or config.FINNHUB_WS_URL
+        self.builder = builder or BarBuilder()
+        self.writer = writer or QuoteWriter()
+        self.trades = 0
+        self.bars_written = 0
+        self.connected = threading.Event()
+        self._stop = threading.Event()
+        self._ws = None
+        self._threads: List[threading.Thread] = []
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self, seed_quotes: Dict[str, Dict] = None):
+        """Seed session values from REST quotes, then stream and close bars on background threads."""
+        for ticker, quote in (seed_quotes or {}).items():
+            self.builder.seed(ticker, quote)
+        self._threads = [
+            threading.Thread(target=self._run, name="quote-stream", daemon=True),
+            threading.Thread(target=self._close_bars, name="bar-closer", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Close the socket, flush the forming bars and wait for the writer."""
+        self._stop.set()
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._submit(self.builder.close_due(now=float('inf')))
+        self.writer.flush()
+
+    # ── Socket loop ───────────────────────────────────────────────────────────
+
+    def _connect(self):
+        import websocket  # websocket-client; only needed in streaming mode
+        separator = '&' if '?' in self.url else '?'
+        url = f"{self.url}{separator}token={config.FINNHUB_API_KEY}" if config.FINNHUB_API_KEY else self.url
+        ws = websocket.create_connection(url, timeout=config.STREAM_RECV_TIMEOUT_SECONDS)
+        for ticker in self.tickers:
+            ws.send(json.dumps({'type': 'subscribe', 'symbol': ticker}))
+        return ws
+
+    def _run(self):
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                self._ws = self._connect()
+                self.connected.set()
+                attempt = 0
+                print(f"  [Stream] Connected, {len(self.tickers)} tickers subscribed")
+                while not self._stop.is_set():
+                    try:
+                        message = self._ws.recv()
+                    except Exception as e:
+                        if type(e).__name__ == 'WebSocketTimeoutException':
+                            continue  # quiet market; keep waiting
+                        raise
+                    if not message:
+                        raise ConnectionError("stream closed by server")
+                    self._handle(message)
+            except Exception as e:
+                self.connected.clear()
+                if self._stop.is_set():
+                    break
+                delay = min(config.STREAM_RECONNECT_SECONDS * (2 ** attempt), 60)
+                attempt += 1
+                print(f"  [Stream] Disconnected ({e}), reconnecting in {delay:.0f}s")
+                self._stop.wait(delay)
+            finally:
+                if self._ws is not None:
+                    try:
+                        self._ws.close()
+                    except Exception:
+                        pass
+                    self._ws = None
+
+    def _handle(self, message: str):
+        """Finnhub frames: {"type": "trade", "data": [{"s", "p", "v", "t" (ms)}]} or {"type": "ping"}."""
+        payload = json.loads(message)
+        if payload.get('type') != 'trade':
+            return
+        for trade in payload.get('data') or []:
+            closed = self.builder.on_trade(trade['s'], float(trade['p']), float(trade.get('v') or 0),
+                                           trade['t'] / 1000)
+            self.trades += 1
+            self._submit(closed)
+
+    # ── Bar flushing ──────────────────────────────────────────────────────────
+
+    def _close_bars(self):
+        while not self._stop.wait(1.0):
+            self._submit(self.builder.close_due())
+
+    def _submit(self, closed):
+        for ticker, row in closed:
+            ts, o, h, l, c, v = row.tolist()
+            prev = self.builder.previous_close(ticker)
+            change = c - prev if prev else None
+            self.writer.submit(ticker, {
+                'c': c, 'h': h, 'l': l, 'o': o, 'v': v, 'bar_start': ts, 'pc': prev,
+                'd': change, 'dp': change / prev * 100 if prev else None,
+            })
+            self.bars_written += 1
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def quote(self, ticker: str) -> Optional[Dict]:
+        """Fresh in-memory quote for a ticker, or None if the stream has nothing recent."""
+        return self.builder.quote(ticker)
+
+    def stats(self) -> Dict:
+        return {
+            'connected': self.connected.is_set(),
+            'trades': self.trades,
+            'bars_written': self.bars_written,
+            'late_trades': self.builder.late_trades,
+            'tickers_live': len(self.builder.tickers()),
+        }
@@ -0,0 +1,59 @@
+"""Background writer that batches market_quotes inserts off the request path."""
+import atexit
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import config
+from database.db_manager import DatabaseManager
+
+
+class QuoteWriter:
+    """Queues (ticker, raw Finnhub quote) rows and inserts them in batches on a daemon thread."""
+
+    def __init__(self, db: DatabaseManager = None, batch_size: int = None, flush_seconds: float = None):
+        self.db = db or DatabaseManager()
+        self.batch_size = batch_size or config.QUOTE_WRITE_BATCH_SIZE
+        self.flush_seconds = flush_seconds or config.QUOTE_WRITE_FLUSH_SECONDS
+        self._queue: "queue.Queue[Tuple[str, Dict]]" = queue.Queue()
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="quote-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, ticker: str, quote_data: Dict):
+        """Queue a quote for insertion; returns immediately. Quotes without a bar_start are stamped now."""
+        if not quote_data.get('bar_start'):
+            quote_data = {**quote_data, 'received_at': time.time()}
+        self._queue.put((ticker, quote_data))
+
+    def _drain(self, first=None, linger: float = 0.0) -> List[Tuple[str, Dict]]:
+        """Collect up to batch_size rows, waiting at most `linger` seconds for more to arrive."""
+        rows = [first] if first is not None else []
+        deadline = time.monotonic() + linger
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        return rows
+
+    def _write(self, rows: List[Tuple[str, Dict]]):
+        try:
+            self.db.insert_market_quotes(rows)
+            self.written += len(rows)
+        except Exception as e:
+            print(f"  [QuoteWriter] Failed to write {len(rows)} quotes: {e}")
+        finally:
+            for _ in rows:
+                self._queue.task_done()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            self._write(self._drain(first, linger=self.flush_seconds))
+
+    def flush(self):
+        """Block until everything queued so far is written (called at exit and by callers that need durability)."""
+        self._queue.join()
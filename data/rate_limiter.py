@@ -0,0 +1,37 @@
+"""Thread-safe token-bucket rate limiter shared by concurrent API workers."""
+import threading
+import time
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` acquisitions on average, with bursts up to `burst`."""
+
+    def __init__(self, rate_per_minute: float, burst: int = None):
+        self.fill_rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(rate_per_minute)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.fill_rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. after an HTTP 429) and drain the bucket."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
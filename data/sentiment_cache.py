@@ -0,0 +1,109 @@
+"""Content-addressed FinBERT sentiment cache: in-process LRU backed by the sentiment_cache table."""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import config
+from data.headlines import headline_key
+from database.db_manager import DatabaseManager
+
+
+class SentimentCache:
+    """Caches class probabilities per headline hash so re-syndicated stories skip inference."""
+
+    def __init__(self, db: DatabaseManager = None, capacity: int = None):
+        self.db = db or DatabaseManager()
+        self.capacity = capacity or config.SENTIMENT_CACHE_SIZE
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, probs: List[float]):
+        with self._lock:
+            self._lru[key] = probs
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+
+    def lookup(self, headlines: List[str]) -> List[Optional[List[float]]]:
+        """Cached probabilities for each headline (None on miss), checking memory then the DB."""
+        keys = [headline_key(h) for h in headlines]
+        in_memory: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    in_memory[key] = self._lru[key]
+
+        persisted: Dict[str, List[float]] = {}
+        missing = sorted(set(keys) - set(in_memory))
+        if missing:
+            try:
+                rows = self.db.get_cached_sentiments(missing)
+            except Exception as e:
+                print(f"  [SentimentCache] Warning: persistent lookup failed: {e}")
+                rows = []
+            for row in rows:
+                probs = [row['negative'], row['neutral'], row['positive']]
+                persisted[row['headline_hash']] = probs
+                self._remember(row['headline_hash'], probs)
+
+        results = [in_memory.get(key) or persisted.get(key) for key in keys]
+        with self._lock:
+            self.memory_hits += sum(1 for key in keys if key in in_memory)
+            self.persistent_hits += sum(1 for key in keys if key in persisted)
+            self.misses += sum(1 for r in results if r is None)
+        return results
+
+    def store(self, headlines: List[str], probs: np.ndarray):
+        """Remember freshly scored headlines in memory and in the persistent table."""
+        rows = []
+        for headline, p in zip(headlines, probs):
+            key = headline_key(headline)
+            values = [float(x) for x in p]
+            self._remember(key, values)
+            rows.append((key, headline, *values))
+        try:
+            self.db.upsert_cached_sentiments(rows)
+        except Exception as e:
+            print(f"  [SentimentCache] Warning: persistent store failed: {e}")
+
+    def get_or_compute(self, headlines: List[str],
+                       compute: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Probabilities for every headline; only uncached unique headlines reach `compute`."""
+        probs = np.zeros((len(headlines), 3), dtype=np.float32)
+        if not headlines:
+            return probs
+        cached = self.lookup(headlines)
+
+        # One inference per distinct story, even when several tickers carry it in this batch
+        pending: Dict[str, List[int]] = {}
+        for i, (headline, hit) in enumerate(zip(headlines, cached)):
+            if hit is not None:
+                probs[i] = hit
+            else:
+                pending.setdefault(headline_key(headline), []).append(i)
+
+        if pending:
+            unique = [headlines[idx[0]] for idx in pending.values()]
+            scored = compute(unique)
+            for idx, p in zip(pending.values(), scored):
+                probs[idx] = p
+            self.store(unique, scored)
+        return probs
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for measuring saved inference."""
+        hits = self.memory_hits + self.persistent_hits
+        total = hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'persistent_hits': self.persistent_hits,
+            'misses': self.misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+            'size': len(self._lru),
+        }
@@ -0,0 +1,63 @@
+"""Ticker universe loading (config list, symbol file or DB table) and sharding."""
+import csv
+import re
+from pathlib import Path
+from typing import List
+
+import config
+
+SYMBOL_RE = re.compile(r'^[A-Z][A-Z0-9.\-]{0,9}$')
+SYMBOL_COLUMNS = ('symbol', 'ticker')
+
+
+def _read_file(path: Path) -> List[str]:
+    """One symbol per line (# comments allowed), or a CSV with a Symbol/Ticker column."""
+    text = path.read_text()
+    if path.suffix.lower() == '.csv':
+        reader = csv.DictReader(text.splitlines())
+        column = next((c for c in reader.fieldnames or [] if c.strip().lower() in SYMBOL_COLUMNS), None)
+        if column is None:
+            raise ValueError(f"{path} has no Symbol/Ticker column")
+        return [row[column] for row in reader]
+    return [line.split('#', 1)[0] for line in text.splitlines()]
+
+
+def normalize(symbols: List[str]) -> List[str]:
+    """Upper-case, drop blanks/invalid entries and duplicates, keep first-seen order."""
+    seen = set()
+    result = []
+    for raw in symbols:
+        symbol = (raw or '').strip().upper()
+        if not symbol or symbol in seen:
+            continue
+        if not SYMBOL_RE.match(symbol):
+            print(f"  [Universe] Skipping invalid symbol {raw!r}")
+            continue
+        seen.add(symbol)
+        result.append(symbol)
+    return result
+
+
+def load_universe(source: str = None) -> List[str]:
+    """
+    Symbols to process. `source` (default UNIVERSE_SOURCE) is empty for
+    config.STOCKS, "db" for the universe table, or a path to a symbol file.
+    """
+    source = (config.UNIVERSE_SOURCE if source is None else source).strip()
+    if not source:
+        return list(config.STOCKS)
+    if source.lower() == 'db':
+        from database.db_manager import DatabaseManager
+        symbols = DatabaseManager().get_universe()
+    else:
+        symbols = _read_file(Path(source))
+    universe = normalize(symbols)
+    if not universe:
+        raise ValueError(f"Universe source {source!r} contains no symbols")
+    return universe
+
+
+def shards(tickers: List[str], size: int = None) -> List[List[str]]:
+    """Split tickers into consecutive shards of at most `size` (UNIVERSE_SHARD_SIZE)."""
+    size = max(1, size or config.UNIVERSE_SHARD_SIZE)
+    return [tickers[i:i + size] for i in range(0, len(tickers), size)]
@@ -1,8 +1,8 @@
 """yfinance client for news and historical data."""
 import os
-import yfinance as yf
 import pandas as pd
 from typing import List, Dict
+from telemetry.metrics import span
 
 # Clear PostgreSQL SSL cert env vars that break curl/requests
 os.environ.pop('REQUESTS_CA_BUNDLE', None)
@@ -15,9 +15,11 @@ class YFinanceClient:
     
     def get_news(self, ticker: str, limit: int = 10) -> List[str]:
         """Fetch recent news headlines for a ticker."""
+        import yfinance as yf
         try:
             stock = yf.Ticker(ticker)
-            news = stock.news
+            with span('http', 'yfinance'):
+                news = stock.news
             
             if not news:
                 return []
@@ -32,9 +34,11 @@ class YFinanceClient:
     
     def get_price_history(self, ticker: str, period: str = "1mo") -> pd.DataFrame:
         """Fetch historical price data for technical analysis."""
+        import yfinance as yf
         try:
             stock = yf.Ticker(ticker)
-            hist = stock.history(period=period)
+            with span('http', 'yfinance'):
+                hist = stock.history(period=period)
             
             if hist.empty:
                 return pd.DataFrame()
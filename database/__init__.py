@@ -1,4 +1,5 @@
 """Database module."""
 from .db_manager import DatabaseManager
+from .pool import ConnectionPool, get_pool
 
-__all__ = ['DatabaseManager']
+__all__ = ['DatabaseManager', 'ConnectionPool', 'get_pool']
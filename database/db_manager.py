@@ -1,29 +1,43 @@
 """Database manager for PostgreSQL operations."""
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import json
+import time
+from psycopg2.extras import Json, RealDictCursor, execute_values
 from contextlib import contextmanager
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import config
+from database.pool import get_pool
+from telemetry.metrics import traced_methods
 
 
+def _dumps(value) -> str:
+    """JSON for job payloads/results: numpy scalars become Python numbers, anything else str()."""
+    return json.dumps(value, default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+
+
+# Every public query method is timed as a db.<method> stage
+@traced_methods('db', exclude=('get_connection', 'pool_stats'))
 class DatabaseManager:
     """Manages PostgreSQL database connections and operations."""
     
     def __init__(self):
         self.config = config.DB_CONFIG
+        # One pool per DB config, shared by every DatabaseManager in the process
+        self.pool = get_pool(self.config)
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = psycopg2.connect(**self.config)
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+        """Context manager for pooled database connections."""
+        with self.pool.connection() as conn:
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    def pool_stats(self) -> Dict:
+        """Connection acquisitions vs. physical connects for the shared pool."""
+        return self.pool.stats()
     
     def initialize_schema(self):
         """Initialize database schema from schema.sql."""
@@ -57,6 +71,28 @@ class DatabaseManager:
                     quote_data.get('pc')
                 ))
     
+    def insert_market_quotes(self, quotes: List[Tuple[str, Dict]]):
+        """Insert many (ticker, raw Finnhub quote) rows in one statement.
+        Streamed bars also carry 'v' (volume) and 'bar_start' (epoch seconds). Other quotes are stamped
+        with 'received_at' (set by QuoteWriter.submit), so each row has its own timestamp and two quotes
+        for one ticker in a batch don't collide on (ticker, timestamp); without either, the insert time is used."""
+        now = time.time()
+        rows = [(ticker, q.get('c'), q.get('d'), q.get('dp'), q.get('h'), q.get('l'), q.get('o'), q.get('pc'),
+                 q.get('v'), q.get('bar_start') or q.get('received_at') or now)
+                for ticker, q in quotes]
+        if not rows:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO market_quotes
+                    (ticker, current_price, change, percent_change, high, low, open, previous_close,
+                     volume, timestamp)
+                    VALUES %s
+                    ON CONFLICT (ticker, timestamp) DO NOTHING
+                """, rows, page_size=len(rows),
+                    template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, to_timestamp(%s::double precision)::timestamp)")
+    
     def insert_sentiment_score(self, ticker: str, headline: str, sentiment: str, score: float):
         """Insert sentiment analysis result."""
         with self.get_connection() as conn:
@@ -114,6 +150,258 @@ class DatabaseManager:
                     UPDATE news_staging SET sentiment_score = %s WHERE url = %s
                 """, (sentiment_score, url))
 
+    def upsert_news_articles(self, ticker: str, articles: List[Dict]) -> Set[str]:
+        """Insert a batch of news articles in one statement. Returns the URLs that were new."""
+        rows = [(ticker, a['source'], a['headline'], a['url'], a.get('published_at'), a.get('sentiment_score'))
+                for a in articles if a.get('url')]
+        if not rows:
+            return set()
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                # ON CONFLICT DO NOTHING ... RETURNING only yields rows that were actually inserted
+                inserted = execute_values(cur, """
+                    INSERT INTO news_staging (ticker, source, headline, url, published_at, sentiment_score)
+                    VALUES %s
+                    ON CONFLICT (url) DO NOTHING
+                    RETURNING url
+                """, rows, page_size=len(rows), fetch=True)
+                return {row[0] for row in inserted}
+
+    def update_news_sentiments(self, scores: List[Tuple[str, float]]):
+        """Write back (url, sentiment_score) pairs in one UPDATE joined against a VALUES list."""
+        if not scores:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    UPDATE news_staging AS n SET sentiment_score = v.score
+                    FROM (VALUES %s) AS v(url, score)
+                    WHERE n.url = v.url
+                """, scores, template="(%s, %s::float)", page_size=len(scores))
+
+    def get_cached_sentiments(self, headline_hashes: List[str]) -> List[Dict]:
+        """Fetch cached FinBERT probabilities for a list of headline hashes."""
+        if not headline_hashes:
+            return []
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT headline_hash, negative, neutral, positive FROM sentiment_cache
+                    WHERE headline_hash = ANY(%s)
+                """, (list(headline_hashes),))
+                return cur.fetchall()
+
+    def upsert_cached_sentiments(self, rows: List[Tuple[str, str, float, float, float]]):
+        """Store (headline_hash, headline, negative, neutral, positive) rows in one statement."""
+        if not rows:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO sentiment_cache (headline_hash, headline, negative, neutral, positive)
+                    VALUES %s
+                    ON CONFLICT (headline_hash) DO NOTHING
+                """, rows, page_size=len(rows))
+
+    def get_llm_analysis(self, cache_key: str, model: str, max_age_seconds: float) -> Optional[Dict]:
+        """Fetch a cached LLM analysis younger than max_age_seconds."""
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT analysis, EXTRACT(EPOCH FROM NOW() - created_at) AS age_seconds
+                    FROM llm_analysis_cache
+                    WHERE cache_key = %s AND model = %s
+                      AND created_at >= NOW() - INTERVAL '1 second' * %s
+                """, (cache_key, model, max_age_seconds))
+                return cur.fetchone()
+
+    def upsert_llm_analysis(self, cache_key: str, ticker: str, model: str, analysis: str):
+        """Store or refresh a cached LLM analysis."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO llm_analysis_cache (cache_key, model, ticker, analysis)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (cache_key, model)
+                    DO UPDATE SET analysis = EXCLUDED.analysis, created_at = NOW()
+                """, (cache_key, model, ticker, analysis))
+
+    def get_ticker_state(self, ticker: str) -> Optional[Dict]:
+        """Get the inputs snapshot and decision from a ticker's last real decision."""
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT snapshot, decision, analysis, decided_at FROM ticker_state
+                    WHERE ticker = %s
+                """, (ticker,))
+                return cur.fetchone()
+
+    def upsert_ticker_state(self, ticker: str, snapshot: Dict, decision: Dict, analysis: str):
+        """Store the inputs snapshot a decision was made on."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO ticker_state (ticker, snapshot, decision, analysis)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (ticker) DO UPDATE SET
+                        snapshot = EXCLUDED.snapshot, decision = EXCLUDED.decision,
+                        analysis = EXCLUDED.analysis, decided_at = NOW()
+                """, (ticker, Json(snapshot), Json(decision), analysis))
+
+    def insert_decision_skip(self, ticker: str, carried_action: str, reason: str):
+        """Record that a ticker carried its previous decision forward."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO decision_skips (ticker, carried_action, reason)
+                    VALUES (%s, %s, %s)
+                """, (ticker, carried_action, reason))
+
+    def get_universe(self) -> List[str]:
+        """Active symbols from the universe table."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT symbol FROM universe WHERE active ORDER BY symbol")
+                return [row[0] for row in cur.fetchall()]
+
+    def upsert_universe(self, symbols: List[str]):
+        """Add symbols to the universe table (re-activating any that were disabled)."""
+        if not symbols:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO universe (symbol) VALUES %s
+                    ON CONFLICT (symbol) DO UPDATE SET active = TRUE
+                """, [(symbol,) for symbol in symbols], page_size=1000)
+
+    def enqueue_jobs(self, batch_id: str, jobs: List[Tuple[str, Dict]], max_attempts: int):
+        """Queue (ticker, payload) pipeline jobs under one batch id."""
+        if not jobs:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO pipeline_jobs (batch_id, ticker, payload, max_attempts) VALUES %s
+                """, [(batch_id, ticker, Json(payload, dumps=_dumps), max_attempts) for ticker, payload in jobs],
+                    page_size=1000)
+
+    def claim_job(self, worker_id: str) -> Optional[Dict]:
+        """Atomically claim the oldest runnable job; concurrent workers skip rows another worker holds."""
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    UPDATE pipeline_jobs
+                    SET status = 'running', worker_id = %s, attempts = attempts + 1,
+                        started_at = NOW(), heartbeat_at = NOW()
+                    WHERE id = (
+                        SELECT id FROM pipeline_jobs
+                        WHERE status = 'queued' AND available_at <= NOW()
+                        ORDER BY available_at, id
+                        FOR UPDATE SKIP LOCKED
+                        LIMIT 1
+                    )
+                    RETURNING id, batch_id, ticker, payload, attempts, max_attempts
+                """, (worker_id,))
+                return cur.fetchone()
+
+    def heartbeat_job(self, job_id: int, worker_id: str) -> bool:
+        """Refresh a running job's heartbeat. False if the job was reaped or finished elsewhere."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE pipeline_jobs SET heartbeat_at = NOW()
+                    WHERE id = %s AND worker_id = %s AND status = 'running'
+                """, (job_id, worker_id))
+                return cur.rowcount == 1
+
+    def complete_job(self, job_id: int, worker_id: str, result: Dict) -> bool:
+        """Store a job's result; ignored if this worker no longer owns the job."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE pipeline_jobs SET status = 'done', result = %s, error = NULL, finished_at = NOW()
+                    WHERE id = %s AND worker_id = %s AND status = 'running'
+                """, (Json(result, dumps=_dumps), job_id, worker_id))
+                return cur.rowcount == 1
+
+    def fail_job(self, job_id: int, worker_id: str, error: str, retry_delay_seconds: float):
+        """Requeue a failed job after a delay, or mark it failed once its attempts are used up."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE pipeline_jobs
+                    SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                        available_at = NOW() + INTERVAL '1 second' * %s,
+                        error = %s, worker_id = NULL,
+                        finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE NOW() END
+                    WHERE id = %s AND worker_id = %s AND status = 'running'
+                """, (retry_delay_seconds, error, job_id, worker_id))
+
+    def requeue_stale_jobs(self, stale_seconds: float) -> int:
+        """Recover jobs whose worker stopped heartbeating (crashed or partitioned). Returns jobs touched."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE pipeline_jobs
+                    SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                        error = 'worker ' || COALESCE(worker_id, '?') || ' stopped heartbeating',
+                        worker_id = NULL, available_at = NOW(),
+                        finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE NOW() END
+                    WHERE status = 'running' AND heartbeat_at < NOW() - INTERVAL '1 second' * %s
+                """, (stale_seconds,))
+                return cur.rowcount
+
+    def get_batch_status(self, batch_id: str) -> Dict[str, int]:
+        """Job counts per status for a batch."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT status, COUNT(*) FROM pipeline_jobs WHERE batch_id = %s GROUP BY status
+                """, (batch_id,))
+                return dict(cur.fetchall())
+
+    def get_batch_results(self, batch_id: str) -> List[Dict]:
+        """Ticker, status, result and error of every job in a batch."""
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT ticker, status, attempts, worker_id, result, error FROM pipeline_jobs
+                    WHERE batch_id = %s ORDER BY id
+                """, (batch_id,))
+                return cur.fetchall()
+
+    def cancel_batch(self, batch_id: str) -> int:
+        """Cancel a batch's jobs that haven't started (e.g. after the coordinator gave up waiting)."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE pipeline_jobs SET status = 'cancelled', finished_at = NOW()
+                    WHERE batch_id = %s AND status = 'queued'
+                """, (batch_id,))
+                return cur.rowcount
+
+    def insert_pipeline_run(self, kind: str, started_at: float, seconds: float, tickers: int,
+                            errors: int, stages: Dict[str, Dict]) -> int:
+        """Store one cycle's per-stage summary (calls, errors, items, seconds per stage)."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO pipeline_runs (kind, started_at, seconds, tickers, errors, stages)
+                    VALUES (%s, to_timestamp(%s), %s, %s, %s, %s)
+                    RETURNING id
+                """, (kind, started_at, seconds, tickers, errors, Json(stages)))
+                return cur.fetchone()[0]
+
+    def get_pipeline_runs(self, limit: int = 20) -> List[Dict]:
+        """Most recent cycle summaries, newest first."""
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT * FROM pipeline_runs ORDER BY started_at DESC LIMIT %s
+                """, (limit,))
+                return cur.fetchall()
+
     def get_recent_news(self, ticker: str, hours: int = 1) -> List[Dict]:
         """Get news articles from the last N hours for a ticker, using created_at for recency."""
         with self.get_connection() as conn:
@@ -0,0 +1,134 @@
+"""Thread-safe PostgreSQL connection pool shared by every DatabaseManager."""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+
+import config
+
+
+class _CountingPool(pg_pool.ThreadedConnectionPool):
+    """ThreadedConnectionPool that counts physical connects (TCP + auth handshakes)."""
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        self.connects = 0
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def _connect(self, key=None):
+        self.connects += 1
+        return super()._connect(key)
+
+
+class ConnectionPool:
+    """Bounded, lazily-opened pool with idle health checks and acquisition counters."""
+
+    def __init__(self, db_config: Dict, minconn: int = None, maxconn: int = None,
+                 healthcheck_seconds: float = None):
+        self.db_config = db_config
+        self.minconn = minconn if minconn is not None else config.DB_POOL_MIN
+        self.maxconn = maxconn if maxconn is not None else config.DB_POOL_MAX
+        self.healthcheck_seconds = (healthcheck_seconds if healthcheck_seconds is not None
+                                    else config.DB_POOL_HEALTHCHECK_SECONDS)
+        self._pool = None
+        self._init_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        # psycopg2 raises PoolError when exhausted; the semaphore makes callers wait instead
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._last_used = {}
+        self.acquisitions = 0
+        self.healthcheck_failures = 0
+
+    def _get_pool(self) -> _CountingPool:
+        # Opened on first use so DatabaseManager() stays cheap when the DB is never touched
+        if self._pool is None:
+            with self._init_lock:
+                if self._pool is None:
+                    self._pool = _CountingPool(self.minconn, self.maxconn, **self.db_config)
+        return self._pool
+
+    def _is_healthy(self, conn) -> bool:
+        """Ping connections that sat idle longer than the health-check window."""
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        # Freshly opened connections have never been used and need no ping
+        if last_used is None or time.monotonic() - last_used < self.healthcheck_seconds:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    @contextmanager
+    def connection(self):
+        """Borrow a healthy connection; it is returned to the pool on exit."""
+        self._slots.acquire()
+        pool = None
+        conn = None
+        try:
+            pool = self._get_pool()
+            # Swap out dead connections: one try per pool slot plus a fresh connect
+            for _ in range(self.maxconn + 1):
+                conn = pool.getconn()
+                if self._is_healthy(conn):
+                    break
+                with self._stats_lock:
+                    self.healthcheck_failures += 1
+                self._discard(pool, conn)
+                conn = None
+            else:
+                raise psycopg2.OperationalError(
+                    f"No healthy database connection after {self.maxconn + 1} attempts")
+            with self._stats_lock:
+                self.acquisitions += 1
+            yield conn
+        finally:
+            if conn is not None:
+                if conn.closed or conn.status != psycopg2.extensions.STATUS_READY:
+                    self._discard(pool, conn)
+                else:
+                    self._last_used[id(conn)] = time.monotonic()
+                    pool.putconn(conn)
+            self._slots.release()
+
+    def _discard(self, pool: _CountingPool, conn):
+        """Close a connection and forget its idle timestamp (ids are reused by new objects)."""
+        self._last_used.pop(id(conn), None)
+        pool.putconn(conn, close=True)
+
+    def stats(self) -> Dict:
+        """Acquisition vs. physical connect counts for the hot-path handshake check."""
+        return {
+            'acquisitions': self.acquisitions,
+            'connects': self._pool.connects if self._pool is not None else 0,
+            'healthcheck_failures': self.healthcheck_failures,
+            'min_size': self.minconn,
+            'max_size': self.maxconn,
+        }
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._init_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+            self._last_used.clear()
+
+
+_pools: Dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_config: Dict) -> ConnectionPool:
+    """Return the process-wide pool for a DB config, creating it on first request."""
+    key = tuple(sorted(db_config.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(db_config)
+        return _pools[key]
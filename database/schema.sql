@@ -15,6 +15,9 @@ CREATE TABLE IF NOT EXISTS market_quotes (
     CONSTRAINT unique_ticker_timestamp UNIQUE (ticker, timestamp)
 );
 
+-- Streamed 1-minute bars carry volume; REST snapshots leave it NULL
+ALTER TABLE market_quotes ADD COLUMN IF NOT EXISTS volume BIGINT;
+
 CREATE INDEX IF NOT EXISTS idx_market_quotes_ticker ON market_quotes(ticker);
 CREATE INDEX IF NOT EXISTS idx_market_quotes_timestamp ON market_quotes(timestamp);
 
@@ -66,3 +69,86 @@ CREATE TABLE IF NOT EXISTS news_staging (
 CREATE INDEX IF NOT EXISTS idx_news_staging_ticker ON news_staging(ticker);
 CREATE INDEX IF NOT EXISTS idx_news_staging_published_at ON news_staging(published_at);
 CREATE INDEX IF NOT EXISTS idx_news_staging_created_at ON news_staging(created_at);
+
+-- Content-addressed FinBERT cache (SHA-256 of the cleaned, case-folded headline)
+CREATE TABLE IF NOT EXISTS sentiment_cache (
+    headline_hash CHAR(64) PRIMARY KEY,
+    headline TEXT NOT NULL,
+    negative FLOAT NOT NULL,
+    neutral FLOAT NOT NULL,
+    positive FLOAT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Technical Specialist analyses keyed on ticker + bucketed indicator/price inputs
+CREATE TABLE IF NOT EXISTS llm_analysis_cache (
+    cache_key TEXT NOT NULL,
+    model VARCHAR(50) NOT NULL,
+    ticker VARCHAR(10) NOT NULL,
+    analysis TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (cache_key, model)
+);
+
+-- Inputs each ticker's last real decision was made on (change-driven gating)
+CREATE TABLE IF NOT EXISTS ticker_state (
+    ticker VARCHAR(10) PRIMARY KEY,
+    snapshot JSONB NOT NULL,
+    decision JSONB NOT NULL,
+    analysis TEXT,
+    decided_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Cycles where a ticker skipped the LLM stages and carried its decision forward
+CREATE TABLE IF NOT EXISTS decision_skips (
+    id SERIAL PRIMARY KEY,
+    ticker VARCHAR(10) NOT NULL,
+    carried_action VARCHAR(10) NOT NULL,
+    reason TEXT,
+    timestamp TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_decision_skips_ticker ON decision_skips(ticker);
+
+-- Ticker universe (UNIVERSE_SOURCE=db); inactive rows are kept but not processed
+CREATE TABLE IF NOT EXISTS universe (
+    symbol VARCHAR(10) PRIMARY KEY,
+    active BOOLEAN NOT NULL DEFAULT TRUE,
+    added_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Per-ticker pipeline jobs for distributed workers (claimed with FOR UPDATE SKIP LOCKED)
+CREATE TABLE IF NOT EXISTS pipeline_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    batch_id VARCHAR(36) NOT NULL,
+    ticker VARCHAR(10) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}',
+    status VARCHAR(10) NOT NULL DEFAULT 'queued',  -- queued | running | done | failed | cancelled
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker_id VARCHAR(100),
+    available_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    heartbeat_at TIMESTAMPTZ,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_queued ON pipeline_jobs(available_at, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_batch ON pipeline_jobs(batch_id);
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_running ON pipeline_jobs(heartbeat_at) WHERE status = 'running';
+
+-- Per-cycle stage summaries: {"node.portfolio_manager": {"calls", "errors", "items", "seconds"}, ...}
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,  -- batch | universe
+    started_at TIMESTAMPTZ NOT NULL,
+    seconds DOUBLE PRECISION NOT NULL,
+    tickers INTEGER NOT NULL,
+    errors INTEGER NOT NULL DEFAULT 0,
+    stages JSONB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_started ON pipeline_runs(started_at DESC);
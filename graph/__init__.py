@@ -1,4 +1,6 @@
-"""Graph module."""
-from .trading_workflow import TradingWorkflow
+"""Graph module. TradingWorkflow (langgraph, FinBERT, yfinance) is imported on first use."""
+from telemetry.startup import lazy_exports
 
-__all__ = ['TradingWorkflow']
+__getattr__, __all__ = lazy_exports(__name__, {
+    'TradingWorkflow': '.trading_workflow',
+})
@@ -0,0 +1,93 @@
+"""Change-driven gating: skip the LLM stages when a ticker's inputs haven't materially moved."""
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import config
+from database.db_manager import DatabaseManager
+
+
+class ChangeGate:
+    """Compares each ticker's inputs with the snapshot taken at its last real decision."""
+
+    def __init__(self, db: DatabaseManager = None):
+        self.db = db or DatabaseManager()
+        self._last: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self, news_alert: Dict, market_data: Dict, indicators: Dict) -> Dict:
+        """The inputs that decide whether a fresh decision is needed."""
+        rsi = indicators['rsi']
+        return {
+            'news_score': float((news_alert or {}).get('score', 0.0)),
+            'news_alert': bool((news_alert or {}).get('alert', False)),
+            'price': float(market_data['current_price']),
+            'rsi_band': sum(1 for edge in config.GATE_RSI_BANDS if rsi >= edge),
+            'histogram_sign': (indicators['macd']['histogram'] > 0) - (indicators['macd']['histogram'] < 0),
+        }
+
+    def last_state(self, ticker: str) -> Optional[Dict]:
+        """Last decided snapshot + decision, from memory or the ticker_state table."""
+        with self._lock:
+            if ticker in self._last:
+                return self._last[ticker]
+        try:
+            row = self.db.get_ticker_state(ticker)
+        except Exception as e:
+            print(f"  [Gate] Warning: could not load last state for {ticker}: {e}")
+            return None
+        if row:
+            with self._lock:
+                self._last[ticker] = row
+        return row
+
+    def check(self, ticker: str, current: Dict) -> Tuple[bool, str, Optional[Dict]]:
+        """Returns (material_change, reason, last_state)."""
+        last = self.last_state(ticker)
+        if not last:
+            return True, "no previous decision", None
+        prev = last['snapshot']
+
+        decided_at = last['decided_at']
+        if decided_at.tzinfo is None:
+            decided_at = decided_at.replace(tzinfo=timezone.utc)
+        age_minutes = (datetime.now(tz=timezone.utc) - decided_at).total_seconds() / 60
+        if age_minutes >= config.GATE_MAX_AGE_MINUTES:
+            return True, f"last decision is {age_minutes:.0f} min old", last
+
+        news_delta = abs(current['news_score'] - prev['news_score'])
+        if news_delta >= config.GATE_NEWS_DELTA:
+            return True, f"news score moved {news_delta:.3f}", last
+        if current['news_alert'] and not prev['news_alert']:
+            return True, "new news alert", last
+        price_move = abs(current['price'] / prev['price'] - 1) * 100 if prev['price'] else float('inf')
+        if price_move >= config.GATE_PRICE_MOVE_PCT:
+            return True, f"price moved {price_move:.2f}%", last
+        if current['rsi_band'] != prev['rsi_band']:
+            return True, f"RSI band {prev['rsi_band']} -> {current['rsi_band']}", last
+        if current['histogram_sign'] != prev['histogram_sign']:
+            return True, "MACD histogram changed sign", last
+        return False, f"no material change (news Δ{news_delta:.3f}, price Δ{price_move:.2f}%)", last
+
+    def record_decision(self, ticker: str, snapshot: Dict, decision: Dict, analysis: str):
+        """Remember the inputs a real decision was made on."""
+        carried = {k: v for k, v in decision.items() if k != 'full_response'}
+        state = {
+            'snapshot': snapshot,
+            'decision': carried,
+            'analysis': analysis,
+            'decided_at': datetime.now(tz=timezone.utc),
+        }
+        with self._lock:
+            self._last[ticker] = state
+        try:
+            self.db.upsert_ticker_state(ticker, snapshot, carried, analysis)
+        except Exception as e:
+            print(f"  [Gate] Warning: could not persist state for {ticker}: {e}")
+
+    def record_skip(self, ticker: str, decision: Dict, reason: str):
+        """Log that a ticker skipped the LLM stages and carried its decision forward."""
+        try:
+            self.db.insert_decision_skip(ticker, decision.get('decision', 'HOLD'), reason)
+        except Exception as e:
+            print(f"  [Gate] Warning: could not record skip for {ticker}: {e}")
@@ -0,0 +1,152 @@
+"""Coordinator/worker mode: per-ticker pipeline jobs in a Postgres queue (FOR UPDATE SKIP LOCKED)."""
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+import config
+from database.db_manager import DatabaseManager
+
+# State keys a worker sends back; price_history (a DataFrame) stays on the worker
+RESULT_KEYS = ('ticker', 'market_data', 'sentiment_data', 'technical_data', 'news_alert', 'decision', 'gate', 'error')
+
+
+def serialize_result(state: Dict) -> Dict:
+    """JSON-safe subset of a finished TradingState."""
+    result = {key: state.get(key) for key in RESULT_KEYS}
+    if isinstance(result.get('decision'), dict):
+        result['decision'] = {k: v for k, v in result['decision'].items() if k != 'full_response'}
+    return result
+
+
+class Coordinator:
+    """Enqueues one job per ticker and collects results as workers finish them."""
+
+    def __init__(self, db: DatabaseManager = None):
+        self.db = db or DatabaseManager()
+
+    def submit(self, tickers: List[str], news_results: Dict[str, Dict] = None,
+               quotes: Dict[str, Dict] = None) -> str:
+        """Queue a batch; each job carries the ticker's pre-scored news and quote. Returns the batch id."""
+        batch_id = str(uuid.uuid4())
+        news_results = news_results or {}
+        quotes = quotes or {}
+        jobs = [(ticker, {'news_alert': news_results.get(ticker), 'market_data': quotes.get(ticker)})
+                for ticker in tickers]
+        self.db.enqueue_jobs(batch_id, jobs, config.JOB_MAX_ATTEMPTS)
+        print(f"  [Coordinator] Queued {len(jobs)} jobs (batch {batch_id[:8]})")
+        return batch_id
+
+    def wait(self, batch_id: str, timeout: float = None) -> Dict[str, Dict]:
+        """Poll until every job is done or failed (reaping jobs from dead workers), then return results."""
+        timeout = config.JOB_BATCH_TIMEOUT_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        reported = None
+        while True:
+            reaped = self.db.requeue_stale_jobs(config.JOB_STALE_SECONDS)
+            if reaped:
+                print(f"  [Coordinator] Requeued {reaped} jobs from unresponsive workers")
+            status = self.db.get_batch_status(batch_id)
+            pending = status.get('queued', 0) + status.get('running', 0)
+            if status != reported:
+                print(f"  [Coordinator] {status.get('done', 0)} done, {status.get('running', 0)} running, "
+                      f"{status.get('queued', 0)} queued, {status.get('failed', 0)} failed")
+                reported = status
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                cancelled = self.db.cancel_batch(batch_id)
+                print(f"  [Coordinator] Timed out after {timeout:.0f}s; cancelled {cancelled} unstarted jobs")
+                break
+            time.sleep(config.JOB_POLL_SECONDS)
+        return self.collect(batch_id)
+
+    def collect(self, batch_id: str) -> Dict[str, Dict]:
+        results = {}
+        for row in self.db.get_batch_results(batch_id):
+            if row['status'] == 'done':
+                results[row['ticker']] = row['result']
+            else:
+                error = row['error'] or row['status']
+                results[row['ticker']] = {'ticker': row['ticker'], 'error': f"Job {row['status']}: {error}"}
+        return results
+
+    def run(self, tickers: List[str], news_results: Dict[str, Dict] = None,
+            quotes: Dict[str, Dict] = None, timeout: float = None) -> Dict[str, Dict]:
+        """Submit a batch and block until its results are in (input order preserved)."""
+        batch_id = self.submit(tickers, news_results, quotes)
+        results = self.wait(batch_id, timeout)
+        return {ticker: results.get(ticker, {'ticker': ticker, 'error': 'Job missing'}) for ticker in tickers}
+
+
+class Worker:
+    """
+    Claims jobs one at a time and runs them through its own TradingWorkflow
+    (own FinBERT, own Ollama endpoint). A heartbeat thread keeps the claim alive;
+    if the worker dies, the coordinator requeues the job once the heartbeat is stale.
+    """
+
+    def __init__(self, workflow, worker_id: str = None, db: DatabaseManager = None):
+        self.workflow = workflow
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.db = db or DatabaseManager()
+        self.processed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+
+    def _heartbeat(self, job_id: int, done: threading.Event):
+        while not done.wait(config.JOB_HEARTBEAT_SECONDS):
+            try:
+                if not self.db.heartbeat_job(job_id, self.worker_id):
+                    print(f"  [Worker {self.worker_id}] Lost job {job_id} (reaped or cancelled)")
+                    return
+            except Exception as e:
+                print(f"  [Worker {self.worker_id}] Heartbeat failed for job {job_id}: {e}")
+
+    def run_job(self, job: Dict):
+        payload = job['payload'] or {}
+        ticker = job['ticker']
+        print(f"\n[Worker {self.worker_id}] Job {job['id']}: {ticker} "
+              f"(attempt {job['attempts']}/{job['max_attempts']})")
+        done = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job['id'], done), daemon=True)
+        beat.start()
+        try:
+            state = self.workflow.run(ticker, news_alert=payload.get('news_alert'),
+                                      market_data=payload.get('market_data'))
+            if state.get('error'):
+                # Pipeline errors (no quote, no history, model down) are worth another attempt
+                raise RuntimeError(state['error'])
+            self.db.complete_job(job['id'], self.worker_id, serialize_result(state))
+            self.processed += 1
+        except KeyboardInterrupt:
+            # Hand the job straight back instead of waiting for the heartbeat to go stale
+            self.db.fail_job(job['id'], self.worker_id, "worker stopped", 0)
+            raise
+        except Exception as e:
+            self.failed += 1
+            delay = config.JOB_RETRY_DELAY_SECONDS * job['attempts']
+            print(f"  [Worker {self.worker_id}] Job {job['id']} failed: {e}")
+            self.db.fail_job(job['id'], self.worker_id, str(e), delay)
+        finally:
+            done.set()
+            beat.join()
+
+    def run_forever(self):
+        """Claim and run jobs until stop() or KeyboardInterrupt."""
+        print(f"[Worker {self.worker_id}] Waiting for jobs (Ollama at {self.workflow.portfolio_manager.base_url})")
+        while not self._stop.is_set():
+            try:
+                job = self.db.claim_job(self.worker_id)
+            except Exception as e:
+                print(f"  [Worker {self.worker_id}] Claim failed: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(config.JOB_POLL_SECONDS)
+                continue
+            self.run_job(job)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,125 @@
+"""Drift-free multi-cadence scheduler for monitoring mode."""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, time as dtime
+from typing import Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import config
+
+
+def market_is_open(now: datetime = None) -> bool:
+    """Regular US session (Mon-Fri, MARKET_OPEN-MARKET_CLOSE Eastern). Exchange holidays are not modelled."""
+    now = now or datetime.now(tz=ZoneInfo(config.MARKET_TZ))
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=ZoneInfo(config.MARKET_TZ))
+    now = now.astimezone(ZoneInfo(config.MARKET_TZ))
+    if now.weekday() >= 5:
+        return False
+    opens = dtime.fromisoformat(config.MARKET_OPEN)
+    closes = dtime.fromisoformat(config.MARKET_CLOSE)
+    return opens <= now.time() < closes
+
+
+class Job:
+    """A stage run on its own cadence, with a slower cadence outside market hours."""
+
+    def __init__(self, name: str, fn: Callable[[], None], interval: float, off_hours_interval: float = None):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.off_hours_interval = off_hours_interval or interval
+        self.next_due = 0.0
+        self.future: Optional[Future] = None
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_duration = 0.0
+
+    def period(self, market_open: bool) -> float:
+        return self.interval if market_open else self.off_hours_interval
+
+    @property
+    def running(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+
+class Scheduler:
+    """
+    Runs each Job on a fixed grid (due times advance by the period from the
+    previous due time, not from when the run finished, so periods don't drift).
+    A slot that arrives while the job's previous run is still going is skipped
+    rather than queued, and slots missed while blocked are dropped. Jobs run on
+    their own worker threads, so a slow stage never delays a fast one.
+    """
+
+    def __init__(self, jobs: List[Job], market_clock: Callable[[], bool] = market_is_open):
+        self.jobs = jobs
+        self.market_clock = market_clock
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="sched")
+
+    def _run_job(self, job: Job):
+        started = time.monotonic()
+        try:
+            job.fn()
+        except Exception as e:
+            job.failures += 1
+            print(f"  [Scheduler] {job.name} failed: {e}")
+        finally:
+            job.last_duration = time.monotonic() - started
+            job.runs += 1
+
+    def _advance(self, job: Job, now: float, period: float):
+        """Next slot on the grid after `now`; any slots in between are counted as skipped."""
+        job.next_due += period
+        if job.next_due <= now:
+            missed = int((now - job.next_due) // period) + 1
+            job.skipped += missed
+            job.next_due += missed * period
+
+    def run_forever(self, max_wait: float = 30.0):
+        """Dispatch due jobs until stop() or KeyboardInterrupt."""
+        market_open = self.market_clock()
+        start = time.monotonic()
+        for job in self.jobs:
+            job.next_due = start
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                is_open = self.market_clock()
+                if is_open != market_open:
+                    # Session opened or closed: put every job on its new cadence right away
+                    market_open = is_open
+                    print(f"\n[Scheduler] Market {'open' if is_open else 'closed'}, "
+                          f"switching to {'market' if is_open else 'off-hours'} cadence")
+                    for job in self.jobs:
+                        job.next_due = now
+                for job in self.jobs:
+                    if job.next_due > now:
+                        continue
+                    if job.running:
+                        job.skipped += 1  # previous run overran its slot; don't stack another
+                    else:
+                        job.future = self._pool.submit(self._run_job, job)
+                    self._advance(job, now, job.period(market_open))
+                wake = min(job.next_due for job in self.jobs)
+                self._stop.wait(min(max(0.0, wake - time.monotonic()), max_wait))
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            job.name: {
+                'runs': job.runs,
+                'skipped': job.skipped,
+                'failures': job.failures,
+                'last_duration': round(job.last_duration, 2),
+                'running': job.running,
+            }
+            for job in self.jobs
+        }
@@ -1,99 +1,217 @@
-"""LangGraph workflow: News Sensing -> Data Ingestion -> Sentiment -> Technical -> Portfolio Manager."""
-from langgraph.graph import StateGraph, END
-from typing import TypedDict, Dict, List, Optional
+"""
+LangGraph workflow, fanned out where stages are independent:
+
+    News Sensing ───┐                 ┌─(analyze)─> Technical ─┐
+                    ├──> Change Gate ─┤                        ├──> Portfolio Manager
+    Data Ingestion ─┘                 └───────────> Sentiment ─┘
+                                         (skip: Sentiment only, then END)
+
+News and market data are fetched side by side; FinBERT sentiment and the
+Llama technical analysis run in the same step, and DeepSeek joins them.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langgraph.graph import StateGraph, START, END
+from typing import Annotated, Callable, TypedDict, Dict, List, Optional, Tuple
 from agents.sentiment_analyst import SentimentAnalyst
 from agents.technical_specialist import TechnicalSpecialist
 from agents.portfolio_manager import PortfolioManager
 from data.finnhub_client import FinnhubClient
 from data.yfinance_client import YFinanceClient
 from data.news_engine import SentinelNewsEngine
+from data.ohlcv_store import OHLCVStore
+from data.quote_stream import QuoteStream
+from data.universe import shards
+from graph.job_queue import Coordinator
 from database.db_manager import DatabaseManager
+from graph.change_gate import ChangeGate
+from telemetry.metrics import METRICS, PipelineRun, span
+from telemetry.startup import STARTUP
 import config
 
 
+def _first_error(current: str, update: str) -> str:
+    """Keep the first error reported; parallel branches may both fail in one step."""
+    return current or update
+
+
 class TradingState(TypedDict):
-    """State for the trading workflow."""
+    """
+    State for the trading workflow. Nodes return only the keys they set, so
+    parallel branches never write the same key in one step (error has a reducer).
+    """
     ticker: str
     market_data: Dict
     price_history: Dict
+    indicators: Dict
     headlines: List[str]
     sentiment_data: Dict
     technical_data: Dict
     news_alert: Optional[Dict]
     decision: Dict
-    error: str
+    gate: Dict
+    error: Annotated[str, _first_error]
 
 
 class TradingWorkflow:
     """Trading workflow using LangGraph."""
 
     def __init__(self):
-        # Load FinBERT once via NewsEngine, share with SentimentAnalyst for fallback scoring
-        self.news_engine = SentinelNewsEngine()
-        self.sentiment_analyst = SentimentAnalyst(
-            model=self.news_engine.model,
-            tokenizer=self.news_engine.tokenizer
-        )
-        self.technical_specialist = TechnicalSpecialist()
-        self.portfolio_manager = PortfolioManager()
-        self.finnhub = FinnhubClient()
-        self.yfinance = YFinanceClient()
-        self.db = DatabaseManager()
-        self.graph = self._build_graph()
-        print("[Workflow] Initialized — FinBERT loaded once, shared across NewsEngine + SentimentAnalyst")
-
-    def _build_graph(self) -> StateGraph:
+        # One FinBERT backend via NewsEngine, shared with SentimentAnalyst for fallback scoring;
+        # it is only loaded when the first batch of uncached headlines needs scoring
+        with STARTUP.phase("workflow: news engine + sentiment"):
+            self.news_engine = SentinelNewsEngine()
+            self.sentiment_analyst = SentimentAnalyst(
+                backend=self.news_engine.backend,
+                inference_lock=self.news_engine.inference_lock,
+                cache=self.news_engine.cache
+            )
+        with STARTUP.phase("workflow: agents + clients"):
+            self.technical_specialist = TechnicalSpecialist()
+            self.portfolio_manager = PortfolioManager()
+            self.finnhub = FinnhubClient()
+            self.yfinance = YFinanceClient()
+            self.ohlcv = OHLCVStore()
+            self.db = DatabaseManager()
+        # Per-stage concurrency limits for run_batch; FinBERT is serialized inside the NewsEngine
+        self.fetch_slots = self.news_engine.fetch_slots
+        self.ollama_slots = threading.BoundedSemaphore(config.OLLAMA_CONCURRENCY)
+        # Change-driven gating: unchanged tickers skip Llama + DeepSeek and carry their decision
+        self.gate = ChangeGate(self.db)
+        self.gating = config.GATING_ENABLED
+        # Model affinity: all Llama work in a batch before any DeepSeek work (see _run_by_model)
+        self.model_affinity = config.MODEL_AFFINITY
+        self._stage_graph = None  # graph without portfolio_manager, compiled on first affinity batch
+        # Per-cycle cap on tickers reaching the LLM stages (None = unlimited); set by the outermost run
+        self.llm_budget: Optional[int] = None
+        self._llm_budget_lock = threading.Lock()
+        self._universe_cursor = 0  # shard a budget-limited universe sweep resumes from
+        # Set via distribute() to hand per-ticker runs to queue workers instead of local threads
+        self.coordinator: Optional[Coordinator] = None
+        # Optional live trade stream; when running, quotes are served from memory instead of REST
+        self.stream: Optional[QuoteStream] = None
+        # Outermost run_batch / run_universe call being measured, and the last finished one
+        self._active_run: Optional[PipelineRun] = None
+        self.last_run: Optional[PipelineRun] = None
+        with STARTUP.phase("workflow: graph compile"):
+            self.graph = self._build_graph()
+        print("[Workflow] Initialized — FinBERT loads on first use, shared across NewsEngine + SentimentAnalyst")
+
+    @staticmethod
+    def _traced(name: str, node):
+        """Time a node as node.<name>; a node that reports an error counts as failed."""
+        def traced(state: TradingState) -> Dict:
+            with span('node', name) as s:
+                update = node(state)
+                if update.get('error'):
+                    s.fail()
+            return update
+        return traced
+
+    def _build_graph(self, decide: bool = True) -> StateGraph:
+        """The per-ticker graph; decide=False stops after the Llama stage (model-affinity batches)."""
         workflow = StateGraph(TradingState)
-        workflow.add_node("news_sensing", self.news_sensing_node)
-        workflow.add_node("data_ingestion", self.data_ingestion_node)
-        workflow.add_node("sentiment_analysis", self.sentiment_analysis_node)
-        workflow.add_node("technical_analysis", self.technical_analysis_node)
-        workflow.add_node("portfolio_manager", self.portfolio_manager_node)
-        workflow.set_entry_point("news_sensing")
-        workflow.add_edge("news_sensing", "data_ingestion")
-        workflow.add_edge("data_ingestion", "sentiment_analysis")
-        workflow.add_edge("sentiment_analysis", "technical_analysis")
-        workflow.add_edge("technical_analysis", "portfolio_manager")
+        workflow.add_node("news_sensing", self._traced("news_sensing", self.news_sensing_node))
+        workflow.add_node("data_ingestion", self._traced("data_ingestion", self.data_ingestion_node))
+        workflow.add_node("sentiment_analysis", self._traced("sentiment_analysis", self.sentiment_analysis_node))
+        workflow.add_node("change_gate", self._traced("change_gate", self.change_gate_node))
+        workflow.add_node("technical_analysis", self._traced("technical_analysis", self.technical_analysis_node))
+        # News fetch/scoring and the quote + price history fetch run side by side
+        workflow.add_edge(START, "news_sensing")
+        workflow.add_edge(START, "data_ingestion")
+        # The gate needs the news score and the indicators, so it waits for both
+        workflow.add_edge(["news_sensing", "data_ingestion"], "change_gate")
+        # Sentiment always runs; when the gate lets the ticker through it shares a step with Llama
+        workflow.add_conditional_edges(
+            "change_gate", self._route_after_gate, ["technical_analysis", "sentiment_analysis"]
+        )
+        if not decide:
+            workflow.add_edge("sentiment_analysis", END)
+            workflow.add_edge("technical_analysis", END)
+            return workflow.compile()
+        workflow.add_node("portfolio_manager", self._traced("portfolio_manager", self.portfolio_manager_node))
+        # DeepSeek waits for both branches. A skipped gate never reaches
+        # technical_analysis, so this join never fires.
+        workflow.add_edge(["sentiment_analysis", "technical_analysis"], "portfolio_manager")
         workflow.add_edge("portfolio_manager", END)
         return workflow.compile()
 
-    def news_sensing_node(self, state: TradingState) -> TradingState:
+    def distribute(self, coordinator: Coordinator):
+        """
+        Hand per-ticker runs to queue workers. Each worker runs its jobs independently, so
+        batch-level LLM scheduling (model affinity, the per-cycle LLM budget) can't apply;
+        those settings are rejected here rather than silently ignored.
+        """
+        conflicts = []
+        if self.model_affinity:
+            conflicts.append("model affinity (--model-affinity / MODEL_AFFINITY)")
+        if config.LLM_DECISIONS_PER_CYCLE:
+            conflicts.append("an LLM budget (LLM_DECISIONS_PER_CYCLE)")
+        if conflicts:
+            raise ValueError(f"Distributed mode does not support {' or '.join(conflicts)}")
+        self.coordinator = coordinator
+
+    def start_stream(self, tickers: List[str] = None) -> QuoteStream:
+        """Start streaming trades for tickers, seeded with one REST quote sweep for session values."""
+        tickers = tickers or config.STOCKS
+        seeds = self.finnhub.get_quotes_batch(tickers)
+        self.stream = QuoteStream(tickers, writer=self.finnhub.writer).start(seed_quotes=seeds)
+        return self.stream
+
+    def stop_stream(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+
+    def _live_quote(self, ticker: str) -> Optional[Dict]:
+        return self.stream.quote(ticker) if self.stream is not None else None
+
+    def news_sensing_node(self, state: TradingState) -> Dict:
         """Node 0: Sentinel News Engine — ingest, deduplicate, score headlines."""
         ticker = state['ticker']
         try:
-            results = self.news_engine.run(tickers=[ticker])
-            news_result = results.get(ticker, {})
-            state['news_alert'] = news_result
+            if state.get('news_alert'):
+                # Already scored by run_batch's universe-wide NewsEngine pass
+                news_result = state['news_alert']
+            else:
+                results = self.news_engine.run(tickers=[ticker])
+                news_result = results.get(ticker, {})
             score = news_result.get('score', 0.0)
             count = news_result.get('articles_count', 0)
             direction = news_result.get('direction', 'neutral').upper()
             print(f"  [NewsEngine] {ticker}: score={score:.3f} ({direction}), articles={count}")
             if news_result.get('alert'):
                 print(f"\n[Workflow] *** NEWS ALERT for {ticker}: {direction} score={score:.3f} → waking DeepSeek-R1 ***")
+            return {'news_alert': news_result}
         except Exception as e:
             print(f"  [NewsEngine] Warning: {e}")
-            state['news_alert'] = {}
-        return state
+            return {'news_alert': {}}
 
-    def data_ingestion_node(self, state: TradingState) -> TradingState:
-        """Node 1: Fetch real-time market data and price history."""
+    def data_ingestion_node(self, state: TradingState) -> Dict:
+        """Node 1: Fetch real-time market data, price history and indicators (runs alongside news sensing)."""
         ticker = state['ticker']
         try:
-            market_data = self.finnhub.get_quote(ticker)
-            if not market_data:
-                state['error'] = f"Failed to fetch market data for {ticker}"
-                return state
-            price_history = self.yfinance.get_price_history(ticker, period="1mo")
-            state['market_data'] = market_data
-            state['price_history'] = price_history
+            with self.fetch_slots:
+                # run_batch may already have fetched the quote; a live stream avoids the REST call
+                market_data = state.get('market_data') or self._live_quote(ticker) or self.finnhub.get_quote(ticker)
+                if not market_data:
+                    return {'error': f"Failed to fetch market data for {ticker}"}
+                price_history = state.get('price_history')
+                if price_history is None:
+                    # Local store only downloads bars newer than the last one it holds
+                    price_history = self.ohlcv.get_price_history(ticker)
+            # run_batch computes indicators for the whole batch; a lone run keeps its own engine
+            indicators = state.get('indicators') or \
+                self.technical_specialist.compute_universe({ticker: price_history}).get(ticker, {})
+            return {'market_data': market_data, 'price_history': price_history, 'indicators': indicators}
         except Exception as e:
-            state['error'] = f"Data ingestion error: {str(e)}"
-        return state
+            return {'error': f"Data ingestion error: {str(e)}"}
 
-    def sentiment_analysis_node(self, state: TradingState) -> TradingState:
-        """Node 2: Build sentiment_data from Sentinel News Engine scores (no re-scoring)."""
+    def sentiment_analysis_node(self, state: TradingState) -> Dict:
+        """Node 2: Build sentiment_data from Sentinel News Engine scores (runs alongside Llama)."""
         if state.get('error'):
-            return state
+            return {}
         try:
             ticker = state['ticker']
             news_result = state.get('news_alert') or {}
@@ -107,35 +225,103 @@ class TradingWorkflow:
             else:
                 # Fallback: fetch headlines and score with FinBERT directly
                 print(f"  [Sentiment] No news engine data for {ticker}, falling back to direct FinBERT scoring...")
-                headlines = self.yfinance.get_news(ticker, limit=10)
+                with self.fetch_slots:
+                    headlines = self.yfinance.get_news(ticker, limit=10)
                 sentiment_data = self.sentiment_analyst.analyze_news(ticker, headlines)
 
-            state['sentiment_data'] = sentiment_data
+            return {'sentiment_data': sentiment_data}
         except Exception as e:
-            state['error'] = f"Sentiment analysis error: {str(e)}"
-        return state
+            return {'error': f"Sentiment analysis error: {str(e)}"}
+
+    def _reserve_llm(self) -> bool:
+        """Take one LLM slot from this cycle's budget."""
+        with self._llm_budget_lock:
+            if self.llm_budget is None:
+                return True
+            if self.llm_budget <= 0:
+                return False
+            self.llm_budget -= 1
+            return True
+
+    def _carry_forward(self, state: TradingState, gate: Dict, indicators: Dict,
+                       last: Optional[Dict], reason: str) -> Dict:
+        """Skip the LLM stages, reusing the last real decision (or HOLD if there is none)."""
+        ticker = state['ticker']
+        if last:
+            decision = dict(last['decision'], carried_forward=True, full_response='')
+        else:
+            decision = {'decision': 'HOLD', 'confidence': 'LOW', 'reasoning': f"No decision yet: {reason}",
+                        'thinking_process': '', 'approved': False, 'carried_forward': True, 'full_response': ''}
+        gate['skipped'] = True
+        gate['reason'] = reason
+        self.gate.record_skip(ticker, decision, reason)
+        print(f"  [Gate] {ticker}: {reason} → carrying forward {decision.get('decision', 'HOLD')}")
+        return {
+            'gate': gate,
+            'decision': decision,
+            'technical_data': {
+                'ticker': ticker,
+                'indicators': indicators,
+                'analysis': (last or {}).get('analysis') or '',
+                'analysis_cached': True,
+            },
+        }
 
-    def technical_analysis_node(self, state: TradingState) -> TradingState:
+    def change_gate_node(self, state: TradingState) -> Dict:
+        """Node 2b: Compare inputs with the last decided state; carry the decision forward if unchanged."""
+        gate = {'skipped': False}
+        if state.get('error'):
+            return {'gate': gate}
+        try:
+            ticker = state['ticker']
+            indicators = state.get('indicators')
+            if not indicators:
+                return {'gate': gate}  # technical_analysis_node reports the missing history
+            snapshot = self.gate.snapshot(state.get('news_alert'), state['market_data'], indicators)
+            gate['snapshot'] = snapshot
+
+            if self.gating:
+                changed, reason, last = self.gate.check(ticker, snapshot)
+                gate['reason'] = reason
+                if not changed:
+                    return self._carry_forward(state, gate, indicators, last, reason)
+                print(f"  [Gate] {ticker}: {reason} → running Llama + DeepSeek")
+
+            if not self._reserve_llm():
+                # Cycle's LLM budget is spent; this ticker is retried first next cycle
+                return self._carry_forward(state, gate, indicators, self.gate.last_state(ticker),
+                                           "LLM budget exhausted this cycle")
+        except Exception as e:
+            # Fail open: any gating problem just means the full pipeline runs
+            print(f"  [Gate] Warning for {state['ticker']}: {e}")
+        return {'gate': gate}
+
+    def _route_after_gate(self, state: TradingState) -> List[str]:
+        if state.get('gate', {}).get('skipped'):
+            return ["sentiment_analysis"]
+        return ["technical_analysis", "sentiment_analysis"]
+
+    def technical_analysis_node(self, state: TradingState) -> Dict:
         """Node 3: Compute technical indicators using Llama 3.2."""
         if state.get('error'):
-            return state
+            return {}
         try:
             ticker = state['ticker']
             market_data = state['market_data']
             price_history = state['price_history']
-            if price_history is None or price_history.empty:
-                state['error'] = "No price history available for technical analysis"
-                return state
-            technical_data = self.technical_specialist.analyze(ticker, market_data, price_history)
-            state['technical_data'] = technical_data
+            if price_history is None or price_history.empty or not state.get('indicators'):
+                return {'error': "No price history available for technical analysis"}
+            with self.ollama_slots:
+                technical_data = self.technical_specialist.analyze(ticker, market_data, price_history,
+                                                                   indicators=state['indicators'])
+            return {'technical_data': technical_data}
         except Exception as e:
-            state['error'] = f"Technical analysis error: {str(e)}"
-        return state
+            return {'error': f"Technical analysis error: {str(e)}"}
 
-    def portfolio_manager_node(self, state: TradingState) -> TradingState:
-        """Node 4: Final decision using DeepSeek-R1 with all context."""
+    def portfolio_manager_node(self, state: TradingState) -> Dict:
+        """Node 4: Final decision using DeepSeek-R1 with all context (joins the sentiment and technical branches)."""
         if state.get('error'):
-            return state
+            return {}
         try:
             ticker = state['ticker']
             sentiment_data = state['sentiment_data']
@@ -144,10 +330,11 @@ class TradingWorkflow:
             news_alert = state.get('news_alert', {})
             historical_trades = self.db.get_recent_trades(ticker=ticker, limit=5)
 
-            decision = self.portfolio_manager.make_decision(
-                ticker, sentiment_data, technical_data, market_data,
-                historical_trades, news_alert=news_alert
-            )
+            with self.ollama_slots:
+                decision = self.portfolio_manager.make_decision(
+                    ticker, sentiment_data, technical_data, market_data,
+                    historical_trades, news_alert=news_alert
+                )
 
             self.db.insert_trade(
                 ticker=ticker,
@@ -161,32 +348,296 @@ class TradingWorkflow:
                 approved=decision['approved'],
                 portfolio_manager_reasoning=decision['thinking_process']
             )
-            state['decision'] = decision
+
+            # Remember the inputs this decision was made on (model errors aren't real decisions)
+            snapshot = state.get('gate', {}).get('snapshot')
+            if snapshot and decision.get('full_response'):
+                self.gate.record_decision(ticker, snapshot, decision, technical_data.get('analysis', ''))
+            return {'decision': decision}
         except Exception as e:
-            state['error'] = f"Portfolio manager error: {str(e)}"
-        return state
+            return {'error': f"Portfolio manager error: {str(e)}"}
 
-    def run(self, ticker: str) -> Dict:
-        """Execute the workflow for a single ticker."""
-        initial_state = TradingState(
+    def run(self, ticker: str, news_alert: Optional[Dict] = None, market_data: Optional[Dict] = None,
+            price_history=None, indicators: Optional[Dict] = None) -> Dict:
+        """Execute the workflow for a single ticker, optionally with pre-computed news, quote and history."""
+        return self.graph.invoke(self._initial_state(ticker, news_alert, market_data, price_history, indicators))
+
+    @staticmethod
+    def _initial_state(ticker: str, news_alert: Optional[Dict], market_data: Optional[Dict],
+                       price_history=None, indicators: Optional[Dict] = None) -> TradingState:
+        return TradingState(
             ticker=ticker,
-            market_data={},
-            price_history=None,
+            market_data=market_data or {},
+            price_history=price_history,
+            indicators=indicators or {},
             headlines=[],
             sentiment_data={},
             technical_data={},
-            news_alert={},
+            news_alert=news_alert or {},
             decision={},
+            gate={},
             error=""
         )
-        return self.graph.invoke(initial_state)
 
-    def run_batch(self, tickers: List[str] = None) -> Dict[str, Dict]:
-        """Execute workflow for multiple tickers."""
+    def _prefetch(self, tickers: List[str], news_results: Optional[Dict[str, Dict]],
+                  quotes: Optional[Dict[str, Dict]]) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        """Universe-wide news pass and quote sweep shared by every ticker in a batch."""
+        if news_results is None and config.NEWS_UNIVERSE_BATCHING and len(tickers) > 1:
+            # Fetch + dedup every ticker, then score all new headlines in shared FinBERT batches
+            print(f"\n[Workflow] Universe news pass for {len(tickers)} tickers...")
+            try:
+                news_results = self.news_engine.run(tickers=tickers)
+            except Exception as e:
+                print(f"  [NewsEngine] Warning: universe pass failed, falling back per ticker: {e}")
+        news_results = news_results or {}
+
+        # Fresh streamed quotes come from memory; only the rest need REST
+        quotes = dict(quotes or {})
+        streamed = 0
+        for ticker in tickers:
+            live = self._live_quote(ticker)
+            if live:
+                quotes[ticker] = live
+                streamed += 1
+        missing = [t for t in tickers if t not in quotes]
+        if streamed:
+            print(f"  [Stream] {streamed}/{len(tickers)} quotes served from the live stream")
+        if len(missing) > 1:
+            # One concurrent, rate-limited Finnhub sweep instead of a quote request per graph run
+            quotes.update(self.finnhub.get_quotes_batch(missing))
+
+        return news_results, quotes
+
+    def _prefetch_histories(self, tickers: List[str]) -> Tuple[Dict, Dict[str, Dict]]:
+        """Every ticker's price history, then the batch's indicators in one IndicatorEngine pass."""
+        def _history(ticker: str):
+            try:
+                with self.fetch_slots:
+                    return self.ohlcv.get_price_history(ticker)
+            except Exception as e:
+                print(f"  [OHLCV] {ticker}: {e}")
+                return None  # data_ingestion_node retries and reports the failure
+
+        workers = max(1, min(config.FETCH_CONCURRENCY, len(tickers)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ohlcv") as pool:
+            histories = {t: h for t, h in zip(tickers, pool.map(_history, tickers)) if h is not None}
+        try:
+            indicators = self.technical_specialist.compute_universe(histories)
+        except Exception as e:
+            print(f"  [Indicators] Warning: batch pass failed, computing per ticker: {e}")
+            indicators = {}
+        return histories, indicators
+
+    def _begin_run(self, kind: str, tickers: List[str]) -> Optional[PipelineRun]:
+        """
+        Start measuring a cycle, unless an enclosing run (e.g. run_universe) already is.
+        The outermost run also opens the cycle's LLM budget (LLM_DECISIONS_PER_CYCLE), so
+        a single ticker, a batch and a universe sweep are all capped the same way.
+        """
+        if self._active_run is not None:
+            return None
+        self._active_run = PipelineRun(kind, tickers)
+        self.llm_budget = config.LLM_DECISIONS_PER_CYCLE or None
+        return self._active_run
+
+    def _end_run(self, run: Optional[PipelineRun], results: Dict[str, Dict]):
+        """Persist the cycle's stage summary to pipeline_runs and refresh METRICS_FILE."""
+        if run is None:
+            return
+        self._active_run = None
+        self.llm_budget = None
+        self.last_run = run.finish(results)
+        slowest = ", ".join(f"{name} {s['seconds']:.1f}s" for name, s in run.slowest(3))
+        print(f"\n[Metrics] {run.kind} of {len(run.tickers)} tickers in {run.seconds:.1f}s "
+              f"({run.errors} errors) — slowest stages: {slowest or 'n/a'}")
+        loads = [(name.split('.', 1)[1], s) for name, s in run.stages.items() if name.startswith('llm_load.')]
+        if loads:
+            # Cold Ollama loads this cycle; with model affinity each model should load at most once
+            print("  [Models] " + ", ".join(f"{model}: {s['calls']} loads, {s['seconds']:.1f}s"
+                                             for model, s in loads))
+        try:
+            self.db.insert_pipeline_run(run.kind, run.started_at, run.seconds, len(run.tickers),
+                                        run.errors, run.stages)
+        except Exception as e:
+            print(f"  [Metrics] Warning: could not store pipeline run: {e}")
+        if config.METRICS_FILE:
+            try:
+                METRICS.write(config.METRICS_FILE)
+            except OSError as e:
+                print(f"  [Metrics] Warning: could not write {config.METRICS_FILE}: {e}")
+
+    def run_batch(self, tickers: List[str] = None, concurrent: bool = None,
+                  news_results: Dict[str, Dict] = None, quotes: Dict[str, Dict] = None) -> Dict[str, Dict]:
+        """Execute workflow for multiple tickers; the outermost call is recorded as one pipeline run."""
         if tickers is None:
             tickers = config.STOCKS
-        results = {}
-        for ticker in tickers:
+        run = self._begin_run('batch', tickers)
+        results: Dict[str, Dict] = {}
+        try:
+            results = self._run_batch(tickers, concurrent, news_results, quotes)
+            return results
+        finally:
+            self._end_run(run, results)
+
+    def _run_batch(self, tickers: List[str], concurrent: Optional[bool],
+                   news_results: Optional[Dict[str, Dict]], quotes: Optional[Dict[str, Dict]]) -> Dict[str, Dict]:
+        """
+        Execute workflow for multiple tickers.
+        In concurrent mode tickers run on a bounded thread pool; each stage is capped
+        by its own limit (fetch slots, single FinBERT lock, Ollama slots) so the cycle
+        takes roughly as long as the slowest stage instead of the sum of all tickers.
+        news_results / quotes already gathered by the caller (e.g. the monitoring
+        scheduler's faster stages) are used as-is instead of being re-fetched.
+        """
+        if concurrent is None:
+            concurrent = config.BATCH_CONCURRENT
+
+        news_results, quotes = self._prefetch(tickers, news_results, quotes)
+
+        if self.coordinator is not None:
+            # Distributed mode: workers on other cores/nodes run the per-ticker graphs
+            return self.coordinator.run(tickers, news_results=news_results, quotes=quotes)
+
+        histories, indicators = self._prefetch_histories(tickers)
+
+        def _start(ticker: str) -> TradingState:
+            return self._initial_state(ticker, news_results.get(ticker), quotes.get(ticker),
+                                       histories.get(ticker), indicators.get(ticker))
+
+        if self.model_affinity:
+            return self._run_by_model(tickers, concurrent, _start)
+
+        def _run_one(ticker: str) -> Dict:
             print(f"\nProcessing {ticker}...")
-            results[ticker] = self.run(ticker)
+            return self.graph.invoke(_start(ticker))
+
+        return self._map_tickers(_run_one, tickers, concurrent)
+
+    def _map_tickers(self, fn, tickers: List[str], concurrent: bool) -> Dict[str, Dict]:
+        """{ticker: fn(ticker)}, on a bounded thread pool unless sequential."""
+        if not concurrent or len(tickers) <= 1:
+            return {ticker: fn(ticker) for ticker in tickers}
+        workers = max(1, min(config.BATCH_MAX_WORKERS, len(tickers)))
+        print(f"\n[Workflow] Running {len(tickers)} tickers concurrently ({workers} workers)")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ticker") as pool:
+            # map() preserves input order, so results match the sequential path
+            return dict(zip(tickers, pool.map(fn, tickers)))
+
+    def _run_by_model(self, tickers: List[str], concurrent: bool,
+                      start: Callable[[str], TradingState]) -> Dict[str, Dict]:
+        """
+        Model-affinity batch. Every ticker runs through the graph up to the Llama
+        stage first; then DeepSeek decides every ticker that reached it. Each model
+        is preloaded before its phase and (MODEL_AFFINITY_UNLOAD) Llama is evicted
+        before DeepSeek loads, so a host that holds one model at a time loads each
+        once per batch instead of swapping on every ticker.
+        """
+        specialist, manager = self.technical_specialist, self.portfolio_manager
+        if self._stage_graph is None:
+            self._stage_graph = self._build_graph(decide=False)
+
+        if not self.gating:
+            # With gating most tickers may carry forward; then Llama loads on its first real call
+            self._warm(specialist.client, specialist.model)
+
+        def _prepare(ticker: str) -> Dict:
+            print(f"\nProcessing {ticker} (technical phase)...")
+            return self._stage_graph.invoke(start(ticker))
+
+        results = self._map_tickers(_prepare, tickers, concurrent)
+        pending = [t for t, state in results.items()
+                   if not state.get('error') and not state.get('gate', {}).get('skipped')]
+        if not pending:
+            return results
+
+        print(f"\n[Workflow] Decision phase: {len(pending)}/{len(tickers)} tickers on {manager.model}")
+        if config.MODEL_AFFINITY_UNLOAD and manager.model != specialist.model:
+            try:
+                specialist.client.unload(specialist.model)
+            except Exception as e:
+                print(f"  [Models] Warning: could not unload {specialist.model}: {e}")
+        self._warm(manager.client, manager.model)
+        decide = self._traced("portfolio_manager", self.portfolio_manager_node)
+
+        def _decide(ticker: str) -> Dict:
+            state = results[ticker]
+            return {**state, **decide(state)}
+
+        results.update(self._map_tickers(_decide, pending, concurrent))
         return results
+
+    @staticmethod
+    def _warm(client, model: str):
+        """Preload a model ahead of its phase; a failure just means the first call loads it."""
+        try:
+            load_ms = client.preload(model)
+            print(f"  [Models] {model} ready (load {load_ms / 1000:.1f}s)")
+        except Exception as e:
+            print(f"  [Models] Warning: could not preload {model}: {e}")
+
+    def run_universe(self, tickers: List[str], shard_size: int = None, concurrent: bool = None,
+                     budget_seconds: float = None, news_results: Dict[str, Dict] = None,
+                     quotes: Dict[str, Dict] = None) -> Tuple[Dict[str, Dict], List[Dict]]:
+        """Sweep a universe in shards (see _run_universe), recorded as one pipeline run."""
+        run = self._begin_run('universe', tickers)
+        results: Dict[str, Dict] = {}
+        try:
+            results, report = self._run_universe(tickers, shard_size, concurrent, budget_seconds,
+                                                 news_results, quotes)
+            return results, report
+        finally:
+            self._end_run(run, results)
+
+    def _run_universe(self, tickers: List[str], shard_size: Optional[int], concurrent: Optional[bool],
+                      budget_seconds: Optional[float], news_results: Optional[Dict[str, Dict]],
+                      quotes: Optional[Dict[str, Dict]]) -> Tuple[Dict[str, Dict], List[Dict]]:
+        """
+        Sweep a large universe shard by shard (UNIVERSE_SHARD_SIZE tickers each, every
+        shard through run_batch). Stops starting new shards once the cycle budget
+        (UNIVERSE_CYCLE_BUDGET_SECONDS) is spent and caps LLM runs at
+        LLM_DECISIONS_PER_CYCLE; the next sweep resumes at the first shard that
+        didn't finish. Returns (results, per-shard report).
+        """
+        budget_seconds = config.UNIVERSE_CYCLE_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+        parts = shards(tickers, shard_size)
+        if not parts:
+            return {}, []
+        start_at = self._universe_cursor % len(parts)
+        order = list(range(start_at, len(parts))) + list(range(start_at))
+
+        results: Dict[str, Dict] = {}
+        report: List[Dict] = []
+        cycle_start = time.perf_counter()
+        resume_at = None
+        for index in order:
+            shard = parts[index]
+            elapsed = time.perf_counter() - cycle_start
+            if budget_seconds and elapsed >= budget_seconds:
+                report.append({'shard': index, 'tickers': len(shard), 'deferred': True})
+                resume_at = index if resume_at is None else resume_at
+                continue
+            print(f"\n[Universe] Shard {index + 1}/{len(parts)} ({len(shard)} tickers, "
+                  f"{elapsed:.0f}s into cycle)")
+            shard_start = time.perf_counter()
+            shard_news = {t: news_results[t] for t in shard if t in news_results} if news_results else {}
+            shard_quotes = {t: quotes[t] for t in shard if t in quotes} if quotes else {}
+            out = self.run_batch(shard, concurrent=concurrent,
+                                 news_results=shard_news or None, quotes=shard_quotes or None)
+            results.update(out)
+            carried = sum(1 for r in out.values() if r.get('decision', {}).get('carried_forward'))
+            budget_hit = sum(1 for r in out.values()
+                             if r.get('gate', {}).get('reason') == "LLM budget exhausted this cycle")
+            if budget_hit and resume_at is None:
+                resume_at = index
+            report.append({
+                'shard': index,
+                'tickers': len(shard),
+                'seconds': round(time.perf_counter() - shard_start, 1),
+                'llm_runs': sum(1 for r in out.values()
+                                if not r.get('error') and not r.get('decision', {}).get('carried_forward')),
+                'carried': carried,
+                'errors': sum(1 for r in out.values() if r.get('error')),
+                'deferred': False,
+            })
+        self._universe_cursor = resume_at if resume_at is not None else 0
+        return results, report
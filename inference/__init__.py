@@ -0,0 +1,8 @@
+"""Inference module. The torch/transformers backends are imported on first use."""
+from telemetry.startup import lazy_exports
+
+__getattr__, __all__ = lazy_exports(__name__, {
+    'LazyBackend': '.lazy',
+    'load_backend': '.finbert',
+    'backend_report': '.finbert',
+})
@@ -0,0 +1,223 @@
+"""
+Persistent FinBERT inference daemon on a Unix socket, and the client backend that talks to it.
+
+    python main.py --finbert-server      # keep the model warm for every other process
+
+Protocol: one JSON object per line. {"headlines": [...]} -> {"probs": [[neg, neu, pos], ...],
+"signed": [...]}; {"op": "ping"} -> {"ok": true, "backend": ..., "stats": {...}}.
+"""
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+import config
+from inference.lazy import LABELS
+from telemetry.metrics import span
+
+BATCH_SIZE = 8  # forward-pass batch, as in the in-process news engine path
+
+
+class RemoteError(ConnectionError):
+    """The daemon could not be reached or dropped the connection (LazyBackend falls back on it)."""
+
+
+class DaemonError(RuntimeError):
+    """The daemon answered, but with an error (e.g. a bad request); the daemon itself is fine."""
+
+
+class DaemonBusy(DaemonError):
+    """A request timed out while the daemon still answers pings: it is slow, not gone."""
+
+
+def unix_sockets_supported() -> bool:
+    return hasattr(socket, 'AF_UNIX')
+
+
+class FinBERTDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    One connection thread per client; requests are queued and a single inference
+    thread merges whatever arrives within FINBERT_SERVER_MAX_WAIT_MS (up to
+    FINBERT_SERVER_MAX_BATCH headlines) into one backend call.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = None, backend=None,
+                 max_batch: int = None, max_wait_ms: float = None):
+        if not unix_sockets_supported():
+            raise RuntimeError("The FinBERT daemon needs Unix domain sockets (not available on this platform)")
+        self.socket_path = socket_path or config.FINBERT_SOCKET
+        self.max_batch = max_batch or config.FINBERT_SERVER_MAX_BATCH
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.FINBERT_SERVER_MAX_WAIT_MS) / 1000
+        if backend is None:
+            from inference.finbert import load_backend
+            backend = load_backend()
+        self.backend = backend
+        self._queue: "queue.Queue[Tuple[List[str], Future]]" = queue.Queue()
+        self.requests = 0
+        self.headlines = 0
+        self.batches = 0
+        self._remove_stale_socket()
+        super().__init__(self.socket_path, _Handler)
+        os.chmod(self.socket_path, 0o660)
+        threading.Thread(target=self._run, name="finbert-batcher", daemon=True).start()
+
+    def _remove_stale_socket(self):
+        """Unlink a socket file left by a dead daemon; refuse to start next to a live one."""
+        if not os.path.exists(self.socket_path):
+            return
+        if RemoteBackend(self.socket_path, timeout=1).available():
+            raise RuntimeError(f"A FinBERT daemon is already listening on {self.socket_path}")
+        os.unlink(self.socket_path)
+
+    def submit(self, headlines: List[str]) -> Future:
+        future: Future = Future()
+        self._queue.put((headlines, future))
+        return future
+
+    def _collect(self) -> List[Tuple[List[str], Future]]:
+        """Block for one request, then take more until the batch is full or max_wait has passed."""
+        pending = [self._queue.get()]
+        total = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while total < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            pending.append(item)
+            total += len(item[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            # Identical headlines from different clients are scored once
+            unique: Dict[str, int] = {}
+            for headlines, _ in pending:
+                for headline in headlines:
+                    unique.setdefault(headline, len(unique))
+            try:
+                probs = self.backend.predict_proba(list(unique), batch_size=BATCH_SIZE)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += len(pending)
+            self.headlines += len(unique)
+            for headlines, future in pending:
+                future.set_result(probs[[unique[h] for h in headlines]])
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'headlines': self.headlines,
+            'batches': self.batches,
+            'avg_batch': round(self.headlines / self.batches, 1) if self.batches else 0.0,
+        }
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: FinBERTDaemon
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get('op') == 'ping':
+                    reply = {'ok': True, 'backend': self.server.backend.name, 'stats': self.server.stats()}
+                else:
+                    headlines = [str(h) for h in request.get('headlines', [])]
+                    probs = self.server.submit(headlines).result() if headlines else np.zeros((0, len(LABELS)))
+                    reply = {'probs': probs.tolist(), 'signed': [float(p[2] - p[0]) for p in probs]}
+            except Exception as e:
+                reply = {'error': str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class RemoteBackend:
+    """FinBERTBackend-compatible client for the daemon (one short-lived connection per call)."""
+
+    labels = LABELS
+
+    def __init__(self, socket_path: str = None, timeout: float = None):
+        self.socket_path = socket_path or config.FINBERT_SOCKET
+        self.timeout = timeout or config.FINBERT_CLIENT_TIMEOUT
+        self.name = "remote"
+
+    def _call(self, request: Dict) -> Dict:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(json.dumps(request).encode() + b"\n")
+                with sock.makefile('rb') as stream:
+                    line = stream.readline()
+        except socket.timeout as e:
+            # A daemon that still answers pings is busy; loading a second model here would not help
+            if request.get('op') != 'ping' and RemoteBackend(self.socket_path, timeout=1).available():
+                raise DaemonBusy(f"FinBERT daemon did not answer within {self.timeout:g}s") from e
+            raise RemoteError(f"FinBERT daemon at {self.socket_path} timed out: {e}") from e
+        except OSError as e:
+            raise RemoteError(f"FinBERT daemon at {self.socket_path} unreachable: {e}") from e
+        if not line:
+            raise RemoteError("FinBERT daemon closed the connection")
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise DaemonError(reply['error'])
+        return reply
+
+    def available(self) -> bool:
+        """True if a daemon answers a ping on the socket."""
+        if not unix_sockets_supported() or not self.socket_path or not os.path.exists(self.socket_path):
+            return False
+        try:
+            reply = self._call({'op': 'ping'})
+        except (RemoteError, DaemonError, ValueError):
+            return False
+        self.name = f"remote:{reply.get('backend')}"
+        return True
+
+    def predict_proba(self, headlines: List[str], batch_size: int = BATCH_SIZE) -> np.ndarray:
+        if not headlines:
+            return np.zeros((0, len(LABELS)), dtype=np.float32)
+        # Chunked so each request finishes well inside the timeout however large the batch
+        chunk = config.FINBERT_CLIENT_CHUNK
+        probs = []
+        for i in range(0, len(headlines), chunk):
+            part = list(headlines[i:i + chunk])
+            with span('finbert', 'remote', items=len(part)):
+                probs.extend(self._call({'headlines': part})['probs'])
+        return np.asarray(probs, dtype=np.float32)
+
+    def predict_signed(self, headlines: List[str], batch_size: int = BATCH_SIZE) -> List[float]:
+        probs = self.predict_proba(headlines, batch_size)
+        return [float(p[2] - p[0]) for p in probs]
+
+
+def serve(socket_path: str = None):
+    """Run the daemon in the foreground until interrupted."""
+    daemon = FinBERTDaemon(socket_path)
+    print(f"[FinBERT] Daemon serving '{daemon.backend.name}' on {daemon.socket_path} "
+          f"(batches up to {daemon.max_batch} headlines, {daemon.max_wait * 1000:.0f} ms window)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[FinBERT] Daemon stopped: {daemon.stats()}")
+    finally:
+        daemon.server_close()
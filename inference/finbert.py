@@ -0,0 +1,194 @@
+"""FinBERT inference backends: eager fp32 PyTorch, dynamic int8 PyTorch, ONNX Runtime."""
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import torch
+from transformers import BertTokenizer, BertForSequenceClassification
+
+import config
+from inference.lazy import LABELS
+from telemetry.metrics import span
+
+SAMPLE_HEADLINES = [
+    "Apple beats quarterly revenue estimates on strong iPhone demand",
+    "Tesla shares slide after deliveries miss analyst expectations",
+    "Microsoft announces new cloud partnership with major automaker",
+    "Nvidia warns export restrictions could weigh on data center sales",
+    "Amazon to cut thousands of jobs in latest cost-saving push",
+    "Intel reports wider-than-expected loss as PC market stays weak",
+    "Meta raises full-year capital spending outlook",
+    "Netflix subscriber growth tops forecasts, stock jumps after hours",
+]
+
+
+class FinBERTBackend(ABC):
+    """Base backend: tokenizes once, sorts by token length, runs padded batches."""
+
+    name = "base"
+
+    def __init__(self, model_path: str = None):
+        self.model_path = model_path or str(config.FINBERT_PATH)
+        self.tokenizer = BertTokenizer.from_pretrained(self.model_path, local_files_only=True)
+        self.labels = LABELS
+
+    @abstractmethod
+    def _forward(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        """Return class probabilities (batch x 3) for one padded batch."""
+
+    def predict_proba(self, headlines: List[str], batch_size: int = 8) -> np.ndarray:
+        """Class probabilities for each headline, in input order."""
+        probs = np.zeros((len(headlines), len(self.labels)), dtype=np.float32)
+        if not headlines:
+            return probs
+        encoded = self.tokenizer(headlines, truncation=True, max_length=512)
+        # Group similar lengths together so each batch pads as little as possible
+        order = sorted(range(len(headlines)), key=lambda i: len(encoded['input_ids'][i]))
+        for i in range(0, len(order), batch_size):
+            batch_idx = order[i:i + batch_size]
+            inputs = self.tokenizer.pad(
+                {k: [encoded[k][j] for j in batch_idx] for k in encoded.keys()},
+                return_tensors="pt"
+            )
+            with span('finbert', self.name, items=len(batch_idx)):
+                probs[batch_idx] = self._forward(inputs)
+        return probs
+
+    def predict_signed(self, headlines: List[str], batch_size: int = 8) -> List[float]:
+        """Signed scores (positive - negative, range -1 to 1) for each headline."""
+        probs = self.predict_proba(headlines, batch_size)
+        return [float(p[2] - p[0]) for p in probs]
+
+
+class TorchBackend(FinBERTBackend):
+    """Eager fp32 PyTorch on CPU (the original path)."""
+
+    name = "torch"
+
+    def __init__(self, model_path: str = None):
+        super().__init__(model_path)
+        self.device = torch.device("cpu")
+        self.model = BertForSequenceClassification.from_pretrained(self.model_path, local_files_only=True)
+        self.model.eval()
+        self.model.to(self.device)
+
+    def _forward(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+            return torch.nn.functional.softmax(logits, dim=-1).cpu().numpy()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """PyTorch dynamic int8 quantization of the Linear layers."""
+
+    name = "int8"
+
+    def __init__(self, model_path: str = None):
+        super().__init__(model_path)
+        self.model = torch.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+class OnnxBackend(FinBERTBackend):
+    """ONNX Runtime graph, exported from the local FinBERT weights on first use."""
+
+    name = "onnx"
+
+    def __init__(self, model_path: str = None, onnx_path: Path = None):
+        super().__init__(model_path)
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("FINBERT_BACKEND=onnx requires onnxruntime: pip install onnxruntime") from e
+
+        self.onnx_path = Path(onnx_path or config.FINBERT_ONNX_PATH)
+        if not self.onnx_path.exists():
+            self._export()
+        self.session = ort.InferenceSession(str(self.onnx_path), providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _export(self):
+        """Export the fp32 model to ONNX with dynamic batch and sequence axes."""
+        print(f"[FinBERT] Exporting ONNX graph to {self.onnx_path}...")
+        self.onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        model = BertForSequenceClassification.from_pretrained(self.model_path, local_files_only=True)
+        model.eval()
+        dummy = self.tokenizer(["export"], return_tensors="pt")
+        names = ['input_ids', 'attention_mask', 'token_type_ids']
+        axes = {name: {0: 'batch', 1: 'sequence'} for name in names}
+        axes['logits'] = {0: 'batch'}
+        torch.onnx.export(
+            model, tuple(dummy[n] for n in names), str(self.onnx_path),
+            input_names=names, output_names=['logits'],
+            dynamic_axes=axes, opset_version=14
+        )
+
+    def _forward(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        feed = {k: v.numpy().astype(np.int64) for k, v in inputs.items() if k in self.input_names}
+        logits = self.session.run(['logits'], feed)[0]
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+
+BACKENDS = {
+    'torch': TorchBackend,
+    'int8': QuantizedTorchBackend,
+    'onnx': OnnxBackend,
+}
+
+
+def load_backend(name: str = None) -> FinBERTBackend:
+    """Instantiate the configured FinBERT backend (FINBERT_BACKEND)."""
+    name = (name or config.FINBERT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown FinBERT backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    backend = BACKENDS[name]()
+    print(f"[FinBERT] Loaded '{backend.name}' backend")
+    return backend
+
+
+def parity_check(backend: FinBERTBackend, reference: FinBERTBackend, headlines: List[str]) -> Dict:
+    """Maximum and mean drift of signed scores vs. a reference (fp32) backend."""
+    ref = np.array(reference.predict_signed(headlines))
+    got = np.array(backend.predict_signed(headlines))
+    drift = np.abs(got - ref)
+    ref_labels = np.argmax(reference.predict_proba(headlines), axis=-1)
+    got_labels = np.argmax(backend.predict_proba(headlines), axis=-1)
+    return {
+        'max_drift': float(drift.max()) if len(drift) else 0.0,
+        'mean_drift': float(drift.mean()) if len(drift) else 0.0,
+        'label_agreement': float((ref_labels == got_labels).mean()) if len(drift) else 1.0,
+    }
+
+
+def throughput(backend: FinBERTBackend, headlines: List[str], batch_size: int = 8, repeats: int = 3) -> float:
+    """Headlines per second, best of `repeats` runs after one warm-up pass."""
+    backend.predict_proba(headlines[:batch_size], batch_size)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend.predict_proba(headlines, batch_size)
+        best = min(best, time.perf_counter() - start)
+    return len(headlines) / best if best > 0 else 0.0
+
+
+def backend_report(names: List[str] = None, headlines: List[str] = None,
+                   n: int = 64, batch_size: int = 8) -> Dict[str, Dict]:
+    """Parity (vs. fp32 torch) and throughput for each backend that can be loaded."""
+    names = names or list(BACKENDS)
+    headlines = headlines or [SAMPLE_HEADLINES[i % len(SAMPLE_HEADLINES)] for i in range(n)]
+    reference = TorchBackend()
+    report = {}
+    for name in names:
+        try:
+            backend = reference if name == 'torch' else BACKENDS[name]()
+        except Exception as e:
+            report[name] = {'error': str(e)}
+            continue
+        report[name] = parity_check(backend, reference, headlines)
+        report[name]['headlines_per_sec'] = round(throughput(backend, headlines, batch_size), 1)
+    return report
@@ -0,0 +1,89 @@
+"""FinBERT backend proxy: the daemon or an in-process model, resolved on the first batch."""
+import os
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+import config
+from telemetry.startup import STARTUP
+
+# FinBERT's class order; known without loading the model
+LABELS = ['negative', 'neutral', 'positive']
+
+
+class LazyBackend:
+    """
+    Stands in for a FinBERTBackend until something needs scoring. Cycles where
+    every headline is a sentiment-cache hit (or there are no new articles)
+    never import torch or read the model from disk. When a FinBERT daemon is
+    listening on FINBERT_SOCKET it is used instead of loading the model here;
+    if the daemon goes away mid-run, scoring falls back to the in-process path
+    (a daemon that is merely slow raises DaemonBusy instead).
+    """
+
+    labels = LABELS
+
+    def __init__(self, name: str = None, socket_path: str = None):
+        self._name = name
+        self._socket_path = config.FINBERT_SOCKET if socket_path is None else socket_path
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._backend is not None
+
+    @property
+    def backend(self):
+        """The daemon client or the real in-process backend, resolved once on first access."""
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._connect_daemon() or self._load_local()
+        return self._backend
+
+    def _connect_daemon(self):
+        if not self._socket_path or not os.path.exists(self._socket_path):
+            return None
+        from inference.daemon import RemoteBackend
+        remote = RemoteBackend(self._socket_path)
+        if not remote.available():
+            return None
+        print(f"[FinBERT] Using inference daemon at {self._socket_path} ({remote.name})")
+        return remote
+
+    def _load_local(self):
+        start = time.perf_counter()
+        from inference.finbert import load_backend
+        backend = load_backend(self._name)
+        STARTUP.record("finbert load (first batch)", time.perf_counter() - start)
+        return backend
+
+    def _fall_back(self, error: Exception) -> bool:
+        """Switch from a failed daemon to the in-process backend; False if already in-process."""
+        with self._lock:
+            if not getattr(self._backend, 'name', '').startswith('remote'):
+                return False
+            print(f"[FinBERT] Daemon unavailable ({error}); loading the model in-process")
+            self._backend = self._load_local()
+            return True
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def predict_proba(self, headlines: List[str], batch_size: int = 8) -> np.ndarray:
+        if not headlines:
+            return np.zeros((0, len(LABELS)), dtype=np.float32)
+        try:
+            return self.backend.predict_proba(headlines, batch_size)
+        except ConnectionError as e:  # inference.daemon.RemoteError: transport failures only
+            if not self._fall_back(e):
+                raise
+            return self.backend.predict_proba(headlines, batch_size)
+
+    def predict_signed(self, headlines: List[str], batch_size: int = 8) -> List[float]:
+        probs = self.predict_proba(headlines, batch_size)
+        return [float(p[2] - p[0]) for p in probs]
@@ -10,17 +10,32 @@ Setup:
 
 Usage:
 - python main.py                    # Analyze all 10 stocks
+- python main.py --universe sp500.txt --shard-size 50  # Sweep a large universe in shards
 - python main.py --ticker NVDA      # Analyze single stock
-- python main.py --monitor          # Run every 15 minutes
+- python main.py --monitor          # Quotes / news / decisions on their own cadences
+- python main.py --sequential       # Disable concurrent batch mode
+- python main.py --monitor --gated  # Only wake the LLMs when inputs materially change
+- python main.py --model-affinity   # All Llama calls, then all DeepSeek calls (one model load each per batch)
+- python main.py --finbert-report   # Compare FinBERT inference backends
+- python main.py --finbert-server   # Keep FinBERT warm on FINBERT_SOCKET for every other run
+- python main.py --stream           # Stream trades into 1-minute bars (ingestion only)
+- python main.py --monitor --stream # Monitoring on live in-memory quotes
+- python main.py --worker           # Queue worker (own FinBERT + Ollama); start one per core/node
+- python main.py --monitor --distributed  # Coordinator: queue per-ticker jobs for the workers
+- python main.py --monitor --metrics-port 9108  # Prometheus stage metrics at :9108/metrics
+- python main.py --init-db --startup-report     # Where cold-start time went
+
+Heavy modules (torch, transformers, langgraph, yfinance, feedparser) are imported
+only by the commands that use them, and FinBERT loads on the first batch of new headlines.
 """
+from telemetry.startup import STARTUP
 import argparse
 import time
 import os
 from datetime import datetime
+from typing import List
 from dotenv import load_dotenv
-from graph.trading_workflow import TradingWorkflow
-from cli.dashboard import TradingDashboard
-from database.db_manager import DatabaseManager
+from data.universe import load_universe
 import config
 
 # Load environment variables
@@ -30,73 +45,261 @@ load_dotenv()
 os.environ.pop('REQUESTS_CA_BUNDLE', None)
 os.environ.pop('CURL_CA_BUNDLE', None)
 os.environ.pop('SSL_CERT_FILE', None)
+STARTUP.mark("imports + env")
+
 
+def workflow_class():
+    """Import TradingWorkflow (langgraph, agents, data clients) only for commands that run it."""
+    with STARTUP.phase("import workflow"):
+        from graph.trading_workflow import TradingWorkflow
+    return TradingWorkflow
 
-def run_single_analysis(ticker: str = None):
-    """Run analysis for a single ticker or all tickers."""
+
+def run_single_analysis(ticker: str = None, concurrent: bool = None, gated: bool = False,
+                        universe: List[str] = None, shard_size: int = None, distributed: bool = False,
+                        model_affinity: bool = False):
+    """Run analysis for a single ticker or the whole universe."""
+    TradingWorkflow = workflow_class()
+    from graph.job_queue import Coordinator
+    from cli.dashboard import TradingDashboard
+    universe = universe or config.STOCKS
     workflow = TradingWorkflow()
+    workflow.gating = workflow.gating or gated
+    workflow.model_affinity = workflow.model_affinity or model_affinity
+    if distributed:
+        try:
+            workflow.distribute(Coordinator(workflow.db))
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
     dashboard = TradingDashboard()
     
     if ticker:
         print(f"\nAnalyzing {ticker}...")
-        result = workflow.run(ticker)
-        results = {ticker: result}
+        # Single ticker: stream DeepSeek-R1's reasoning live instead of printing it at the end
+        workflow.portfolio_manager.on_think = dashboard.thinking_printer(ticker)
+        result = workflow.run_batch([ticker])[ticker]
+        dashboard.display_results({ticker: result})
     else:
-        print(f"\nAnalyzing {len(config.STOCKS)} stocks...")
-        results = workflow.run_batch(config.STOCKS)
-    
-    dashboard.display_results(results)
+        print(f"\nAnalyzing {len(universe)} stocks...")
+        results, report = workflow.run_universe(universe, shard_size=shard_size, concurrent=concurrent)
+        dashboard.display_results(results)
+        if len(report) > 1:
+            dashboard.display_shard_report(report)
+    if workflow.last_run:
+        dashboard.display_pipeline_run(workflow.last_run)
 
 
-def run_monitoring():
-    """Run continuous monitoring mode."""
+def run_monitoring(concurrent: bool = None, gated: bool = False, stream: bool = False,
+                   universe: List[str] = None, shard_size: int = None, distributed: bool = False,
+                   model_affinity: bool = False):
+    """
+    Run continuous monitoring mode: quotes, news sensing and LLM decisions each
+    on their own drift-free cadence, slower outside market hours.
+    """
+    TradingWorkflow = workflow_class()
+    from graph.scheduler import Job, Scheduler, market_is_open
+    from graph.job_queue import Coordinator
+    from cli.dashboard import TradingDashboard
     workflow = TradingWorkflow()
+    workflow.gating = workflow.gating or gated
+    workflow.model_affinity = workflow.model_affinity or model_affinity
+    if distributed:
+        try:
+            workflow.distribute(Coordinator(workflow.db))
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
     dashboard = TradingDashboard()
-    
-    dashboard.display_monitoring_header(config.MONITOR_INTERVAL_MINUTES)
+    universe = universe or config.STOCKS
+    if stream:
+        workflow.start_stream(universe)
+
+    cadence = config.MONITOR_CADENCE_SECONDS
+    off_hours = config.MONITOR_OFF_HOURS_CADENCE_SECONDS
+    latest = {}  # stage -> (results, monotonic time gathered)
+
+    def fresh(stage: str):
+        """Latest results of a stage unless a refresh is overdue (two periods plus its run time), else None."""
+        results, gathered = latest.get(stage, (None, 0.0))
+        job = jobs_by_name.get(stage)
+        if results is None or job is None:
+            return None
+        max_age = 2 * job.period(market_is_open()) + job.last_duration
+        return results if time.monotonic() - gathered <= max_age else None
+
+    def refresh_quotes():
+        latest['quotes'] = (workflow.finnhub.get_quotes_batch(universe), time.monotonic())
+
+    def refresh_news():
+        latest['news'] = (workflow.news_engine.run(tickers=universe), time.monotonic())
+
+    def run_decisions():
+        print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running analysis...")
+        results, report = workflow.run_universe(universe, shard_size=shard_size, concurrent=concurrent,
+                                                news_results=fresh('news'), quotes=fresh('quotes'))
+        dashboard.display_results(results)
+        if len(report) > 1:
+            dashboard.display_shard_report(report)
+        if workflow.last_run:
+            dashboard.display_pipeline_run(workflow.last_run)
+        for name, stats in scheduler.stats().items():
+            print(f"  [Scheduler] {name}: {stats['runs']} runs, {stats['skipped']} skipped, "
+                  f"{stats['failures']} failed, last {stats['last_duration']:.1f}s")
+
+    jobs = [
+        Job('news', refresh_news, cadence['news'], off_hours['news']),
+        Job('decisions', run_decisions, cadence['decisions'], off_hours['decisions']),
+    ]
+    if not stream:
+        # With a live stream, quotes are already in memory
+        jobs.insert(0, Job('quotes', refresh_quotes, cadence['quotes'], off_hours['quotes']))
+    jobs_by_name = {job.name: job for job in jobs}
+    scheduler = Scheduler(jobs)
+
+    dashboard.display_monitoring_header(cadence['decisions'] // 60)
     
     try:
-        while True:
-            print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running analysis...")
-            results = workflow.run_batch(config.STOCKS)
-            dashboard.display_results(results)
-            
-            print(f"\nNext run in {config.MONITOR_INTERVAL_MINUTES} minutes...")
-            time.sleep(config.MONITOR_INTERVAL_MINUTES * 60)
-            
+        scheduler.run_forever()
     except KeyboardInterrupt:
         print("\n\nMonitoring stopped by user.")
+    finally:
+        scheduler.stop()
+        workflow.stop_stream()
 
 
-def init_database():
-    """Initialize database schema."""
+def run_streaming(universe: List[str] = None):
+    """Stream trades for the universe into 1-minute bars until interrupted."""
+    from data.finnhub_client import FinnhubClient
+    from data.quote_stream import QuoteStream
+    universe = universe or config.STOCKS
+    finnhub = FinnhubClient()
+    seeds = finnhub.get_quotes_batch(universe)
+    stream = QuoteStream(universe, writer=finnhub.writer).start(seed_quotes=seeds)
+    print(f"Streaming {len(universe)} tickers from {stream.url} (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(60)
+            stats = stream.stats()
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] connected={stats['connected']} "
+                  f"trades={stats['trades']} bars={stats['bars_written']} live tickers={stats['tickers_live']}")
+    except KeyboardInterrupt:
+        print("\n\nStreaming stopped by user.")
+    finally:
+        stream.stop()
+
+
+def run_worker(worker_id: str = None, ollama_url: str = None, gated: bool = False):
+    """Claim and run per-ticker jobs from the Postgres queue until interrupted."""
+    TradingWorkflow = workflow_class()
+    from graph.job_queue import Worker
+    if ollama_url:
+        config.OLLAMA_BASE_URL = ollama_url  # read by the agents when the workflow is built
+    workflow = TradingWorkflow()
+    workflow.gating = workflow.gating or gated
+    worker = Worker(workflow, worker_id=worker_id, db=workflow.db)
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        print(f"\n\nWorker stopped by user ({worker.processed} jobs done, {worker.failed} failed).")
+
+
+def init_database(universe: List[str] = None):
+    """Initialize database schema, optionally seeding the universe table."""
+    from database.db_manager import DatabaseManager
     print("Initializing database...")
     db = DatabaseManager()
     db.initialize_schema()
+    if universe:
+        db.upsert_universe(universe)
+        print(f"Loaded {len(universe)} symbols into the universe table.")
     print("Database initialized successfully!")
 
 
+def run_finbert_report():
+    """Print parity and throughput for each FinBERT inference backend."""
+    from inference.finbert import backend_report
+    print("Benchmarking FinBERT backends (parity vs fp32 torch)...")
+    report = backend_report()
+    for name, stats in report.items():
+        if 'error' in stats:
+            print(f"  {name:<6} unavailable: {stats['error']}")
+            continue
+        print(f"  {name:<6} {stats['headlines_per_sec']:>8.1f} headlines/s | "
+              f"max drift={stats['max_drift']:.4f} | mean drift={stats['mean_drift']:.4f} | "
+              f"label agreement={stats['label_agreement']:.1%}")
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="Trading Agents - Minimalist AI Trading System")
     parser.add_argument('--ticker', type=str, help='Analyze a specific ticker')
-    parser.add_argument('--monitor', action='store_true', help='Run in monitoring mode (every 15 minutes)')
+    parser.add_argument('--monitor', action='store_true', help='Run in monitoring mode (per-stage cadences, see MONITOR_CADENCE_SECONDS)')
     parser.add_argument('--init-db', action='store_true', help='Initialize database schema')
+    parser.add_argument('--sequential', action='store_true', help='Process tickers one at a time instead of concurrently')
+    parser.add_argument('--gated', action='store_true', help='Skip LLM stages for tickers whose inputs have not materially changed')
+    parser.add_argument('--model-affinity', action='store_true', help='Run every Llama 3.2 analysis in a batch before any DeepSeek-R1 decision')
+    parser.add_argument('--finbert-report', action='store_true', help='Compare FinBERT backends (parity + throughput)')
+    parser.add_argument('--finbert-server', action='store_true', help='Run the shared FinBERT inference daemon on FINBERT_SOCKET')
+    parser.add_argument('--stream', action='store_true', help='Stream live trades into 1-minute bars (with --monitor: use them as quotes)')
+    parser.add_argument('--universe', type=str, help='Symbol file or "db" (default: UNIVERSE_SOURCE, else the built-in 10 stocks)')
+    parser.add_argument('--shard-size', type=int, help='Tickers per shard when sweeping the universe (default: UNIVERSE_SHARD_SIZE)')
+    parser.add_argument('--worker', action='store_true', help='Run as a job-queue worker')
+    parser.add_argument('--worker-id', type=str, help='Worker name in the job queue (default: host-pid)')
+    parser.add_argument('--ollama-url', type=str, help='Ollama endpoint for this worker (default: OLLAMA_BASE_URL)')
+    parser.add_argument('--distributed', action='store_true', help='Queue per-ticker jobs for --worker processes instead of running them here')
+    parser.add_argument('--startup-report', action='store_true', help='Print a startup-time breakdown when the command finishes')
+    parser.add_argument('--metrics-port', type=int, default=config.METRICS_PORT, help='Serve Prometheus stage metrics on this port (default: METRICS_PORT, 0 = off)')
     
     args = parser.parse_args()
+    try:
+        dispatch(args)
+    finally:
+        if args.startup_report:
+            print("\n" + STARTUP.report())
+
+
+def dispatch(args: argparse.Namespace):
+    """Run the command selected on the command line."""
+    concurrent = False if args.sequential else None
     
     if args.init_db:
-        init_database()
-    elif args.monitor:
-        run_monitoring()
+        # --init-db --universe FILE also seeds the universe table for UNIVERSE_SOURCE=db
+        init_database(load_universe(args.universe) if args.universe and args.universe != 'db' else None)
+        return
+    if args.finbert_report:
+        run_finbert_report()
+        return
+    if args.finbert_server:
+        from inference.daemon import serve
+        serve()
+        return
+    if args.metrics_port:
+        from telemetry.exporter import serve_metrics
+        serve_metrics(args.metrics_port)
+    if args.worker:
+        run_worker(args.worker_id, args.ollama_url, gated=args.gated)
+        return
+
+    universe = load_universe(args.universe)
+    if args.monitor:
+        run_monitoring(concurrent, gated=args.gated, stream=args.stream, universe=universe,
+                       shard_size=args.shard_size, distributed=args.distributed,
+                       model_affinity=args.model_affinity)
+    elif args.stream:
+        run_streaming(universe)
     elif args.ticker:
-        if args.ticker.upper() not in config.STOCKS:
-            print(f"Error: {args.ticker} is not in the allowed stock list.")
-            print(f"Allowed stocks: {', '.join(config.STOCKS)}")
+        if args.ticker.upper() not in universe:
+            print(f"Error: {args.ticker} is not in the ticker universe ({len(universe)} symbols).")
+            if len(universe) <= 20:
+                print(f"Allowed stocks: {', '.join(universe)}")
             return
-        run_single_analysis(args.ticker.upper())
+        run_single_analysis(args.ticker.upper(), gated=args.gated, distributed=args.distributed,
+                            model_affinity=args.model_affinity)
     else:
-        run_single_analysis()
+        run_single_analysis(concurrent=concurrent, gated=args.gated, universe=universe,
+                            shard_size=args.shard_size, distributed=args.distributed,
+                            model_affinity=args.model_affinity)
 
 
 if __name__ == "__main__":
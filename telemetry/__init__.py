@@ -0,0 +1,12 @@
+"""Telemetry module. Submodules are imported on first use so telemetry.startup stays cheap."""
+from .startup import lazy_exports
+
+__getattr__, __all__ = lazy_exports(__name__, {
+    'METRICS': '.metrics',
+    'PipelineRun': '.metrics',
+    'TracedAdapter': '.http',
+    'span': '.metrics',
+    'traced_methods': '.metrics',
+    'serve_metrics': '.exporter',
+    'STARTUP': '.startup',
+})
@@ -0,0 +1,33 @@
+"""Prometheus scrape endpoint for the process-wide stage metrics."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telemetry.metrics import METRICS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = METRICS.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve GET /metrics on a daemon thread; returns the server (call shutdown() to stop)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(f"[Metrics] Prometheus endpoint on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,18 @@
+"""Outbound HTTP tracing for requests sessions."""
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+from telemetry.metrics import METRICS
+
+
+class TracedAdapter(HTTPAdapter):
+    """HTTPAdapter recording every request as an `http.<host>` span; HTTP 4xx/5xx count as errors."""
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).hostname or 'unknown'
+        with METRICS.span('http', host) as s:
+            response = super().send(request, **kwargs)
+            if response.status_code >= 400:
+                s.fail()
+            return response
@@ -0,0 +1,204 @@
+"""Process-wide stage metrics: spans for graph nodes, DB calls, HTTP calls and FinBERT batches."""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Histogram bucket bounds (seconds): DB round-trips through multi-minute DeepSeek reasoning
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class _Stage:
+    """Cumulative counters for one (kind, name) stage."""
+
+    __slots__ = ('calls', 'errors', 'items', 'seconds', 'max_seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.items = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+
+class Span:
+    """A running measurement; set `items` or call fail() before it closes."""
+
+    __slots__ = ('kind', 'name', 'items', 'error')
+
+    def __init__(self, kind: str, name: str, items: int):
+        self.kind = kind
+        self.name = name
+        self.items = items
+        self.error = False
+
+    def fail(self):
+        self.error = True
+
+
+class Metrics:
+    """Thread-safe registry of per-stage wall time, item counts and errors."""
+
+    def __init__(self):
+        self._stages: Dict[Tuple[str, str], _Stage] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind: str, name: str, seconds: float, items: int = 1, error: bool = False):
+        with self._lock:
+            stage = self._stages.get((kind, name))
+            if stage is None:
+                stage = self._stages[(kind, name)] = _Stage()
+            stage.calls += 1
+            stage.errors += int(error)
+            stage.items += items
+            stage.seconds += seconds
+            stage.max_seconds = max(stage.max_seconds, seconds)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    stage.buckets[i] += 1
+                    break
+
+    @contextmanager
+    def span(self, kind: str, name: str, items: int = 1):
+        """Time the block; an exception escaping it counts as an error and is re-raised."""
+        span = Span(kind, name, items)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.error = True
+            raise
+        finally:
+            self.observe(kind, name, time.perf_counter() - start, span.items, span.error)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current totals keyed "kind.name" (calls, errors, items, seconds, max_seconds)."""
+        with self._lock:
+            return {
+                f"{kind}.{name}": {'calls': s.calls, 'errors': s.errors, 'items': s.items,
+                                   'seconds': s.seconds, 'max_seconds': s.max_seconds}
+                for (kind, name), s in self._stages.items()
+            }
+
+    @staticmethod
+    def diff(after: Dict[str, Dict], before: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Per-stage activity between two snapshots (stages with no calls are dropped)."""
+        out = {}
+        for key, now in after.items():
+            then = before.get(key, {})
+            calls = now['calls'] - then.get('calls', 0)
+            if calls <= 0:
+                continue
+            out[key] = {
+                'calls': calls,
+                'errors': now['errors'] - then.get('errors', 0),
+                'items': now['items'] - then.get('items', 0),
+                'seconds': round(now['seconds'] - then.get('seconds', 0.0), 3),
+            }
+        return out
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            stages = sorted(self._stages.items())
+            lines = [
+                "# HELP trading_stage_seconds Wall time per pipeline stage call.",
+                "# TYPE trading_stage_seconds histogram",
+            ]
+            for (kind, name), s in stages:
+                labels = f'kind="{kind}",stage="{_escape(name)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, s.buckets):
+                    cumulative += count
+                    lines.append(f'trading_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'trading_stage_seconds_bucket{{{labels},le="+Inf"}} {s.calls}')
+                lines.append(f"trading_stage_seconds_sum{{{labels}}} {s.seconds:.6f}")
+                lines.append(f"trading_stage_seconds_count{{{labels}}} {s.calls}")
+            for metric, help_text, attr in (
+                ("trading_stage_errors_total", "Stage calls that failed.", 'errors'),
+                ("trading_stage_items_total", "Items processed per stage (rows, headlines, tickers).", 'items'),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for (kind, name), s in stages:
+                    lines.append(f'{metric}{{kind="{kind}",stage="{_escape(name)}"}} {getattr(s, attr)}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path):
+        """Atomically write the exposition to `path` (node_exporter textfile collector)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.render())
+        os.replace(tmp, path)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+METRICS = Metrics()
+
+
+def span(kind: str, name: str, items: int = 1):
+    """METRICS.span shortcut: `with span('http', 'yfinance'):`."""
+    return METRICS.span(kind, name, items)
+
+
+def _count_items(args: tuple, result) -> int:
+    """Rows touched by a DB call: the first list argument, else the returned collection, else 1."""
+    for arg in args:
+        if isinstance(arg, (list, tuple, set)):
+            return len(arg)
+    if isinstance(result, (list, tuple, set, dict)):
+        return len(result)
+    return 1
+
+
+def traced_methods(kind: str, exclude: Tuple[str, ...] = ()) -> Callable:
+    """Class decorator: every public method becomes a `kind.method_name` span."""
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_') or attr in exclude or not callable(value):
+                continue
+            setattr(cls, attr, _traced(kind, attr, value))
+        return cls
+    return decorate
+
+
+def _traced(kind: str, name: str, fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with METRICS.span(kind, name) as s:
+            result = fn(self, *args, **kwargs)
+            s.items = _count_items(args, result)
+            return result
+    return wrapper
+
+
+class PipelineRun:
+    """Stage activity over one pipeline cycle, as a diff of process-wide metrics."""
+
+    def __init__(self, kind: str, tickers: List[str]):
+        self.kind = kind
+        self.tickers = list(tickers)
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._before = METRICS.snapshot()
+        self.seconds: float = 0.0
+        self.errors = 0
+        self.stages: Dict[str, Dict] = {}
+
+    def finish(self, results: Optional[Dict[str, Dict]]) -> "PipelineRun":
+        self.seconds = round(time.perf_counter() - self._start, 3)
+        self.errors = sum(1 for r in (results or {}).values() if r.get('error'))
+        self.stages = Metrics.diff(METRICS.snapshot(), self._before)
+        return self
+
+    def slowest(self, n: int = 5) -> List[Tuple[str, Dict]]:
+        """Stages by total wall time; concurrent calls overlap, so these can exceed `seconds`."""
+        return sorted(self.stages.items(), key=lambda kv: kv[1]['seconds'], reverse=True)[:n]
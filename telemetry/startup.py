@@ -0,0 +1,74 @@
+"""Startup-time breakdown: named phases since the profile was created, plus which heavy modules got imported."""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib import import_module
+from typing import Callable, Dict, List, Tuple
+
+# Imports that dominate cold start; the report shows which ones a command actually needed
+HEAVY_MODULES = ('torch', 'transformers', 'langgraph', 'yfinance', 'feedparser', 'pandas',
+                 'numpy', 'psycopg2', 'requests', 'rich')
+
+
+class StartupProfile:
+    """Sequential marks (time since the previous mark) and nested phases (own duration)."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self._last = self.t0
+        self.phases: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def mark(self, name: str):
+        """Record the time since the previous mark (or since start) as `name`."""
+        now = time.perf_counter()
+        with self._lock:
+            self.phases.append((name, now - self._last))
+            self._last = now
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self.phases.append((name, seconds))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def report(self) -> str:
+        with self._lock:
+            phases = list(self.phases)
+        width = max([len(name) for name, _ in phases] + [12])
+        lines = ["Startup breakdown:"]
+        lines += [f"  {name:<{width}} {seconds * 1000:>9.1f} ms" for name, seconds in phases]
+        lines.append(f"  {'total (so far)':<{width}} {self.elapsed() * 1000:>9.1f} ms")
+        loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+        skipped = [m for m in HEAVY_MODULES if m not in sys.modules]
+        lines.append(f"  heavy modules imported: {', '.join(loaded) or 'none'}")
+        lines.append(f"  heavy modules avoided:  {', '.join(skipped) or 'none'}")
+        lines.append("  (interpreter start-up itself is not included; see python -X importtime main.py ...)")
+        return "\n".join(lines)
+
+
+STARTUP = StartupProfile()
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, List[str]]:
+    """
+    (__getattr__, __all__) for a package __init__ whose public names live in heavy submodules:
+    `from package import Name` still works, but the submodule is imported on first access.
+    exports maps each name to its relative submodule, e.g. {'TradingWorkflow': '.trading_workflow'}.
+    """
+    def __getattr__(name):
+        if name in exports:
+            return getattr(import_module(exports[name], package), name)
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    return __getattr__, list(exports)
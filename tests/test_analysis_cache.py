@@ -0,0 +1,36 @@
+"""Technical Specialist cache keys: nearby inputs share a bucket, material moves don't."""
+import math
+
+import pytest
+
+from agents.technical_specialist import TechnicalSpecialist
+
+MARKET = {'current_price': 101.0}
+
+
+def _indicators(rsi=51.0, macd=0.52, histogram=0.11):
+    return {'rsi': rsi, 'macd': {'macd': macd, 'signal': macd - histogram, 'histogram': histogram}}
+
+
+@pytest.fixture
+def specialist():
+    return TechnicalSpecialist()
+
+
+def test_nearby_inputs_share_a_key(specialist):
+    a = specialist.cache_key('AAPL', MARKET, _indicators(rsi=50.1))
+    b = specialist.cache_key('AAPL', {'current_price': 101.05}, _indicators(rsi=51.9, macd=0.521))
+    assert a == b
+
+
+def test_keys_differ_across_tickers_and_buckets(specialist):
+    base = specialist.cache_key('AAPL', MARKET, _indicators())
+    assert specialist.cache_key('MSFT', MARKET, _indicators()) != base
+    assert specialist.cache_key('AAPL', MARKET, _indicators(rsi=60)) != base
+    assert specialist.cache_key('AAPL', MARKET, _indicators(histogram=-0.1)) != base
+    assert specialist.cache_key('AAPL', {'current_price': 111.0}, _indicators()) != base
+
+
+def test_nan_indicators_cannot_be_keyed(specialist):
+    with pytest.raises(ValueError):
+        specialist.cache_key('AAPL', MARKET, _indicators(rsi=math.nan))
@@ -0,0 +1,88 @@
+"""BarBuilder: minute bars from trades, late-trade handling and session rollover."""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import config
+from data.bar_builder import BAR_SECONDS, BarBuilder
+
+NY = ZoneInfo("America/New_York")
+
+
+def _ts(day: int, hour: int, minute: int, second: float = 0) -> float:
+    """Epoch seconds for a March 2024 New York wall-clock time (the 4th is a Monday)."""
+    return datetime(2024, 3, day, hour, minute, tzinfo=NY).timestamp() + second
+
+
+def test_trades_in_one_minute_form_one_bar():
+    builder = BarBuilder(capacity=10)
+    assert builder.on_trade('AAPL', 100.0, 5, _ts(4, 10, 0, 1)) == []
+    builder.on_trade('AAPL', 101.0, 3, _ts(4, 10, 0, 20))
+    builder.on_trade('AAPL', 99.5, 2, _ts(4, 10, 0, 40))
+    closed = builder.on_trade('AAPL', 100.5, 1, _ts(4, 10, 1, 5))
+
+    assert len(closed) == 1
+    ticker, row = closed[0]
+    assert ticker == 'AAPL'
+    assert row.tolist() == [_ts(4, 10, 0), 100.0, 101.0, 99.5, 99.5, 10.0]
+    bars = builder.bars('AAPL')
+    assert list(bars.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert len(bars) == 1
+
+
+def test_close_due_waits_for_the_grace_period(monkeypatch):
+    monkeypatch.setattr(config, 'STREAM_BAR_GRACE_SECONDS', 2.0)
+    builder = BarBuilder(capacity=10)
+    builder.on_trade('AAPL', 100.0, 1, _ts(4, 10, 0, 30))
+    end = _ts(4, 10, 0) + BAR_SECONDS
+    assert builder.close_due(now=end + 1) == []
+    # A slightly delayed trade still lands in its own bar
+    builder.on_trade('AAPL', 100.2, 1, _ts(4, 10, 0, 59))
+    closed = builder.close_due(now=end + 2)
+    assert len(closed) == 1 and closed[0][1][5] == 2.0
+
+
+def test_trade_for_a_closed_minute_is_dropped():
+    builder = BarBuilder(capacity=10)
+    builder.on_trade('AAPL', 100.0, 1, _ts(4, 10, 0, 10))
+    builder.on_trade('AAPL', 101.0, 1, _ts(4, 10, 1, 10))  # closes 10:00
+    builder.close_due(now=float('inf'))                     # closes 10:01
+    assert builder.on_trade('AAPL', 50.0, 7, _ts(4, 10, 0, 30)) == []
+
+    assert builder.late_trades == 1
+    assert builder.bars('AAPL')['volume'].tolist() == [1.0, 1.0]
+    # The late trade does not move the last price back in time
+    assert builder.quote('AAPL', max_age=float('inf'))['current_price'] == 101.0
+
+
+def test_session_rolls_over_on_first_regular_trade_of_a_new_day():
+    builder = BarBuilder(capacity=10)
+    builder.on_trade('AAPL', 100.0, 1, _ts(4, 10, 0))
+    builder.on_trade('AAPL', 104.0, 1, _ts(4, 15, 59))
+    builder.on_trade('AAPL', 90.0, 1, _ts(5, 8, 0))   # pre-market: ignored by the session
+    quote = builder.quote('AAPL', max_age=float('inf'))
+    assert (quote['open'], quote['high'], quote['low']) == (100.0, 104.0, 100.0)
+
+    builder.on_trade('AAPL', 105.0, 1, _ts(5, 9, 31))
+    quote = builder.quote('AAPL', max_age=float('inf'))
+    assert quote['previous_close'] == 104.0
+    assert (quote['open'], quote['high'], quote['low']) == (105.0, 105.0, 105.0)
+    assert quote['change'] == pytest.approx(1.0)
+
+
+def test_pre_market_seed_counts_as_the_previous_session():
+    builder = BarBuilder(capacity=10)
+    builder.seed('AAPL', {'open': 98.0, 'high': 99.0, 'low': 97.0, 'previous_close': 96.0,
+                          'current_price': 98.5}, now=_ts(4, 8, 0))
+    builder.on_trade('AAPL', 99.0, 1, _ts(4, 9, 30, 5))
+    assert builder.previous_close('AAPL') == 98.5
+
+
+def test_ring_keeps_only_the_newest_bars():
+    builder = BarBuilder(capacity=3)
+    for minute in range(6):
+        builder.on_trade('AAPL', 100.0 + minute, 1, _ts(4, 10, minute, 1))
+    builder.close_due(now=float('inf'))
+    assert builder.bars('AAPL')['close'].tolist() == [103.0, 104.0, 105.0]
+    assert builder.bars('AAPL', 2)['close'].tolist() == [104.0, 105.0]
@@ -0,0 +1,71 @@
+"""ChangeGate: which input changes count as material."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import config
+from graph.change_gate import ChangeGate
+
+
+class FakeDB:
+    def __init__(self):
+        self.states = {}
+        self.skips = []
+
+    def get_ticker_state(self, ticker):
+        return self.states.get(ticker)
+
+    def upsert_ticker_state(self, ticker, snapshot, decision, analysis):
+        self.states[ticker] = {'snapshot': snapshot, 'decision': decision, 'analysis': analysis,
+                               'decided_at': datetime.now(tz=timezone.utc)}
+
+    def insert_decision_skip(self, ticker, decision, reason):
+        self.skips.append((ticker, decision, reason))
+
+
+def _snapshot(gate, score=0.1, alert=False, price=100.0, rsi=50.0, histogram=0.5):
+    return gate.snapshot({'score': score, 'alert': alert}, {'current_price': price},
+                         {'rsi': rsi, 'macd': {'histogram': histogram}})
+
+
+@pytest.fixture
+def gate():
+    gate = ChangeGate(db=FakeDB())
+    gate.record_decision('AAPL', _snapshot(gate), {'decision': 'BUY', 'full_response': 'long text'}, 'analysis')
+    return gate
+
+
+def test_first_decision_always_runs():
+    gate = ChangeGate(db=FakeDB())
+    changed, reason, last = gate.check('AAPL', _snapshot(gate))
+    assert changed and last is None and reason == "no previous decision"
+
+
+def test_unchanged_inputs_carry_forward(gate):
+    changed, _, last = gate.check('AAPL', _snapshot(gate, score=0.12, price=100.4, rsi=52))
+    assert not changed
+    assert last['decision'] == {'decision': 'BUY'}  # full_response is not kept
+
+
+@pytest.mark.parametrize('inputs', [
+    {'score': 0.1 + config.GATE_NEWS_DELTA},
+    {'alert': True},
+    {'price': 100.0 * (1 + config.GATE_PRICE_MOVE_PCT / 100)},
+    {'rsi': 44.0},
+    {'histogram': -0.1},
+])
+def test_material_changes_rerun(gate, inputs):
+    changed, reason, _ = gate.check('AAPL', _snapshot(gate, **inputs))
+    assert changed, reason
+
+
+def test_stale_decision_reruns(gate):
+    gate._last['AAPL']['decided_at'] -= timedelta(minutes=config.GATE_MAX_AGE_MINUTES + 1)
+    changed, reason, _ = gate.check('AAPL', _snapshot(gate))
+    assert changed and "old" in reason
+
+
+def test_state_survives_a_restart_through_the_db(gate):
+    restarted = ChangeGate(db=gate.db)
+    changed, _, _ = restarted.check('AAPL', _snapshot(restarted))
+    assert not changed
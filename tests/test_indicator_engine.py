@@ -0,0 +1,64 @@
+"""IndicatorEngine and TechnicalSpecialist.compute_universe against the per-ticker pandas path."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.indicator_engine import IndicatorEngine
+from agents.technical_specialist import TechnicalSpecialist
+
+
+def _history(bars: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, bars))
+    index = pd.bdate_range('2024-01-01', periods=bars, tz='America/New_York')
+    return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+                         'volume': 1.0}, index=index)
+
+
+def _assert_same(actual: dict, expected: dict):
+    assert actual['rsi'] == pytest.approx(expected['rsi'], rel=1e-9)
+    for key in ('macd', 'signal', 'histogram'):
+        assert actual['macd'][key] == pytest.approx(expected['macd'][key], rel=1e-9, abs=1e-12)
+
+
+def test_batch_matches_single_ticker_when_histories_end_at_different_bars():
+    # B stops one bar before A (failed refresh or halted symbol), C is much shorter
+    histories = {'A': _history(120, 1), 'B': _history(119, 2), 'C': _history(40, 3)}
+    batch = TechnicalSpecialist().compute_universe(histories)
+    for ticker, history in histories.items():
+        single = TechnicalSpecialist().compute_universe({ticker: history})[ticker]
+        _assert_same(batch[ticker], single)
+
+
+def test_batch_matches_pandas_reference():
+    specialist = TechnicalSpecialist()
+    histories = {'A': _history(120, 1), 'B': _history(119, 2)}
+    batch = specialist.compute_universe(histories)
+    for ticker, history in histories.items():
+        expected = {'rsi': specialist.compute_rsi(history['close']),
+                    'macd': specialist.compute_macd(history['close'])}
+        _assert_same(batch[ticker], expected)
+
+
+def test_state_is_kept_per_ticker_across_batches():
+    full = {'A': _history(120, 1), 'B': _history(110, 2), 'C': _history(90, 3)}
+    specialist = TechnicalSpecialist()
+    # Two shards, then a cycle later the same tickers arrive in a different grouping
+    specialist.compute_universe({t: full[t].iloc[:-5] for t in ('A', 'B')})
+    specialist.compute_universe({'C': full['C'].iloc[:-5]})
+    result = specialist.compute_universe({t: full[t] for t in ('B', 'C')})
+    result.update(specialist.compute_universe({'A': full['A']}))
+
+    assert set(specialist._engines) == {'A', 'B', 'C'}
+    for ticker, history in full.items():
+        _assert_same(result[ticker], TechnicalSpecialist().compute_universe({ticker: history})[ticker])
+
+
+def test_split_and_join_round_trip():
+    histories = {'A': _history(60, 1), 'B': _history(45, 2)}
+    engine = IndicatorEngine(list(histories))
+    expected = engine.fit(histories)
+    joined = IndicatorEngine.join(list(engine.split().values()))
+    assert joined.tickers == engine.tickers
+    for ticker in histories:
+        _assert_same(joined.latest(ticker), expected[ticker])
@@ -0,0 +1,82 @@
+"""ConnectionPool recovery from dead connections, against an in-memory stand-in for psycopg2's pool."""
+import psycopg2
+import pytest
+from psycopg2 import pool as pg_pool
+
+from database.pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, dead: bool = False):
+        self.closed = 1 if dead else 0
+        self.status = psycopg2.extensions.STATUS_READY
+
+
+class FakePool:
+    """Hands out queued connections, then fresh ones built by `make`; enforces psycopg2's putconn keying."""
+
+    def __init__(self, queued, make=FakeConnection):
+        self.queued = list(queued)
+        self.make = make
+        self.out = set()
+        self.closed = []
+
+    def getconn(self):
+        conn = self.queued.pop(0) if self.queued else self.make()
+        self.out.add(id(conn))
+        return conn
+
+    def putconn(self, conn, close=False):
+        if id(conn) not in self.out:
+            raise pg_pool.PoolError("trying to put unkeyed connection")
+        self.out.discard(id(conn))
+        if close:
+            self.closed.append(conn)
+
+
+def _pool(fake: FakePool, maxconn: int = 3) -> ConnectionPool:
+    pool = ConnectionPool({}, minconn=0, maxconn=maxconn, healthcheck_seconds=0)
+    pool._pool = fake
+    return pool
+
+
+def test_dead_connection_is_replaced():
+    fake = FakePool([FakeConnection(dead=True)])
+    pool = _pool(fake)
+    with pool.connection() as conn:
+        assert not conn.closed
+    assert pool.healthcheck_failures == 1
+    assert len(fake.closed) == 1 and not fake.out
+
+
+def test_pool_full_of_dead_connections_raises_instead_of_yielding_one():
+    fake = FakePool([], make=lambda: FakeConnection(dead=True))
+    pool = _pool(fake, maxconn=3)
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection():
+            pytest.fail("a dead connection was handed out")
+    assert pool.healthcheck_failures == 4
+    assert not fake.out
+    assert pool._slots.acquire(blocking=False)  # the slot was released
+
+
+def test_failed_reconnect_surfaces_the_connect_error():
+    fake = FakePool([FakeConnection(dead=True)])
+
+    def refuse():
+        raise psycopg2.OperationalError("connection refused")
+
+    fake.make = refuse
+    pool = _pool(fake)
+    with pytest.raises(psycopg2.OperationalError, match="refused"):
+        with pool.connection():
+            pass
+
+
+def test_closed_connections_forget_their_idle_timestamp():
+    fake = FakePool([])
+    pool = _pool(fake)
+    with pool.connection() as conn:
+        conn.closed = 1  # broken while borrowed
+    assert id(conn) not in pool._last_used
+    assert fake.closed == [conn]
@@ -0,0 +1,36 @@
+"""TokenBucket pacing under bursts, pauses and concurrent callers."""
+import threading
+import time
+
+from data.rate_limiter import TokenBucket
+
+
+def test_burst_is_immediate_then_paced():
+    bucket = TokenBucket(rate_per_minute=600, burst=3)  # 10 tokens/s
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.08
+
+
+def test_pause_drains_and_blocks():
+    bucket = TokenBucket(rate_per_minute=6000, burst=5)
+    bucket.pause(0.2)
+    assert bucket.tokens == 0
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+
+
+def test_concurrent_callers_share_the_rate():
+    bucket = TokenBucket(rate_per_minute=1200, burst=1)  # 20 tokens/s
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One token up front, then five more at 50 ms each
+    assert time.monotonic() - start >= 0.24
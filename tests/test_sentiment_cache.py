@@ -0,0 +1,67 @@
+"""SentimentCache: content-addressed reuse across tickers, batches and restarts."""
+import numpy as np
+
+from data.headlines import headline_key
+from data.sentiment_cache import SentimentCache
+
+
+class FakeDB:
+    def __init__(self, fail: bool = False):
+        self.rows = {}
+        self.fail = fail
+
+    def get_cached_sentiments(self, keys):
+        if self.fail:
+            raise ConnectionError("db down")
+        return [{'headline_hash': k, 'negative': r[0], 'neutral': r[1], 'positive': r[2]}
+                for k, r in self.rows.items() if k in keys]
+
+    def upsert_cached_sentiments(self, rows):
+        if self.fail:
+            raise ConnectionError("db down")
+        for key, _, *probs in rows:
+            self.rows[key] = probs
+
+
+class Scorer:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, headlines):
+        self.seen.extend(headlines)
+        return np.array([[0.1, 0.2, 0.7]] * len(headlines), dtype=np.float32)
+
+
+def test_only_unique_uncached_headlines_are_scored():
+    cache, score = SentimentCache(db=FakeDB(), capacity=100), Scorer()
+    headlines = ["Apple beats estimates - Reuters", "apple beats estimates", "Tesla misses"]
+    probs = cache.get_or_compute(headlines, score)
+
+    assert score.seen == ["Apple beats estimates - Reuters", "Tesla misses"]  # re-syndicated copy shares a key
+    assert probs.shape == (3, 3) and np.allclose(probs[:, 2], 0.7)
+
+    cache.get_or_compute(headlines, score)
+    assert len(score.seen) == 2
+    assert cache.stats()['memory_hits'] == 3
+
+
+def test_persistent_hits_after_restart():
+    db, score = FakeDB(), Scorer()
+    SentimentCache(db=db).get_or_compute(["Nvidia raises guidance"], score)
+    restarted = SentimentCache(db=db)
+    restarted.get_or_compute(["Nvidia raises guidance"], score)
+    assert len(score.seen) == 1
+    assert restarted.stats()['persistent_hits'] == 1
+
+
+def test_lru_is_bounded():
+    cache = SentimentCache(db=FakeDB(), capacity=2)
+    cache.get_or_compute(["a", "b", "c"], Scorer())
+    assert cache.stats()['size'] == 2
+    assert headline_key("a") not in cache._lru
+
+
+def test_database_failure_falls_back_to_scoring():
+    cache, score = SentimentCache(db=FakeDB(fail=True)), Scorer()
+    probs = cache.get_or_compute(["Intel cuts jobs"], score)
+    assert score.seen == ["Intel cuts jobs"] and probs.shape == (1, 3)